@@ -1,5 +1,6 @@
 """Main MCP server for Netmind Web3 tools."""
 
+import asyncio
 import os
 from pathlib import Path
 from mcp.server.auth.settings import AuthSettings
@@ -16,16 +17,22 @@ from .tools import (
     query_sugar_get_all_tokens,
     query_sugar_get_token_prices,
     query_sugar_get_prices,
+    query_sugar_get_token_stats,
     query_sugar_get_pools_for_swaps,
     query_sugar_get_pool_list,
+    query_sugar_get_multichain_pool_list,
+    query_sugar_get_pool_history,
+    query_sugar_get_pool_changes,
     query_sugar_get_latest_pool_epochs,
     query_sugar_get_pool_epochs,
     query_sugar_get_quote,
 )
 from .tools.backend.config import BackendConfig
+from .tools.coingecko.client import close_client, get_client_stats
 from .tools.coingecko.config import CoinGeckoConfig
 from .tools.sugar.config import SugarConfig
-from .tools.sugar.cache import ensure_cache_system_started
+from .tools.sugar.cache import ensure_cache_system_started, get_cache_stats, start_refresher, stop_refresher
+from .tools.sugar.rpc import close_transports
 from .utils.auth import StaticTokenVerifier
 from .utils.env_loader import load_env_file
 from starlette.responses import JSONResponse
@@ -81,8 +88,12 @@ def _create_mcp_instance():
     mcp.tool()(query_sugar_get_all_tokens)
     mcp.tool()(query_sugar_get_token_prices)
     mcp.tool()(query_sugar_get_prices)
+    mcp.tool()(query_sugar_get_token_stats)
     mcp.tool()(query_sugar_get_pools_for_swaps)
     mcp.tool()(query_sugar_get_pool_list)
+    mcp.tool()(query_sugar_get_multichain_pool_list)
+    mcp.tool()(query_sugar_get_pool_history)
+    mcp.tool()(query_sugar_get_pool_changes)
     mcp.tool()(query_sugar_get_latest_pool_epochs)
     mcp.tool()(query_sugar_get_pool_epochs)
     mcp.tool()(query_sugar_get_quote)
@@ -101,6 +112,28 @@ def _validate_required_env_vars():
     SugarConfig.validate_required_env()
 
 
+async def _serve(mcp_instance: FastMCP, transport: str):
+    """Run the server with the Sugar cache refresher on the same event loop.
+
+    The refresher is stopped on shutdown, letting in-flight refreshes publish first, and the
+    shared Sugar RPC transports and CoinGecko client's connections are closed.
+    """
+    await start_refresher()
+    try:
+        if transport == "stdio":
+            await mcp_instance.run_stdio_async()
+        elif transport == "sse":
+            await mcp_instance.run_sse_async()
+        elif transport == "streamable-http":
+            await mcp_instance.run_streamable_http_async()
+        else:
+            raise ValueError(f"Unknown transport: {transport}")
+    finally:
+        await stop_refresher()
+        close_transports()
+        await close_client()
+
+
 def main():
     """Start the MCP server.
     
@@ -120,13 +153,19 @@ def main():
     async def health_check(request):
         return JSONResponse({"status": "ok"})
 
+    @mcp_instance.custom_route('/cache/stats', methods=['GET'])
+    async def cache_stats(request):
+        stats = get_cache_stats()
+        stats["coingecko"] = get_client_stats()
+        return JSONResponse(stats)
+
     _validate_required_env_vars()
     
-    # Eagerly initialize Sugar cache system on server startup
-    ensure_cache_system_started()
+    # Eagerly initialize Sugar cache system on server startup; its refresher runs on the server's event loop
+    ensure_cache_system_started(start_updates=False)
     
     transport = os.environ.get("MCP_TRANSPORT", "sse")
-    mcp_instance.run(transport=transport)
+    asyncio.run(_serve(mcp_instance, transport))
 
 
 if __name__ == "__main__":
@@ -18,8 +18,12 @@ from .sugar import (
     query_sugar_get_all_tokens,
     query_sugar_get_token_prices,
     query_sugar_get_prices,
+    query_sugar_get_token_stats,
     query_sugar_get_pools_for_swaps,
     query_sugar_get_pool_list,
+    query_sugar_get_multichain_pool_list,
+    query_sugar_get_pool_history,
+    query_sugar_get_pool_changes,
     query_sugar_get_latest_pool_epochs,
     query_sugar_get_pool_epochs,
     query_sugar_get_quote,
@@ -37,8 +41,12 @@ __all__ = [
     "query_sugar_get_all_tokens",
     "query_sugar_get_token_prices",
     "query_sugar_get_prices",  
+    "query_sugar_get_token_stats",
     "query_sugar_get_pools_for_swaps",
     "query_sugar_get_pool_list",
+    "query_sugar_get_multichain_pool_list",
+    "query_sugar_get_pool_history",
+    "query_sugar_get_pool_changes",
     "query_sugar_get_latest_pool_epochs",
     "query_sugar_get_pool_epochs",
     "query_sugar_get_quote",
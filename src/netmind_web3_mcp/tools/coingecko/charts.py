@@ -0,0 +1,146 @@
+"""Per-coin market chart store, updated incrementally between tool calls."""
+
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .client import get_json
+from .config import get_config
+
+SERIES_KEYS = ("prices", "market_caps", "total_volumes")
+# Spacing assumed when a series is too short to infer it (7-day charts are hourly)
+DEFAULT_STEP_MS = 3600 * 1000
+
+
+@dataclass
+class ChartEntry:
+    series: Dict[str, List[list]]
+    fetched_at: float
+    # Spacing of the series points in milliseconds
+    step_ms: int
+
+
+def _infer_step_ms(points: List[list]) -> int:
+    gaps = sorted(b[0] - a[0] for a, b in zip(points, points[1:]) if b[0] > a[0])
+    return int(gaps[len(gaps) // 2]) if gaps else DEFAULT_STEP_MS
+
+
+def _merge(points: List[list], new_points: List[list], step_ms: int) -> None:
+    """Append newer points, keeping the series' spacing.
+
+    The last point of a chart is the live price, taken mid-interval. While the tail is closer
+    than step_ms to the point before it, a newer point replaces it instead of being appended.
+    """
+    for point in new_points:
+        if points and point[0] <= points[-1][0]:
+            continue
+        if len(points) >= 2 and points[-1][0] - points[-2][0] < step_ms:
+            points[-1] = point
+        else:
+            points.append(point)
+
+
+def _trim(points: List[list], cutoff_ms: float) -> List[list]:
+    for i, point in enumerate(points):
+        if point[0] >= cutoff_ms:
+            return points[i:] if i else points
+    return []
+
+
+class ChartStore:
+    """LRU store of per-coin market charts over a fixed window.
+
+    A chart fetched less than refresh_seconds ago is served as is. An older chart that is still
+    within incremental_max_age_seconds is extended with only the points since its last one, via
+    the range endpoint; older or missing charts are downloaded in full. Points that fall out of
+    the window are trimmed. If extending fails, the stored chart is served with the error as long
+    as it is less than max_stale_seconds old; beyond that the error is raised.
+    """
+
+    def __init__(
+        self,
+        window_days: int = 7,
+        refresh_seconds: float = 300,
+        incremental_max_age_seconds: float = 86400,
+        max_stale_seconds: float = 3600,
+        max_coins: int = 500,
+    ):
+        self.window_days = window_days
+        self.refresh_seconds = refresh_seconds
+        self.incremental_max_age_seconds = incremental_max_age_seconds
+        self.max_stale_seconds = max_stale_seconds
+        self.max_coins = max_coins
+        self.entries: "OrderedDict[Tuple[str, str], ChartEntry]" = OrderedDict()
+
+    async def get_chart(self, coin_id: str, vs_currency: str) -> Tuple[Dict[str, List[list]], Optional[str]]:
+        """Get a coin's chart over the window.
+
+        Returns:
+            Tuple of the chart and, when a stored chart is served because updating it failed, the error
+
+        Raises:
+            httpx.HTTPError: If the chart cannot be downloaded, or updating a chart older than
+                max_stale_seconds fails
+        """
+        key = (coin_id, vs_currency)
+        now = time.time()
+        entry = self.entries.get(key)
+        error = None
+
+        if entry is not None and now - entry.fetched_at < self.refresh_seconds:
+            pass
+        elif entry is not None and now - entry.fetched_at < self.incremental_max_age_seconds:
+            try:
+                await self._extend(coin_id, vs_currency, entry, now)
+            except Exception as e:
+                age = now - entry.fetched_at
+                if age >= self.max_stale_seconds:
+                    raise
+                print(f"Warning: incremental chart update failed for {coin_id}, serving chart from {age:.0f}s ago: {type(e).__name__}: {str(e)}", file=sys.stderr)
+                error = f"{type(e).__name__}: {str(e)} (serving chart from {age:.0f}s ago)"
+        else:
+            entry = await self._download(coin_id, vs_currency, now)
+
+        cutoff_ms = (now - self.window_days * 86400) * 1000
+        for name, points in entry.series.items():
+            entry.series[name] = _trim(points, cutoff_ms)
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_coins:
+            self.entries.popitem(last=False)
+        return {name: list(points) for name, points in entry.series.items()}, error
+
+    async def _download(self, coin_id: str, vs_currency: str, now: float) -> ChartEntry:
+        data = await get_json(f"/coins/{coin_id}/market_chart", params={"vs_currency": vs_currency, "days": self.window_days})
+        series = {name: list(data.get(name) or []) for name in SERIES_KEYS}
+        return ChartEntry(series=series, fetched_at=now, step_ms=_infer_step_ms(series["prices"]))
+
+    async def _extend(self, coin_id: str, vs_currency: str, entry: ChartEntry, now: float) -> None:
+        last_ms = max((points[-1][0] for points in entry.series.values() if points), default=None)
+        if last_ms is None:
+            raise ValueError("stored chart is empty")
+        data = await get_json(
+            f"/coins/{coin_id}/market_chart/range",
+            params={"vs_currency": vs_currency, "from": int(last_ms // 1000), "to": int(now)},
+        )
+        for name in SERIES_KEYS:
+            _merge(entry.series.setdefault(name, []), data.get(name) or [], entry.step_ms)
+        entry.fetched_at = now
+
+
+_chart_store: Optional[ChartStore] = None
+
+
+def get_chart_store() -> ChartStore:
+    global _chart_store
+    if _chart_store is None:
+        config = get_config()
+        _chart_store = ChartStore(
+            refresh_seconds=config.chart_refresh_seconds,
+            incremental_max_age_seconds=config.chart_incremental_max_age_hours * 3600,
+            max_stale_seconds=config.chart_max_stale_seconds,
+            max_coins=config.chart_max_coins,
+        )
+    return _chart_store
@@ -0,0 +1,109 @@
+"""Shared HTTP access to the CoinGecko API."""
+
+import asyncio
+import json
+import sys
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .config import get_config
+from .ratelimit import RETRY_STATUSES, get_rate_limiter, parse_retry_after
+from .response_cache import cache_key, get_response_cache
+
+# In-flight requests by cache key; each resolves to the raw response body
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+async def get_json(path: str, params: Optional[dict] = None) -> Any:
+    """GET a CoinGecko API path through the shared client and decode the JSON body.
+
+    Successful responses of cacheable endpoints are served from the response cache until
+    their endpoint's TTL expires. Concurrent identical requests, by cache key, share a single
+    upstream request. Requests share the global rate limiter; 429 and 5xx responses
+    and transport errors are retried with jittered backoff, honoring Retry-After.
+
+    Args:
+        path: Path relative to the configured base URL, e.g. "/coins/markets"
+        params: Query parameters
+
+    Raises:
+        httpx.HTTPStatusError: On a non-2xx response, after retries for retryable statuses
+        httpx.TransportError: If the request still fails after retries
+    """
+    cache = get_response_cache()
+    key = cache_key(path, params)
+    ttl = cache.ttl_for(key.partition("?")[0]) if cache is not None else 0
+    if ttl > 0:
+        body = await cache.get(key)
+        if body is not None:
+            return json.loads(body)
+
+    loop = asyncio.get_running_loop()
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not loop:
+        task = loop.create_task(_fetch_body(path, params, key, ttl))
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _request_done(key, t))
+    # A cancelled caller must not cancel the request other callers share; every caller decodes
+    # its own copy of the body
+    return json.loads(await asyncio.shield(task))
+
+
+async def _fetch_body(path: str, params: Optional[dict], key: str, ttl: float) -> bytes:
+    response = await _request(path, params)
+    if ttl > 0:
+        await get_response_cache().set(key, response.content, ttl)
+    return response.content
+
+
+def _request_done(key: str, task: asyncio.Task) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    # Mark the error retrieved in case every caller was cancelled before it arrived
+    if not task.cancelled():
+        task.exception()
+
+
+async def _request(path: str, params: Optional[dict]) -> httpx.Response:
+    limiter = get_rate_limiter()
+    attempt = 0
+    while True:
+        try:
+            async with limiter.slot():
+                response = await get_config().get_client().get(path, params=params)
+        except httpx.TransportError as e:
+            if attempt >= limiter.max_retries:
+                raise
+            delay = limiter.backoff(attempt)
+            print(f"Warning: CoinGecko request {path} failed ({type(e).__name__}), retrying in {delay:.1f}s", file=sys.stderr)
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                limiter.concurrency.on_success()
+                response.raise_for_status()
+                return response
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            limiter.on_throttle(retry_after)
+            # A Retry-After beyond the maximum delay would outlast the caller, so fail now
+            if attempt >= limiter.max_retries or (retry_after is not None and retry_after > limiter.retry_max_delay):
+                response.raise_for_status()
+            # With Retry-After the paused bucket spaces out the retries, so no extra backoff
+            delay = limiter.backoff(attempt) if retry_after is None else 0.0
+            print(f"Warning: CoinGecko returned {response.status_code} for {path}, retrying in {retry_after if retry_after is not None else delay:.1f}s", file=sys.stderr)
+        limiter.retries += 1
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+def get_client_stats() -> Dict[str, Any]:
+    """Report rate limiter and response cache counters; response_cache is None when the cache is disabled."""
+    cache = get_response_cache()
+    return {
+        "rate_limiter": get_rate_limiter().stats(),
+        "response_cache": cache.stats() if cache is not None else None,
+    }
+
+
+async def close_client() -> None:
+    """Close the shared CoinGecko client and its connections."""
+    await get_config().aclose()
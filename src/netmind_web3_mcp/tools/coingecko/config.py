@@ -5,6 +5,8 @@ import sys
 import asyncio
 from typing import Optional
 
+import httpx
+
 
 class CoinGeckoConfig:
     """Configuration manager for CoinGecko API."""
@@ -21,8 +23,47 @@ class CoinGeckoConfig:
         self.base_url: str = os.environ.get("COINGECKO_BASE_URL", "https://pro-api.coingecko.com/api/v3")
         self.timeout: float = float(os.environ.get("COINGECKO_TIMEOUT", "10.0"))
         self.max_concurrent: int = int(os.environ.get("COINGECKO_MAX_CONCURRENT", "10"))
-        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Global request budget: a requests-per-minute limit for the API plan, and concurrency
+        # that halves on 429/5xx and grows back to max_concurrent on success
+        self.rate_limit_per_minute: float = float(os.environ.get("COINGECKO_RATE_LIMIT_PER_MINUTE", "500"))
+        self.rate_limit_burst: int = int(os.environ.get("COINGECKO_RATE_LIMIT_BURST", "20"))
+        self.min_concurrent: int = int(os.environ.get("COINGECKO_MIN_CONCURRENT", "1"))
+        self.max_retries: int = int(os.environ.get("COINGECKO_MAX_RETRIES", "3"))
+        self.retry_base_delay: float = float(os.environ.get("COINGECKO_RETRY_BASE_DELAY", "0.5"))
+        self.retry_max_delay: float = float(os.environ.get("COINGECKO_RETRY_MAX_DELAY", "30.0"))
+
+        # Shared HTTP client: connections are kept alive and reused across tool calls
+        self.max_connections: int = int(os.environ.get("COINGECKO_MAX_CONNECTIONS", "20"))
+        self.max_keepalive_connections: int = int(os.environ.get("COINGECKO_MAX_KEEPALIVE_CONNECTIONS", "10"))
+        self.keepalive_expiry: float = float(os.environ.get("COINGECKO_KEEPALIVE_EXPIRY", "30.0"))
+        self.http2: bool = os.environ.get("COINGECKO_HTTP2", "false").lower() == "true"
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Response cache; TTLs default to CoinGecko's documented update cadence per endpoint,
+        # 0 disables caching for that endpoint
+        self.cache_enabled: bool = os.environ.get("COINGECKO_CACHE_ENABLED", "true").lower() == "true"
+        self.cache_max_mb: float = float(os.environ.get("COINGECKO_CACHE_MAX_MB", "64"))
+        self.cache_dir: Optional[str] = os.environ.get("COINGECKO_CACHE_DIR") or None
+        self.cache_disk_max_mb: float = float(os.environ.get("COINGECKO_CACHE_DISK_MAX_MB", "256"))
+        self.cache_ttl_markets: float = float(os.environ.get("COINGECKO_CACHE_TTL_MARKETS", "45"))
+        self.cache_ttl_market_chart: float = float(os.environ.get("COINGECKO_CACHE_TTL_MARKET_CHART", "300"))
+        self.cache_ttl_top_traders: float = float(os.environ.get("COINGECKO_CACHE_TTL_TOP_TRADERS", "60"))
+        self.cache_ttl_trades: float = float(os.environ.get("COINGECKO_CACHE_TTL_TRADES", "0"))
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Per-coin 7-day chart store: charts newer than the refresh interval are served as is,
+        # charts up to the incremental max age only fetch their newest points
+        self.chart_refresh_seconds: float = float(os.environ.get("COINGECKO_CHART_REFRESH_SECONDS", "300"))
+        self.chart_incremental_max_age_hours: float = float(os.environ.get("COINGECKO_CHART_INCREMENTAL_MAX_AGE_HOURS", "24"))
+        self.chart_max_stale_seconds: float = float(os.environ.get("COINGECKO_CHART_MAX_STALE_SECONDS", "3600"))
+        self.chart_max_coins: int = int(os.environ.get("COINGECKO_CHART_MAX_COINS", "500"))
         
+        if self.rate_limit_per_minute <= 0 or self.rate_limit_burst < 1:
+            raise ValueError("COINGECKO_RATE_LIMIT_PER_MINUTE must be positive and COINGECKO_RATE_LIMIT_BURST at least 1")
+        if not 1 <= self.min_concurrent <= self.max_concurrent:
+            raise ValueError("COINGECKO_MIN_CONCURRENT must be between 1 and COINGECKO_MAX_CONCURRENT")
+
         if not self.api_key:
             print("Error: COINGECKO_API_KEY environment variable is not set", file=sys.stderr)
             sys.exit(1)
@@ -39,10 +80,44 @@ class CoinGeckoConfig:
     def get_timeout(self) -> float:
         return self.timeout
     
-    def get_semaphore(self) -> asyncio.Semaphore:
-        if self._semaphore is None:
-            self._semaphore = asyncio.Semaphore(self.max_concurrent)
-        return self._semaphore
+    def _http2_available(self) -> bool:
+        if not self.http2:
+            return False
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            print("Warning: COINGECKO_HTTP2=true but the h2 package is not installed, using HTTP/1.1 (install netmind-web3-mcp[http2])", file=sys.stderr)
+            self.http2 = False
+        return self.http2
+
+    def get_client(self) -> httpx.AsyncClient:
+        """Get the shared AsyncClient for the running event loop, creating it on first use.
+
+        Connections belong to the loop they were opened on, so a call from a different loop
+        gets a new client.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.get_headers(),
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                http2=self._http2_available(),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared client and its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
 
 
 _config: Optional[CoinGeckoConfig] = None
@@ -1,10 +1,10 @@
 """CoinGecko API tools for cryptocurrency market data."""
 
 from typing import Optional
-import httpx
 import json
 import asyncio
-from .config import get_config
+from .charts import get_chart_store
+from .client import get_json
 
 
 async def query_coingecko_market_data(
@@ -27,11 +27,7 @@ async def query_coingecko_market_data(
     - Market Data: https://docs.coingecko.com/reference/coins-markets
     - Market Chart: https://docs.coingecko.com/reference/coins-id-market-chart
     """
-    config = get_config()
-    base_url = config.get_base_url()
-    headers = config.get_headers()
-    timeout = config.get_timeout()
-    semaphore = config.get_semaphore()
+    chart_store = get_chart_store()
     
     # Build parameters
     params = {"vs_currency": vs_currency}
@@ -58,29 +54,25 @@ async def query_coingecko_market_data(
         params["precision"] = precision
     
     # Get market data
-    response = httpx.get(f"{base_url}/coins/markets", params=params, headers=headers, timeout=timeout)
-    response.raise_for_status()
-    market_data = response.json()
+    market_data = await get_json("/coins/markets", params=params)
     
     # Fetch history chart data concurrently
-    async def fetch_history_chart(client, coin):
+    async def fetch_history_chart(coin):
         coin_id = coin.get("id")
         if not coin_id:
             coin["history_chart"] = []
             return
         
-        async with semaphore:
-            try:
-                url = f"{base_url}/coins/{coin_id}/market_chart"
-                resp = await client.get(url, params={"vs_currency": vs_currency, "days": 7}, 
-                                       headers=headers, timeout=timeout)
-                resp.raise_for_status()
-                coin["history_chart"] = resp.json()
-            except Exception:
-                coin["history_chart"] = []
-    
-    async with httpx.AsyncClient() as client:
-        await asyncio.gather(*[fetch_history_chart(client, coin) for coin in market_data])
+        # Concurrency and rate limits are enforced for all CoinGecko requests in get_json
+        try:
+            coin["history_chart"], stale_error = await chart_store.get_chart(coin_id, vs_currency)
+            if stale_error is not None:
+                coin["history_chart_error"] = stale_error
+        except Exception as e:
+            coin["history_chart"] = []
+            coin["history_chart_error"] = f"{type(e).__name__}: {str(e)}"
+    
+    await asyncio.gather(*[fetch_history_chart(coin) for coin in market_data])
     
     return json.dumps(market_data, indent=2)
 
@@ -159,13 +151,8 @@ async def query_coingecko_top_token_traders(
     if sort not in valid_sorts:
         raise ValueError(f"sort must be one of: {', '.join(valid_sorts)}")
     
-    config = get_config()
-    base_url = config.get_base_url()
-    headers = config.get_headers()
-    timeout = config.get_timeout()
-    
     # Build URL with path parameters
-    url = f"{base_url}/onchain/networks/{network_id}/tokens/{token_address}/top_traders"
+    url = f"/onchain/networks/{network_id}/tokens/{token_address}/top_traders"
     
     # Build query parameters
     params = {
@@ -174,9 +161,7 @@ async def query_coingecko_top_token_traders(
         "include_address_label": str(include_address_label).lower(),
     }
     
-    response = httpx.get(url, params=params, headers=headers, timeout=timeout)
-    response.raise_for_status()
-    result = response.json()
+    result = await get_json(url, params=params)
     
     return json.dumps(result, indent=2)
 
@@ -234,13 +219,8 @@ async def query_coingecko_pool_trades(
     if not pool_address or not pool_address.strip():
         raise ValueError("pool_address parameter is required and cannot be empty")
     
-    config = get_config()
-    base_url = config.get_base_url()
-    headers = config.get_headers()
-    timeout = config.get_timeout()
-    
     # Build URL with path parameters
-    url = f"{base_url}/onchain/networks/{network}/pools/{pool_address}/trades"
+    url = f"/onchain/networks/{network}/pools/{pool_address}/trades"
     
     # Build query parameters
     params = {
@@ -248,9 +228,7 @@ async def query_coingecko_pool_trades(
         "token": token,
     }
     
-    response = httpx.get(url, params=params, headers=headers, timeout=timeout)
-    response.raise_for_status()
-    result = response.json()
+    result = await get_json(url, params=params)
     
     return json.dumps(result, indent=2)
 
@@ -309,21 +287,14 @@ async def query_coingecko_token_trades(
     if not token_address or not token_address.strip():
         raise ValueError("token_address parameter is required and cannot be empty")
     
-    config = get_config()
-    base_url = config.get_base_url()
-    headers = config.get_headers()
-    timeout = config.get_timeout()
-    
     # Build URL with path parameters
-    url = f"{base_url}/onchain/networks/{network}/tokens/{token_address}/trades"
+    url = f"/onchain/networks/{network}/tokens/{token_address}/trades"
     
     # Build query parameters
     params = {
         "trade_volume_in_usd_greater_than": str(trade_volume_in_usd_greater_than),
     }
     
-    response = httpx.get(url, params=params, headers=headers, timeout=timeout)
-    response.raise_for_status()
-    result = response.json()
+    result = await get_json(url, params=params)
     
     return json.dumps(result, indent=2)
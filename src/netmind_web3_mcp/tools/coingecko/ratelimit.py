@@ -0,0 +1,178 @@
+"""Shared request budget for the CoinGecko API: a rate limit plus adaptive concurrency."""
+
+import asyncio
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Deque, Dict, Optional
+
+from .config import get_config
+
+# Statuses that mean CoinGecko is overloaded or throttling; they shrink concurrency and are retried
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delay in seconds or an HTTP date) into seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Requests-per-minute limit that allows bursts of up to burst requests.
+
+    Implemented as a virtual schedule (GCRA): every request reserves the next slot, so waiters
+    are served in arrival order without a lock.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.interval = 60.0 / rate_per_minute
+        # How far ahead of real time the schedule may run before requests have to wait
+        self.tolerance = (burst - 1) * self.interval
+        self.next_slot = 0.0
+
+    def reserve(self) -> float:
+        """Reserve a slot and return the seconds to wait for it."""
+        now = time.monotonic()
+        slot = max(self.next_slot, now)
+        self.next_slot = slot + self.interval
+        return max(0.0, slot - now - self.tolerance)
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all requests for seconds, after which they resume at the steady rate."""
+        self.next_slot = max(self.next_slot, time.monotonic() + seconds + self.tolerance)
+
+
+class AIMDLimiter:
+    """Concurrency limit with additive increase and multiplicative decrease.
+
+    Every successful request raises the limit by 1/limit, about one slot per round trip of a full
+    window; a throttled request halves it. Decreases within one cooldown count as one, so a burst
+    of 429s from the same window does not collapse the limit to the minimum.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, cooldown_seconds: float = 1.0):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.cooldown_seconds = cooldown_seconds
+        self.active = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        self.last_decrease = 0.0
+
+    async def acquire(self) -> None:
+        while self.active >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self.waiters:
+                    self.waiters.remove(waiter)
+                elif not waiter.cancelled():
+                    # Woken then cancelled: hand the slot on
+                    self._wake()
+                raise
+        self.active += 1
+
+    def release(self) -> None:
+        self.active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.active
+        while free > 0 and self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def on_success(self) -> None:
+        if self.limit < self.maximum:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._wake()
+
+    def on_throttle(self) -> None:
+        now = time.monotonic()
+        if now - self.last_decrease >= self.cooldown_seconds:
+            self.limit = max(self.minimum, self.limit / 2)
+            self.last_decrease = now
+
+
+class RateLimiter:
+    """Global CoinGecko request budget shared by all tools."""
+
+    def __init__(self, bucket: TokenBucket, concurrency: AIMDLimiter, max_retries: int, retry_base_delay: float, retry_max_delay: float):
+        self.bucket = bucket
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.throttled = 0
+        self.retries = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a concurrency slot and a rate-limit token for one request."""
+        await self.concurrency.acquire()
+        try:
+            await self.bucket.acquire()
+            yield
+        finally:
+            self.concurrency.release()
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay for a retry attempt (0-based)."""
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+
+    def on_throttle(self, retry_after: Optional[float]) -> None:
+        self.throttled += 1
+        self.concurrency.on_throttle()
+        if retry_after:
+            self.bucket.pause(retry_after)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "active": self.concurrency.active,
+            "waiting": len(self.concurrency.waiters),
+            "throttled": self.throttled,
+            "retries": self.retries,
+        }
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _rate_limiter
+    if _rate_limiter is None:
+        config = get_config()
+        _rate_limiter = RateLimiter(
+            bucket=TokenBucket(config.rate_limit_per_minute, config.rate_limit_burst),
+            concurrency=AIMDLimiter(config.max_concurrent, config.min_concurrent, config.max_concurrent),
+            max_retries=config.max_retries,
+            retry_base_delay=config.retry_base_delay,
+            retry_max_delay=config.retry_max_delay,
+        )
+    return _rate_limiter
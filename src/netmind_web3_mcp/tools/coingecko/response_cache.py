@@ -0,0 +1,203 @@
+"""TTL response cache for CoinGecko endpoints, with an optional on-disk tier."""
+
+import asyncio
+import hashlib
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from .config import get_config
+
+_HEX_ADDRESS = re.compile(r"0[xX][0-9a-fA-F]{40}")
+
+def cache_key(path: str, params: Optional[dict] = None) -> str:
+    """Normalize an endpoint path and query parameters into a cache key.
+
+    Parameters are sorted, None values dropped and hex addresses in the path lowercased, so
+    equivalent requests share an entry.
+    """
+    items = sorted((str(k), str(v)) for k, v in (params or {}).items() if v is not None)
+    path = "/" + _HEX_ADDRESS.sub(lambda m: m.group(0).lower(), path.strip("/"))
+    return f"{path}?{urlencode(items)}" if items else path
+
+
+class ResponseCache:
+    """LRU cache of raw response bodies with per-entry expiry, bounded by total body size.
+
+    Bodies are stored undecoded so every hit returns a fresh object that callers may modify.
+    With disk_dir set, entries are also written there and survive restarts; the disk tier is
+    read on a memory miss and expired files are removed when found. Once the files written
+    exceed disk_max_bytes, expired files and then the soonest to expire are removed.
+    """
+
+    def __init__(self, ttls: List[Tuple[str, float]], max_bytes: int, disk_dir: Optional[str] = None, disk_max_bytes: int = 256 * 2**20):
+        # (path regex, TTL seconds), first match wins; unmatched paths are not cached
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in ttls]
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        # Approximate size of the disk tier, None until the directory is first swept
+        self.disk_bytes: Optional[int] = None
+        self.disk_lock = threading.Lock()
+        self.entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def ttl_for(self, path: str) -> float:
+        for pattern, ttl in self.ttls:
+            if pattern.search(path):
+                return ttl
+        return 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                body, expires_at = entry
+                if expires_at > now:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return body
+                self._remove(key)
+
+        body = await asyncio.to_thread(self._read_disk, key, now) if self.disk_dir else None
+        with self.lock:
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return body
+
+    async def set(self, key: str, body: bytes, ttl: float) -> None:
+        expires_at = time.time() + ttl
+        self._put(key, body, expires_at)
+        if self.disk_dir:
+            await asyncio.to_thread(self._write_disk, key, body, expires_at)
+
+    def _put(self, key: str, body: bytes, expires_at: float) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self.lock:
+            self._remove(key)
+            self.entries[key] = (body, expires_at)
+            self.total_bytes += len(body)
+            while self.total_bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry. Caller must hold self.lock."""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= len(entry[0])
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def _read_disk(self, key: str, now: float) -> Optional[bytes]:
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                expires_at = float(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if expires_at <= now:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        # Promote to memory for the rest of its lifetime
+        self._put(key, body, expires_at)
+        return body
+
+    def _write_disk(self, key: str, body: bytes, expires_at: float) -> None:
+        if len(body) > self.disk_max_bytes:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        header = f"{expires_at}\n".encode()
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(header)
+                f.write(body)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: failed to write CoinGecko cache file {path}: {type(e).__name__}: {str(e)}", file=sys.stderr)
+            return
+
+        with self.disk_lock:
+            # Rewrites of a key and other processes' files make the count drift; each sweep recounts
+            if self.disk_bytes is not None and self.disk_bytes + len(header) + len(body) <= self.disk_max_bytes:
+                self.disk_bytes += len(header) + len(body)
+            else:
+                self._sweep_disk(time.time())
+
+    def _sweep_disk(self, now: float) -> None:
+        """Remove expired files, then the soonest to expire until the disk tier is within 90% of its budget.
+
+        Caller must hold self.disk_lock. Sweeping below the budget leaves room for further writes
+        before the next sweep.
+        """
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path, "rb") as f:
+                    expires_at = float(f.readline())
+                files.append((expires_at, entry.stat().st_size, entry.path))
+            except (OSError, ValueError):
+                continue
+
+        total = sum(size for _, size, _ in files)
+        target = int(self.disk_max_bytes * 0.9)
+        for expires_at, size, path in sorted(files):
+            if expires_at > now and total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self.disk_bytes = total
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {"entries": len(self.entries), "bytes": self.total_bytes, "hits": self.hits, "misses": self.misses}
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the shared response cache, or None if COINGECKO_CACHE_ENABLED is false."""
+    global _response_cache
+    config = get_config()
+    if not config.cache_enabled:
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            _response_cache = ResponseCache(
+                ttls=[
+                    (r"^/coins/markets$", config.cache_ttl_markets),
+                    (r"^/coins/[^/]+/market_chart$", config.cache_ttl_market_chart),
+                    (r"^/onchain/networks/[^/]+/tokens/[^/]+/top_traders$", config.cache_ttl_top_traders),
+                    (r"^/onchain/networks/[^/]+/(pools|tokens)/[^/]+/trades$", config.cache_ttl_trades),
+                ],
+                max_bytes=int(config.cache_max_mb * 2**20),
+                disk_dir=config.cache_dir,
+                disk_max_bytes=int(config.cache_disk_max_mb * 2**20),
+            )
+        return _response_cache
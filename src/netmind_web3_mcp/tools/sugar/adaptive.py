@@ -0,0 +1,25 @@
+"""Adaptive per-chain refresh intervals driven by how much consecutive snapshots differ."""
+
+from .diff import SnapshotDiff
+
+# A refresh that significantly changed more than this fraction of pools shortens the interval
+FAST_CHANGE_RATIO = 0.10
+# A refresh that changed less than this fraction lengthens it
+SLOW_CHANGE_RATIO = 0.02
+SHRINK_FACTOR = 0.5
+GROWTH_FACTOR = 1.5
+
+
+def change_ratio(diff: SnapshotDiff, pool_count: int) -> float:
+    """Fraction of pools that appeared, disappeared or significantly changed between two snapshots."""
+    changed = diff.significant_count + len(diff.new_pools) + len(diff.removed_pools)
+    return changed / max(pool_count, 1)
+
+
+def next_interval(current_seconds: float, ratio: float, min_seconds: float, max_seconds: float) -> float:
+    """Shrink the interval while data moves fast, grow it while quiet, within [min_seconds, max_seconds]."""
+    if ratio > FAST_CHANGE_RATIO:
+        current_seconds *= SHRINK_FACTOR
+    elif ratio < SLOW_CHANGE_RATIO:
+        current_seconds *= GROWTH_FACTOR
+    return min(max(current_seconds, min_seconds), max_seconds)
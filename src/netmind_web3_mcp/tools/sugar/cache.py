@@ -1,12 +1,27 @@
 """Cache system for Sugar MCP liquidity pools."""
 
+import asyncio
+import itertools
+import sys
 import threading
 import time
+from concurrent.futures import Future
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+from dataclasses import dataclass, field, replace
 
-from netmind_sugar.chains import get_chain, LiquidityPool  
+from netmind_sugar.chains import LiquidityPool
+
+from .adaptive import change_ratio, next_interval
+from .delta import get_changed_pool_addresses, get_created_pool_addresses, read_pools
+from .diff import SnapshotDiff, compute_snapshot_diff
+from .history import HistoryPoint, HistoryStore
+from .memory import AccessCounter, estimate_items_bytes
+from .metrics import PoolMetrics, compute_pool_metrics, get_pool_metrics
+from .models import LiquidityPoolInfo
+from .stats import TokenStats, compute_token_stats
+from .refresher import CacheRefresher
+from .rpc import RequestCancelled, get_chain
 
 
 @dataclass
@@ -15,17 +30,103 @@ class CacheConfig:
     duration_minutes: int = 30
     enabled_chain_ids: Optional[List[str]] = None
     filter_invalid_pools: bool = True
+    # "ttl" refreshes every duration_minutes; "block" also refreshes once the chain head
+    # is block_lag_threshold blocks past the snapshot, polling every block_poll_seconds;
+    # "adaptive" refreshes each chain on its own interval, starting at duration_minutes and
+    # adjusted within [adaptive_min_minutes, adaptive_max_minutes] by the observed change rate
+    refresh_mode: str = "ttl"
+    block_poll_seconds: int = 15
+    block_lag_threshold: int = 150
+    adaptive_min_minutes: float = 5
+    adaptive_max_minutes: float = 120
+    # "full" re-reads every pool on refresh; "delta" re-reads only pools with logs since the
+    # snapshot block, with a full sweep once the last one is older than delta_full_refresh_minutes
+    refresh_strategy: str = "full"
+    delta_max_blocks: int = 2000
+    delta_full_refresh_minutes: float = 240
+    # Metric points kept per pool across refreshes; 0 disables history
+    history_depth: int = 48
+    # Largest TVL/APR/volume changes kept per metric in each snapshot diff
+    diff_top_n: int = 20
+    # Upper bound on the estimated memory of all snapshots; None is unlimited. When exceeded,
+    # the least recently used chains that are not pinned are evicted
+    memory_budget_mb: Optional[float] = None
+    pinned_chain_ids: Optional[List[str]] = None
+    # Background refresher: threads for blocking chain reads, and how long shutdown waits
+    # for in-flight refreshes to publish before cancelling them
+    refresh_workers: int = 4
+    shutdown_grace_seconds: float = 10.0
 
     def __post_init__(self):
         """Validate configuration after initialization."""
         if self.duration_minutes <= 0:
             raise ValueError("Cache duration must be positive")
+        if self.refresh_mode not in ("ttl", "block", "adaptive"):
+            raise ValueError("refresh_mode must be 'ttl', 'block' or 'adaptive'")
+        if self.block_poll_seconds <= 0:
+            raise ValueError("block_poll_seconds must be positive")
+        if self.block_lag_threshold <= 0:
+            raise ValueError("block_lag_threshold must be positive")
+        if self.adaptive_min_minutes <= 0 or self.adaptive_min_minutes > self.adaptive_max_minutes:
+            raise ValueError("adaptive_min_minutes must be positive and not greater than adaptive_max_minutes")
+        if self.refresh_strategy not in ("full", "delta"):
+            raise ValueError("refresh_strategy must be 'full' or 'delta'")
+        if self.delta_max_blocks <= 0:
+            raise ValueError("delta_max_blocks must be positive")
+        if self.delta_full_refresh_minutes <= 0:
+            raise ValueError("delta_full_refresh_minutes must be positive")
+        if self.refresh_strategy == "delta" and self.refresh_mode == "ttl" and self.delta_full_refresh_minutes <= self.duration_minutes:
+            # Every ttl refresh would find the last full sweep due and run another one
+            raise ValueError("delta_full_refresh_minutes must be greater than duration_minutes for delta refreshes in ttl mode")
+        if self.history_depth < 0:
+            raise ValueError("history_depth cannot be negative")
+        if self.diff_top_n <= 0:
+            raise ValueError("diff_top_n must be positive")
+        if self.memory_budget_mb is not None and self.memory_budget_mb <= 0:
+            raise ValueError("memory_budget_mb must be positive")
+        if self.refresh_workers <= 0:
+            raise ValueError("refresh_workers must be positive")
+        if self.shutdown_grace_seconds < 0:
+            raise ValueError("shutdown_grace_seconds cannot be negative")
         if self.enabled_chain_ids is not None and len(self.enabled_chain_ids) == 0:
             raise ValueError("enabled_chain_ids cannot be an empty list")
 
 
+# Monotonic snapshot version, unique across chains
+_snapshot_versions = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class PoolsSnapshot:
+    """Immutable pools snapshot for one chain.
+
+    Snapshots are never modified after they are published, apart from the pool_infos and
+    pool_metrics memos, which only ever gain entries for pools of this snapshot.
+    Refreshes publish a new snapshot. Metrics and per-token stats are computed when the
+    snapshot is built.
+    """
+    pools: List[LiquidityPool]
+    pool_index: Dict[str, LiquidityPool]
+    block_number: Optional[int]
+    last_updated: datetime
+    last_full_refresh: datetime
+    # Identifies the snapshot; pagination cursors record it to detect that their snapshot was replaced
+    version: int = field(default_factory=lambda: next(_snapshot_versions))
+    pool_infos: Dict[str, LiquidityPoolInfo] = field(default_factory=dict)
+    pool_metrics: Dict[str, PoolMetrics] = field(default_factory=dict)
+    token_stats: Dict[str, TokenStats] = field(default_factory=dict)
+    # Changes since the previously published snapshot, None for the first snapshot of a chain
+    diff: Optional[SnapshotDiff] = None
+    # Estimated memory of the snapshot at publish time, excluding the lazily filled pool_infos memo
+    size_bytes: int = 0
+
+
 class PoolsCache:
-    """Thread-safe cache for liquidity pools data with automatic background updates."""
+    """Thread-safe cache for liquidity pools data with automatic background updates.
+
+    Each chain maps to an immutable PoolsSnapshot that is replaced by reference swap.
+    Readers never lock; writers for a chain serialize on that chain's fetch lock.
+    """
 
     def __init__(self, cache_duration_minutes: int = 30, enabled_chain_ids: Optional[List[str]] = None, filter_invalid_pools: bool = True, config: Optional[CacheConfig] = None):
         # Use config if provided, otherwise use individual parameters
@@ -34,16 +135,10 @@ class PoolsCache:
             enabled_chain_ids = config.enabled_chain_ids
             filter_invalid_pools = config.filter_invalid_pools
 
-        self.cache: Dict[str, Dict] = {}
+        self.cache: Dict[str, PoolsSnapshot] = {}
         self.cache_duration = timedelta(minutes=cache_duration_minutes)
         # If None, cache all chains. If list provided, only cache specified chains
         self.enabled_chain_ids = enabled_chain_ids
-        self.lock = threading.Lock()
-
-        # Background update thread
-        self.update_thread: Optional[threading.Thread] = None
-        self.update_thread_lock = threading.Lock()
-        self.update_running = False
 
         # Track ongoing fetch operations to prevent cache storms
         self.fetch_locks: Dict[str, threading.Lock] = {}
@@ -52,6 +147,32 @@ class PoolsCache:
         # Pool filtering configuration
         self.filter_invalid_pools = filter_invalid_pools
 
+        # Refresh policy; duration still caps snapshot age in block mode
+        self.refresh_mode = config.refresh_mode if config is not None else "ttl"
+        self.block_poll_seconds = config.block_poll_seconds if config is not None else 15
+        self.block_lag_threshold = config.block_lag_threshold if config is not None else 150
+        self.adaptive_min_seconds = 60 * (config.adaptive_min_minutes if config is not None else 5)
+        self.adaptive_max_seconds = 60 * (config.adaptive_max_minutes if config is not None else 120)
+        # Adaptive mode: current refresh interval and last observed change ratio per chain
+        self.refresh_intervals: Dict[str, float] = {}
+        self.change_ratios: Dict[str, float] = {}
+        self.refresh_strategy = config.refresh_strategy if config is not None else "full"
+        self.delta_max_blocks = config.delta_max_blocks if config is not None else 2000
+        self.delta_full_refresh_interval = timedelta(minutes=config.delta_full_refresh_minutes if config is not None else 240)
+
+        # Per-pool metric history, appended on every published snapshot
+        self.history = HistoryStore(config.history_depth if config is not None else 48)
+        self.diff_top_n = config.diff_top_n if config is not None else 20
+
+        # Memory budget; chains are ranked for eviction by decayed get_pools access counts
+        self.memory_budget_bytes: Optional[int] = None
+        self.pinned_chain_ids: List[str] = []
+        self.access = AccessCounter()
+        self.evictions = 0
+        self.over_budget_warned = False
+        if config is not None:
+            self.set_memory_budget(config.memory_budget_mb, config.pinned_chain_ids)
+
     def get_pools(self, chain_id: str) -> List[LiquidityPool]:
         """Get cached pools for a chain, updating cache if necessary.
 
@@ -69,30 +190,37 @@ class PoolsCache:
                     raise TypeError(f"chain.get_pools() returned {type(result)} instead of list")
                 return result
 
-        # Use double-checked locking with per-chain fetch locks to prevent cache storms
-        with self.lock:
-            now = datetime.now()
+        self.access.touch(chain_id)
 
-            # Check if we have valid cached data
-            if chain_id in self.cache:
-                cache_entry = self.cache[chain_id]
-                if now - cache_entry["last_updated"] < self.cache_duration:
-                    return cache_entry["pools"]
+        # Lock-free read of the published snapshot
+        snapshot = self.cache.get(chain_id)
+        if snapshot is not None and datetime.now() - snapshot.last_updated < self.get_max_age(chain_id):
+            return snapshot.pools
 
         # Cache is stale or doesn't exist, need to fetch new data
         # Use per-chain lock to prevent multiple concurrent fetches for the same chain
         with self._get_fetch_lock(chain_id):
-            # Double-check: another thread might have updated the cache while we waited
-            with self.lock:
-                if chain_id in self.cache:
-                    cache_entry = self.cache[chain_id]
-                    now = datetime.now()
-                    if now - cache_entry["last_updated"] < self.cache_duration:
-                        return cache_entry["pools"]
+            # Double-check: another thread might have published a snapshot while we waited
+            snapshot = self.cache.get(chain_id)
+            if snapshot is not None and datetime.now() - snapshot.last_updated < self.get_max_age(chain_id):
+                return snapshot.pools
 
             # Still need to fetch, do it now
             return self._fetch_and_cache_pools(chain_id, datetime.now())
 
+    def get_max_age(self, chain_id: str) -> timedelta:
+        """Age at which a chain's snapshot is due for refresh: its adaptive interval, or the cache duration."""
+        if self.refresh_mode != "adaptive":
+            return self.cache_duration
+        seconds = self.refresh_intervals.get(chain_id)
+        if seconds is None:
+            seconds = min(max(self.cache_duration.total_seconds(), self.adaptive_min_seconds), self.adaptive_max_seconds)
+        return timedelta(seconds=seconds)
+
+    def get_snapshot(self, chain_id: str) -> Optional[PoolsSnapshot]:
+        """Get the published snapshot for a chain without triggering a fetch, even if it is stale."""
+        return self.cache.get(chain_id)
+
     def _get_fetch_lock(self, chain_id: str) -> threading.Lock:
         """Get or create a fetch lock for the specified chain."""
         with self.fetch_lock_lock:
@@ -159,7 +287,7 @@ class PoolsCache:
                 invalid_count += 1
 
         if invalid_count > 0:
-            print(f"Filtered out {invalid_count} invalid pools, kept {len(valid_pools)} valid pools")
+            print(f"Filtered out {invalid_count} invalid pools, kept {len(valid_pools)} valid pools", file=sys.stderr)
 
         return valid_pools
 
@@ -167,27 +295,267 @@ class PoolsCache:
         """Get a specific pool by liquidity pool address from cache."""
 
         pools = self.get_pools(chain_id)
+        snapshot = self.cache.get(chain_id)
+        if snapshot is not None and snapshot.pools is pools:
+            return snapshot.pool_index.get(lp.lower())
         return next((pool for pool in pools if pool.lp.lower() == lp.lower()), None)
 
-    def _fetch_and_cache_pools(self, chain_id: str, timestamp: datetime) -> List[LiquidityPool]:
-        """Fetch pools from chain and update cache."""
+    def get_cached_pool_info(self, chain_id: str, lp: str) -> Optional[LiquidityPoolInfo]:
+        """Get the pool model for an address from the current snapshot without triggering a fetch.
+
+        Models are built on first use and reused for the lifetime of the snapshot.
+        """
+        snapshot = self.cache.get(chain_id)
+        if snapshot is None:
+            return None
+
+        key = lp.lower()
+        pool_info = snapshot.pool_infos.get(key)
+        if pool_info is None:
+            pool = snapshot.pool_index.get(key)
+            if pool is None:
+                return None
+            # Concurrent builders may race here; setdefault keeps the first model
+            pool_info = snapshot.pool_infos.setdefault(key, LiquidityPoolInfo.from_pool(pool))
+        return pool_info
+
+    def get_metrics(self, chain_id: str, pools: List[LiquidityPool]) -> List[PoolMetrics]:
+        """Get metrics aligned with pools, memoized on the current snapshot for pools that belong to it."""
+        snapshot = self.cache.get(chain_id)
+        if snapshot is None:
+            return get_pool_metrics(pools)
+
+        result = []
+        for pool in pools:
+            key = pool.lp.lower()
+            if snapshot.pool_index.get(key) is not pool:
+                result.append(compute_pool_metrics(pool))
+                continue
+            metrics = snapshot.pool_metrics.get(key)
+            if metrics is None:
+                metrics = snapshot.pool_metrics.setdefault(key, compute_pool_metrics(pool))
+            result.append(metrics)
+        return result
+
+    def get_token_stats(self, chain_id: str, token_address: str) -> Optional[TokenStats]:
+        """Get precomputed stats for a token from the current snapshot without triggering a fetch."""
+        snapshot = self.cache.get(chain_id)
+        if snapshot is None:
+            return None
+        return snapshot.token_stats.get(token_address.lower())
+
+    def _make_snapshot(self, pools: List[LiquidityPool], timestamp: datetime, block_number: Optional[int] = None, last_full_refresh: Optional[datetime] = None, pool_infos: Optional[Dict[str, LiquidityPoolInfo]] = None, pool_metrics: Optional[Dict[str, PoolMetrics]] = None) -> PoolsSnapshot:
+        """Build a pools snapshot with an address index, pool metrics, per-token stats and a lazily-filled model memo.
+
+        pool_metrics may carry metrics over from a previous snapshot for unchanged pools; the rest are computed here.
+        """
+        pool_metrics = pool_metrics if pool_metrics is not None else {}
+        metrics = []
+        for pool in pools:
+            key = pool.lp.lower()
+            m = pool_metrics.get(key)
+            if m is None:
+                m = pool_metrics[key] = compute_pool_metrics(pool)
+            metrics.append(m)
+
+        return PoolsSnapshot(
+            pools=pools,
+            pool_index={pool.lp.lower(): pool for pool in pools},
+            block_number=block_number,
+            last_updated=timestamp,
+            last_full_refresh=last_full_refresh or timestamp,
+            pool_infos=pool_infos if pool_infos is not None else {},
+            pool_metrics=pool_metrics,
+            token_stats=compute_token_stats(pools, metrics),
+        )
+
+    def _publish(self, chain_id: str, snapshot: PoolsSnapshot) -> None:
+        """Publish a snapshot with its diff against the previous one and record its metrics in the history.
+
+        Evicts cold chains afterwards if the memory budget is exceeded. Caller must hold the chain's fetch lock.
+        """
+        previous = self.cache.get(chain_id)
+        if snapshot.pools:
+            diff = None
+            if previous is not None and previous.pools:
+                diff = compute_snapshot_diff(
+                    previous.pool_index, previous.pool_metrics,
+                    snapshot.pool_index, snapshot.pool_metrics,
+                    previous.block_number, snapshot.block_number,
+                    previous.last_updated, snapshot.last_updated,
+                    self.diff_top_n,
+                )
+                ratio = change_ratio(diff, len(snapshot.pools))
+                self.change_ratios[chain_id] = ratio
+                self.refresh_intervals[chain_id] = next_interval(
+                    self.get_max_age(chain_id).total_seconds(), ratio, self.adaptive_min_seconds, self.adaptive_max_seconds
+                )
+            snapshot = replace(snapshot, diff=diff, size_bytes=self._estimate_snapshot_bytes(snapshot))
+        self.cache[chain_id] = snapshot
+        if snapshot.pools:
+            self.history.record(chain_id, snapshot.last_updated.timestamp(), snapshot.block_number, snapshot.pool_metrics)
+            self._enforce_memory_budget(chain_id)
+
+    def _estimate_snapshot_bytes(self, snapshot: PoolsSnapshot) -> int:
+        """Estimate the memory held by a snapshot's pools, index, metrics and token stats."""
+        n = len(snapshot.pools)
+        size = sys.getsizeof(snapshot.pools) + estimate_items_bytes(snapshot.pools)
+        # Index and memo dicts with their lowercase address keys
+        if n:
+            key_bytes = sys.getsizeof(snapshot.pools[0].lp.lower())
+            size += sys.getsizeof(snapshot.pool_index) + sys.getsizeof(snapshot.pool_metrics) + 2 * n * key_bytes
+        size += estimate_items_bytes(list(snapshot.pool_metrics.values()))
+        size += sys.getsizeof(snapshot.token_stats) + estimate_items_bytes(list(snapshot.token_stats.values()))
+        return size
+
+    def _chain_bytes(self, chain_id: str, snapshot: PoolsSnapshot) -> int:
+        """Estimated memory of a chain: its snapshot, the pool_infos memo filled so far and its history."""
+        return (
+            snapshot.size_bytes
+            + estimate_items_bytes(list(snapshot.pool_infos.values()))
+            + self.history.size_bytes(chain_id)
+        )
+
+    def _enforce_memory_budget(self, current_chain_id: str) -> None:
+        """Evict the least accessed chains until the cache fits the memory budget.
+
+        Pinned chains and the chain just published are never evicted; evicting the latter would
+        only make its next request fetch it again. Chains being refreshed by another thread are
+        skipped rather than waited for. Staying over budget is warned about once until the cache
+        fits again.
+        """
+        if self.memory_budget_bytes is None:
+            return
+        sizes = {chain_id: self._chain_bytes(chain_id, snapshot) for chain_id, snapshot in list(self.cache.items())}
+        total = sum(sizes.values())
+
+        candidates = [chain_id for chain_id in sizes if chain_id not in self.pinned_chain_ids and chain_id != current_chain_id]
+        for chain_id in self.access.coldest_first(candidates):
+            if total <= self.memory_budget_bytes:
+                break
+            lock = self._get_fetch_lock(chain_id)
+            if not lock.acquire(blocking=False):
+                continue
+            try:
+                if self.cache.pop(chain_id, None) is None:
+                    continue
+                self.history.clear(chain_id)
+            finally:
+                lock.release()
+            total -= sizes[chain_id]
+            self.evictions += 1
+            print(f"Evicted cache for chain {chain_id} ({sizes[chain_id] / 2**20:.1f} MB) to fit the memory budget", file=sys.stderr)
+
+        if total <= self.memory_budget_bytes:
+            self.over_budget_warned = False
+        elif not self.over_budget_warned:
+            self.over_budget_warned = True
+            print(f"Warning: pools cache uses {total / 2**20:.1f} MB, over the {self.memory_budget_bytes / 2**20:.1f} MB budget, with no evictable chains left; keeping chain {current_chain_id} as it was just refreshed", file=sys.stderr)
+
+    def _read_block_number(self, chain) -> Optional[int]:
+        """Read the latest block number on an open chain, or None if the RPC call fails."""
+        try:
+            return chain.web3.eth.block_number
+        except Exception as e:
+            print(f"Failed to read block number for chain {chain.chain_id}: {type(e).__name__}: {str(e)}", file=sys.stderr)
+            return None
+
+    def _get_latest_block(self, chain_id: str) -> Optional[int]:
+        """Poll the latest block number for a chain, or None if the RPC call fails."""
+        try:
+            with get_chain(chain_id) as chain:
+                return self._read_block_number(chain)
+        except Exception as e:
+            print(f"Failed to poll latest block for chain {chain_id}: {type(e).__name__}: {str(e)}", file=sys.stderr)
+            return None
+
+    def _delta_refresh(self, chain, chain_id: str, block_number: Optional[int], timestamp: datetime) -> Optional[PoolsSnapshot]:
+        """Build a new snapshot by re-reading only pools that changed since the current snapshot.
+
+        Returns None when a full refresh is needed instead: delta refresh disabled, no usable
+        snapshot, the last full sweep older than the full refresh interval, too many blocks behind,
+        or an error while reading logs or pools.
+        """
+        if self.refresh_strategy != "delta" or block_number is None:
+            return None
+        base = self.cache.get(chain_id)
+        if base is None or not base.pools or base.block_number is None:
+            return None
+        if timestamp - base.last_full_refresh >= self.delta_full_refresh_interval:
+            return None
+        blocks_behind = block_number - base.block_number
+        if blocks_behind > self.delta_max_blocks:
+            return None
+
+        try:
+            changed, created = set(), set()
+            if blocks_behind > 0:
+                from_block = base.block_number + 1
+                changed = get_changed_pool_addresses(chain, base.pools, from_block, block_number)
+                created = get_created_pool_addresses(chain, base.pools, from_block, block_number) - base.pool_index.keys()
+            refreshed, failed = read_pools(chain, sorted(changed | created), base.pools)
+        except RequestCancelled:
+            raise
+        except Exception as e:
+            print(f"Delta refresh failed for chain {chain_id}, falling back to full refresh: {type(e).__name__}: {str(e)}", file=sys.stderr)
+            return None
+
+        if failed:
+            print(f"Warning: {len(failed)} changed pools could not be re-read for chain {chain_id}, keeping their previous data", file=sys.stderr)
+
+        # Changed pools that no longer pass validation are dropped, as a full refresh would
+        valid = {pool.lp.lower(): pool for pool in self._filter_invalid_pools(refreshed)}
+        dropped = {pool.lp.lower() for pool in refreshed} - valid.keys()
+        pools = [valid.pop(pool.lp.lower(), pool) for pool in base.pools if pool.lp.lower() not in dropped]
+        pools.extend(valid.values())
+
+        # Unchanged pools keep their models and metrics
+        pool_infos, pool_metrics = dict(base.pool_infos), dict(base.pool_metrics)
+        for pool in refreshed:
+            pool_infos.pop(pool.lp.lower(), None)
+            pool_metrics.pop(pool.lp.lower(), None)
+
+        print(f"Delta refresh for chain {chain_id}: {len(changed)} changed, {len(created)} new pools over {blocks_behind} blocks", file=sys.stderr)
+        return self._make_snapshot(pools, timestamp, block_number, base.last_full_refresh, pool_infos, pool_metrics)
+
+    def _fetch_and_cache_pools(self, chain_id: str, timestamp: datetime, cancel: Optional[threading.Event] = None) -> List[LiquidityPool]:
+        """Fetch pools from chain and publish a new snapshot. Caller must hold the chain's fetch lock.
+
+        Once cancel is set, the chain's remaining RPC requests are not sent and the existing pools are returned
+        without publishing a new snapshot.
+        """
+        def _existing_pools() -> List[LiquidityPool]:
+            snapshot = self.cache.get(chain_id)
+            return snapshot.pools if snapshot is not None else []
+
         def _preserve_or_expire(reason: str) -> List[LiquidityPool]:
             """Preserve existing cache on bad result; if none exists, set expired so next call retries."""
-            with self.lock:
-                existing = self.cache.get(chain_id, {}).get("pools", [])
-                if existing:
-                    print(f"Warning: {reason} for chain {chain_id}, keeping {len(existing)} existing cached pools")
-                else:
-                    print(f"Warning: {reason} for chain {chain_id}, no previous cache available")
-                    self.cache[chain_id] = {
-                        "pools": [],
-                        "last_updated": datetime.min  # expired immediately so next call retries
-                    }
+            existing = _existing_pools()
+            if existing:
+                print(f"Warning: {reason} for chain {chain_id}, keeping {len(existing)} existing cached pools", file=sys.stderr)
+            else:
+                print(f"Warning: {reason} for chain {chain_id}, no previous cache available", file=sys.stderr)
+                # expired immediately so next call retries
+                self._publish(chain_id, self._make_snapshot([], datetime.min))
             return existing
 
         try:
-            with get_chain(chain_id) as chain:
-                pools = chain.get_pools()
+            with get_chain(chain_id, cancel=cancel) as chain:
+                # Read the head before the sweep so the snapshot is never labelled newer than its data
+                block_number = self._read_block_number(chain)
+                snapshot = self._delta_refresh(chain, chain_id, block_number, timestamp)
+                if snapshot is None:
+                    pools = chain.get_pools()
+
+            if cancel is not None and cancel.is_set():
+                print(f"Refresh for chain {chain_id} cancelled, discarding the fetched pools", file=sys.stderr)
+                return _existing_pools()
+
+            if snapshot is not None:
+                if not snapshot.pools:
+                    return _preserve_or_expire("delta refresh left no pools")
+                self._publish(chain_id, snapshot)
+                return snapshot.pools
 
             # Validate the result type
             if not isinstance(pools, list):
@@ -200,50 +568,38 @@ class PoolsCache:
             if not pools:
                 return _preserve_or_expire("all pools were filtered out (possible data quality issue)")
 
-            with self.lock:
-                self.cache[chain_id] = {
-                    "pools": pools,
-                    "last_updated": timestamp
-                }
+            self._publish(chain_id, self._make_snapshot(pools, timestamp, block_number))
 
             return pools
+        except RequestCancelled:
+            print(f"Refresh for chain {chain_id} cancelled", file=sys.stderr)
+            return _existing_pools()
         except Exception as e:
-            print(f"Failed to fetch and cache pools for chain {chain_id}: {type(e).__name__}: {str(e)}")
+            print(f"Failed to fetch and cache pools for chain {chain_id}: {type(e).__name__}: {str(e)}", file=sys.stderr)
             # On failure, preserve existing cached data (even if stale) to avoid returning empty results.
             # Only initialize an empty entry if there is no previous cache at all.
-            with self.lock:
-                existing = self.cache.get(chain_id, {}).get("pools", [])
-                if not existing:
-                    self.cache[chain_id] = {
-                        "pools": [],
-                        "last_updated": datetime.min  # expired immediately so next call retries
-                    }
+            existing = _existing_pools()
+            if not existing:
+                # expired immediately so next call retries
+                self._publish(chain_id, self._make_snapshot([], datetime.min))
             return existing
 
-    def start_background_updates(self):
-        """Start the background update thread."""
-        with self.update_thread_lock:
-            if self.update_thread is None or not self.update_thread.is_alive():
-                self.update_running = True
-                self.update_thread = threading.Thread(target=self._background_worker, daemon=True)
-                self.update_thread.start()
-                print("🔄 Background cache update thread started")
-
     def set_enabled_chains(self, chain_ids: Optional[List[str]]):
         """Set which chains should be cached. None means cache all chains.
 
         Args:
             chain_ids (Optional[List[str]]): List of chain IDs to cache, or None for all chains
         """
-        with self.lock:
-            self.enabled_chain_ids = chain_ids
-            if chain_ids is not None:
-                # Remove cached data for chains that are no longer enabled
-                chains_to_remove = [chain_id for chain_id in self.cache.keys()
-                                  if chain_id not in chain_ids]
-                for chain_id in chains_to_remove:
-                    del self.cache[chain_id]
-                    print(f"Removed cache for disabled chain {chain_id}")
+        self.enabled_chain_ids = chain_ids
+        if chain_ids is not None:
+            # Remove cached data for chains that are no longer enabled
+            chains_to_remove = [chain_id for chain_id in list(self.cache)
+                              if chain_id not in chain_ids]
+            for chain_id in chains_to_remove:
+                with self._get_fetch_lock(chain_id):
+                    self.cache.pop(chain_id, None)
+                    self.history.clear(chain_id)
+                print(f"Removed cache for disabled chain {chain_id}", file=sys.stderr)
 
     def set_cache_duration_minutes(self, minutes: int):
         """Set the cache duration in minutes.
@@ -252,7 +608,7 @@ class PoolsCache:
             minutes (int): Cache duration in minutes
         """
         self.cache_duration = timedelta(minutes=minutes)
-        print(f"Cache duration set to {minutes} minutes")
+        print(f"Cache duration set to {minutes} minutes", file=sys.stderr)
 
     def set_pool_filtering(self, enabled: bool):
         """Enable or disable pool filtering.
@@ -261,7 +617,117 @@ class PoolsCache:
             enabled (bool): Whether to filter out invalid pools
         """
         self.filter_invalid_pools = enabled
-        print(f"Pool filtering {'enabled' if enabled else 'disabled'}")
+        print(f"Pool filtering {'enabled' if enabled else 'disabled'}", file=sys.stderr)
+
+    def set_refresh_mode(
+        self,
+        mode: str,
+        block_poll_seconds: Optional[int] = None,
+        block_lag_threshold: Optional[int] = None,
+        adaptive_min_minutes: Optional[float] = None,
+        adaptive_max_minutes: Optional[float] = None,
+    ):
+        """Set the refresh policy.
+
+        Args:
+            mode (str): "ttl" to refresh on cache duration only, "block" to also refresh on block lag,
+                "adaptive" to refresh each chain on an interval adjusted by its change rate
+            block_poll_seconds (Optional[int]): Seconds between latest-block polls in block mode
+            block_lag_threshold (Optional[int]): Blocks the chain head may advance past a snapshot before it is refreshed
+            adaptive_min_minutes (Optional[float]): Shortest refresh interval in adaptive mode
+            adaptive_max_minutes (Optional[float]): Longest refresh interval in adaptive mode
+        """
+        if mode not in ("ttl", "block", "adaptive"):
+            raise ValueError("refresh_mode must be 'ttl', 'block' or 'adaptive'")
+        self.refresh_mode = mode
+        if block_poll_seconds is not None:
+            self.block_poll_seconds = block_poll_seconds
+        if block_lag_threshold is not None:
+            self.block_lag_threshold = block_lag_threshold
+        if adaptive_min_minutes is not None:
+            self.adaptive_min_seconds = 60 * adaptive_min_minutes
+        if adaptive_max_minutes is not None:
+            self.adaptive_max_seconds = 60 * adaptive_max_minutes
+        if mode == "block":
+            print(f"Cache refresh mode set to block (poll every {self.block_poll_seconds}s, lag threshold {self.block_lag_threshold} blocks)", file=sys.stderr)
+        elif mode == "adaptive":
+            print(f"Cache refresh mode set to adaptive ({self.adaptive_min_seconds / 60:g}-{self.adaptive_max_seconds / 60:g} minutes)", file=sys.stderr)
+        else:
+            print("Cache refresh mode set to ttl", file=sys.stderr)
+
+    def set_refresh_strategy(self, strategy: str, delta_max_blocks: Optional[int] = None, delta_full_refresh_minutes: Optional[float] = None):
+        """Set how snapshots are refreshed.
+
+        Args:
+            strategy (str): "full" to re-read every pool, "delta" to re-read only pools that changed
+            delta_max_blocks (Optional[int]): Largest block gap a delta refresh covers before falling back to a full one
+            delta_full_refresh_minutes (Optional[float]): Age of the last full sweep after which a delta refresh runs a full one instead
+        """
+        if strategy not in ("full", "delta"):
+            raise ValueError("refresh_strategy must be 'full' or 'delta'")
+        self.refresh_strategy = strategy
+        if delta_max_blocks is not None:
+            self.delta_max_blocks = delta_max_blocks
+        if delta_full_refresh_minutes is not None:
+            self.delta_full_refresh_interval = timedelta(minutes=delta_full_refresh_minutes)
+        print(f"Cache refresh strategy set to {strategy}", file=sys.stderr)
+
+    def set_history_depth(self, depth: int):
+        """Set how many metric points are kept per pool. Changing the depth drops existing history.
+
+        Args:
+            depth (int): Points kept per pool; 0 disables history
+        """
+        if depth != self.history.depth:
+            self.history = HistoryStore(depth)
+        print(f"Pool history depth set to {depth}", file=sys.stderr)
+
+    def set_memory_budget(self, budget_mb: Optional[float], pinned_chain_ids: Optional[List[str]] = None):
+        """Set the memory budget for all cached snapshots and the chains exempt from eviction.
+
+        Args:
+            budget_mb (Optional[float]): Budget in MiB, or None for unlimited
+            pinned_chain_ids (Optional[List[str]]): Chains that are never evicted
+        """
+        if budget_mb is not None and budget_mb <= 0:
+            raise ValueError("memory_budget_mb must be positive")
+        self.memory_budget_bytes = int(budget_mb * 2**20) if budget_mb is not None else None
+        self.pinned_chain_ids = list(pinned_chain_ids or [])
+        if budget_mb is not None:
+            print(f"Cache memory budget set to {budget_mb} MB (pinned chains: {', '.join(self.pinned_chain_ids) or 'none'})", file=sys.stderr)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Report per-chain memory estimates, access scores, refresh intervals and the budget state."""
+        chains = {}
+        for chain_id, snapshot in list(self.cache.items()):
+            chains[chain_id] = {
+                "pool_count": len(snapshot.pools),
+                "estimated_bytes": self._chain_bytes(chain_id, snapshot),
+                "access_score": round(self.access.score(chain_id), 3),
+                "pinned": chain_id in self.pinned_chain_ids,
+                "block_number": snapshot.block_number,
+                "snapshot_version": snapshot.version,
+                "last_updated": snapshot.last_updated.isoformat(timespec="seconds") if snapshot.pools else None,
+                "refresh_interval_seconds": self.get_max_age(chain_id).total_seconds(),
+                "change_ratio": self.change_ratios.get(chain_id),
+            }
+        return {
+            "refresh_mode": self.refresh_mode,
+            "memory_budget_bytes": self.memory_budget_bytes,
+            "estimated_total_bytes": sum(chain["estimated_bytes"] for chain in chains.values()),
+            "evictions": self.evictions,
+            "chains": chains,
+        }
+
+    def set_diff_top_n(self, top_n: int):
+        """Set how many of the largest changes per metric each snapshot diff keeps."""
+        if top_n <= 0:
+            raise ValueError("diff_top_n must be positive")
+        self.diff_top_n = top_n
+
+    def get_pool_history(self, chain_id: str, lp: str, limit: Optional[int] = None) -> List[HistoryPoint]:
+        """Get a pool's recent metric points, oldest first."""
+        return self.history.get(chain_id, lp, limit)
 
     def configure_cache(self, config: CacheConfig):
         """Configure the cache with a CacheConfig object.
@@ -272,77 +738,72 @@ class PoolsCache:
         self.set_cache_duration_minutes(config.duration_minutes)
         self.set_enabled_chains(config.enabled_chain_ids)
         self.set_pool_filtering(config.filter_invalid_pools)
+        self.set_refresh_mode(
+            config.refresh_mode,
+            config.block_poll_seconds,
+            config.block_lag_threshold,
+            config.adaptive_min_minutes,
+            config.adaptive_max_minutes,
+        )
+        self.set_refresh_strategy(config.refresh_strategy, config.delta_max_blocks, config.delta_full_refresh_minutes)
+        self.set_history_depth(config.history_depth)
+        self.set_diff_top_n(config.diff_top_n)
+        self.set_memory_budget(config.memory_budget_mb, config.pinned_chain_ids)
+
+    def get_poll_interval(self) -> float:
+        """Seconds between background checks for chains due a refresh: the cache duration, the block
+        poll interval in block mode, or the shortest allowed interval in adaptive mode."""
+        if self.refresh_mode == "block":
+            return self.block_poll_seconds
+        if self.refresh_mode == "adaptive":
+            return self.adaptive_min_seconds
+        return self.cache_duration.total_seconds()
+
+    def needs_refresh(self, chain_id: str, snapshot: PoolsSnapshot) -> bool:
+        """Check whether a snapshot should be refreshed.
+
+        Snapshots older than the cache duration (the chain's interval in adaptive mode) always refresh.
+        In block mode, snapshots also refresh once the chain head has moved block_lag_threshold blocks
+        past the snapshot block.
+        """
+        if datetime.now() - snapshot.last_updated >= self.get_max_age(chain_id):
+            return True
+        if self.refresh_mode != "block" or snapshot.block_number is None:
+            return False
 
-    def stop_background_updates(self):
-        """Stop the background update thread."""
-        with self.update_thread_lock:
-            self.update_running = False
-            if self.update_thread and self.update_thread.is_alive():
-                self.update_thread.join(timeout=5)
-
-    def _background_worker(self):
-        """Background worker that updates all cached chains periodically."""
-        while self.update_running:
-            try:
-                # Sleep for the configured cache duration between cache updates
-                time.sleep(self.cache_duration.total_seconds())
-
-                if not self.update_running:
-                    break
-
-                updated_count = self._update_all_caches()
+        latest_block = self._get_latest_block(chain_id)
+        if latest_block is None:
+            return False
+        return latest_block - snapshot.block_number >= self.block_lag_threshold
 
-                if updated_count > 0:
-                    print(f"🔄 Cache updated: {updated_count} entries refreshed")
+    def get_refresh_candidates(self) -> List[Tuple[str, PoolsSnapshot]]:
+        """Get the published snapshots of enabled chains, for the background refresher to check."""
+        enabled_chain_ids = self.enabled_chain_ids
+        return [
+            (chain_id, snapshot) for chain_id, snapshot in list(self.cache.items())
+            if enabled_chain_ids is None or chain_id in enabled_chain_ids
+        ]
 
-            except Exception as e:
-                print(f"❌ Cache update error: {type(e).__name__}: {str(e)}")
+    def refresh_chain(self, chain_id: str, expected: Optional[PoolsSnapshot] = None, cancel: Optional[threading.Event] = None) -> bool:
+        """Refresh a chain's snapshot now. Blocks on the chain's fetch lock and the chain reads.
 
-    def _update_all_caches(self):
-        """Update all enabled cached chains that are older than cache duration.
+        Args:
+            chain_id (str): The chain ID
+            expected (Optional[PoolsSnapshot]): If given, skip the refresh when another one has already replaced this snapshot
+            cancel (Optional[threading.Event]): When set before the new snapshot is published, it is discarded
 
         Returns:
-            int: Number of cache entries that were updated
+            bool: Whether a refresh ran and was not cancelled
         """
-        updated_count = 0
-
-        # Get list of chains to potentially update
-        with self.lock:
-            if self.enabled_chain_ids is None:
-                chains_to_check = list(self.cache.keys())
-            else:
-                chains_to_check = [chain_id for chain_id in self.cache.keys()
-                                 if chain_id in self.enabled_chain_ids]
-
-        for chain_id in chains_to_check:
-            # Check if update is needed without holding the main lock
-            needs_update = False
-            with self.lock:
-                if chain_id in self.cache:
-                    cache_entry = self.cache[chain_id]
-                    now = datetime.now()
-                    if now - cache_entry["last_updated"] >= self.cache_duration:
-                        needs_update = True
-
-            # If update needed, use fetch lock to coordinate with user requests
-            if needs_update:
-                try:
-                    with self._get_fetch_lock(chain_id):
-                        # Double-check after acquiring fetch lock; release lock before network I/O
-                        should_fetch = False
-                        with self.lock:
-                            if chain_id in self.cache:
-                                cache_entry = self.cache[chain_id]
-                                now = datetime.now()
-                                if now - cache_entry["last_updated"] >= self.cache_duration:
-                                    should_fetch = True
-                        if should_fetch:
-                            self._fetch_and_cache_pools(chain_id, datetime.now())
-                            updated_count += 1
-                except Exception as e:
-                    print(f"Error updating cache for chain {chain_id}: {type(e).__name__}: {str(e)}")
-
-        return updated_count
+        if self.enabled_chain_ids is not None and chain_id not in self.enabled_chain_ids:
+            raise ValueError(f"Chain {chain_id} is not cached")
+        with self._get_fetch_lock(chain_id):
+            if expected is not None and self.cache.get(chain_id) is not expected:
+                return False
+            if cancel is not None and cancel.is_set():
+                return False
+            self._fetch_and_cache_pools(chain_id, datetime.now(), cancel)
+            return cancel is None or not cancel.is_set()
 
 
 # Global cache instance
@@ -352,6 +813,10 @@ _cache = PoolsCache()
 _cache_initialized = False
 _cache_init_lock = threading.Lock()
 
+# Background refresher, created when the cache system starts
+_refresher: Optional[CacheRefresher] = None
+_refresher_config: Optional[CacheConfig] = None
+
 
 def _get_cached_pools(chain_id: str) -> List[LiquidityPool]:
     """Get cached pools for a chain."""
@@ -363,7 +828,7 @@ def _get_cached_pools(chain_id: str) -> List[LiquidityPool]:
 
     # Log slow requests (>1 second)
     if duration > 1.0:
-        print(f"Slow cache request for chain {chain_id}: {duration:.2f}s")
+        print(f"Slow cache request for chain {chain_id}: {duration:.2f}s", file=sys.stderr)
     return result
 
 
@@ -373,32 +838,197 @@ def _get_pool_from_cache(chain_id: str, address: str) -> Optional[LiquidityPool]
     return _cache.get_pool_by_address(chain_id, address)
 
 
+def _get_fresh_snapshot(chain_id: str) -> Optional[PoolsSnapshot]:
+    """Get the current cache snapshot for a chain if it is not due for refresh, without triggering a fetch."""
+    snapshot = _cache.get_snapshot(chain_id)
+    if snapshot is None or datetime.now() - snapshot.last_updated >= _cache.get_max_age(chain_id):
+        return None
+    return snapshot
+
+
+def _get_cached_snapshot(chain_id: str) -> Optional[PoolsSnapshot]:
+    """Get the current cache snapshot for a chain without triggering a fetch, or None if not cached."""
+    return _cache.get_snapshot(chain_id)
+
+
+def _get_pool_metrics(chain_id: str, pools: List[LiquidityPool]) -> List[PoolMetrics]:
+    """Get metrics aligned with pools, reusing the cache snapshot's memo when pools come from it."""
+    return _cache.get_metrics(chain_id, pools)
+
+
+def _get_pool_history(chain_id: str, address: str, limit: Optional[int] = None) -> List[HistoryPoint]:
+    """Get a pool's recent metric points from the cache history, oldest first."""
+    _ensure_cache_initialized()
+    return _cache.get_pool_history(chain_id, address, limit)
+
+
+def _get_token_stats_from_cache(chain_id: str, token_address: str) -> Optional[TokenStats]:
+    """Get precomputed stats for a token from the current cache snapshot, or None if the token is not in it."""
+    return _cache.get_token_stats(chain_id, token_address)
+
+
+def _get_pool_info_from_cache(chain_id: str, address: str) -> Optional[LiquidityPoolInfo]:
+    """Get a reusable pool model from the current cache snapshot, or None if the pool is not cached."""
+    return _cache.get_cached_pool_info(chain_id, address)
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers asking for the same key.
+
+    Callers that arrive while a call is running wait for it and get its result or exception.
+    With fresh_seconds > 0, a successful result is also served to callers arriving within that
+    many seconds after it completed. Failures are never reused.
+    """
+
+    def __init__(self, fresh_seconds: float = 0.0):
+        self.fresh_seconds = fresh_seconds
+        # key -> (future, completed_at); completed_at is None while the call is in flight
+        self.calls: Dict[Hashable, Tuple[Future, Optional[float]]] = {}
+        self.lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn, or join the in-flight (or just completed) call for the same key."""
+        with self.lock:
+            entry = self.calls.get(key)
+            if entry is not None:
+                future, completed_at = entry
+                if completed_at is None or time.monotonic() - completed_at < self.fresh_seconds:
+                    leader = False
+                else:
+                    leader = True
+            else:
+                leader = True
+            if leader:
+                future = Future()
+                self.calls[key] = (future, None)
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self.lock:
+                if self.fresh_seconds > 0 and future.exception() is None:
+                    self.calls[key] = (future, time.monotonic())
+                else:
+                    self.calls.pop(key, None)
+                # Drop results that are past the freshness window
+                now = time.monotonic()
+                expired = [k for k, (f, completed_at) in self.calls.items()
+                           if completed_at is not None and now - completed_at >= self.fresh_seconds]
+                for k in expired:
+                    del self.calls[k]
+        return future.result()
+
+
+_direct_fetches: Optional[SingleFlight] = None
+_direct_fetches_lock = threading.Lock()
+
+
+def _get_direct_fetches() -> SingleFlight:
+    global _direct_fetches
+    with _direct_fetches_lock:
+        if _direct_fetches is None:
+            # Import here to avoid circular dependency
+            from .config import get_config
+            _direct_fetches = SingleFlight(fresh_seconds=get_config().direct_fetch_fresh_seconds)
+        return _direct_fetches
+
+
 def _get_pools_from_chain(chain_id: str) -> List[LiquidityPool]:
     """Get pools directly from chain without using cache or filtering.
 
+    Concurrent calls for the same chain share one fetch.
+
     Raises:
         Exception: propagates any chain/network error so callers can report the real cause.
     """
-    with get_chain(chain_id) as chain:
-        result = chain.get_pools()
-        if not isinstance(result, list):
-            raise TypeError(f"chain.get_pools() returned {type(result)} instead of list")
-        return result
+    def fetch() -> List[LiquidityPool]:
+        with get_chain(chain_id) as chain:
+            result = chain.get_pools()
+            if not isinstance(result, list):
+                raise TypeError(f"chain.get_pools() returned {type(result)} instead of list")
+            return result
+
+    return _get_direct_fetches().do(("pools", chain_id), fetch)
 
 
 def _get_pool_from_chain(chain_id: str, address: str) -> Optional[LiquidityPool]:
     """Get a specific pool directly from chain without using cache.
 
+    Concurrent calls for the same pool share one fetch.
+
     Raises:
         Exception: propagates any chain/network error so callers can report the real cause.
     """
-    with get_chain(chain_id) as chain:
-        return chain.get_pool_by_address(address)
+    def fetch() -> Optional[LiquidityPool]:
+        with get_chain(chain_id) as chain:
+            return chain.get_pool_by_address(address)
+
+    return _get_direct_fetches().do(("pool", chain_id, address.lower()), fetch)
+
+
+def _new_refresher() -> CacheRefresher:
+    config = _refresher_config or CacheConfig()
+    return CacheRefresher(_cache, max_workers=config.refresh_workers, shutdown_grace_seconds=config.shutdown_grace_seconds)
 
 
 def start_background_updates():
-    """Start the background update thread."""
-    _cache.start_background_updates()
+    """Start background refreshes on a dedicated event loop thread.
+
+    For callers without an event loop of their own; the server runs the refresher on its
+    loop with start_refresher() instead.
+    """
+    global _refresher
+    if _refresher is not None and _refresher.running:
+        return
+    _refresher = _new_refresher()
+    _refresher.start_in_thread()
+    print("🔄 Background cache refresher started", file=sys.stderr)
+
+
+async def start_refresher() -> Optional[CacheRefresher]:
+    """Start background refreshes on the running event loop.
+
+    Returns:
+        Optional[CacheRefresher]: The refresher, or None if the cache system is not running
+            (SKIP_CACHE_INIT) or runs without background refreshes (stdio mode)
+    """
+    global _refresher
+    if _refresher_config is None:
+        return None
+    if _refresher is None or not _refresher.running:
+        _refresher = _new_refresher()
+        await _refresher.start()
+        print("🔄 Background cache refresher started", file=sys.stderr)
+    return _refresher
+
+
+async def stop_refresher() -> None:
+    """Stop the refresher started by start_refresher(), letting in-flight refreshes publish first."""
+    global _refresher
+    if _refresher is not None and _refresher.thread is None:
+        await _refresher.stop()
+        _refresher = None
+
+
+async def refresh_now(chain_id: str) -> bool:
+    """Refresh a cached chain immediately, or wait for its in-flight refresh.
+
+    Returns:
+        bool: Whether a refresh ran and was not cancelled
+    """
+    _ensure_cache_initialized()
+    refresher = _refresher
+    if refresher is None:
+        return await asyncio.to_thread(_cache.refresh_chain, chain_id)
+    if refresher.thread_loop is not None:
+        # The refresher runs on its own loop thread
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(refresher.refresh_now(chain_id), refresher.thread_loop))
+    return await refresher.refresh_now(chain_id)
 
 
 def set_enabled_chains(chain_ids: Optional[List[str]]):
@@ -434,13 +1064,38 @@ def configure_cache(config: CacheConfig):
     _cache.configure_cache(config)
 
 def stop_background_updates():
-    """Stop the background update thread."""
-    _cache.stop_background_updates()
+    """Stop background refreshes started by start_background_updates()."""
+    global _refresher
+    if _refresher is not None and _refresher.thread is not None:
+        _refresher.stop_in_thread()
+        _refresher = None
+
 
+def start_lazy_cache_system(cache_config: CacheConfig):
+    """Configure the cache without pre-populating it or refreshing in the background.
 
-def start_cache_system(cache_config: CacheConfig):
-    """Configure and start the cache system with the given configuration."""
+    Used in stdio mode, where each client launches its own short-lived server process: chains
+    are fetched on first use and refreshed on the request path once they expire.
+    """
     global _cache_initialized
+
+    with _cache_init_lock:
+        if _cache_initialized:
+            return
+        configure_cache(cache_config)
+        print(f"🔧 Lazy in-process cache configured: {cache_config.duration_minutes}min duration, chains: {cache_config.enabled_chain_ids}", file=sys.stderr)
+        _cache_initialized = True
+
+
+def start_cache_system(cache_config: CacheConfig, start_updates: bool = True):
+    """Configure and start the cache system with the given configuration.
+
+    Args:
+        cache_config (CacheConfig): The cache configuration
+        start_updates (bool): Start background refreshes on their own thread. Pass False when
+            the caller runs them on its event loop with start_refresher()
+    """
+    global _cache_initialized, _refresher_config
     
     with _cache_init_lock:
         if _cache_initialized:
@@ -448,29 +1103,30 @@ def start_cache_system(cache_config: CacheConfig):
         
         # Apply configuration and show summary
         configure_cache(cache_config)
-        print(f"🔧 Cache configured: {cache_config.duration_minutes}min duration, chains: {cache_config.enabled_chain_ids}, filtering: {'enabled' if cache_config.filter_invalid_pools else 'disabled'}")
+        print(f"🔧 Cache configured: {cache_config.duration_minutes}min duration, chains: {cache_config.enabled_chain_ids}, filtering: {'enabled' if cache_config.filter_invalid_pools else 'disabled'}, refresh: {cache_config.refresh_mode}/{cache_config.refresh_strategy}", file=sys.stderr)
 
-        # Start background cache updates
-        start_background_updates()
+        _refresher_config = cache_config
+        if start_updates:
+            start_background_updates()
 
         # Pre-populate cache for enabled chains
-        print("📦 Initializing cache...")
+        print("📦 Initializing cache...", file=sys.stderr)
         enabled_chains = cache_config.enabled_chain_ids or []
         for chain_id in enabled_chains:
             try:
                 pools = _cache.get_pools(chain_id)  # Use _cache directly to avoid recursion
                 if pools and len(pools) > 0:
-                    print(f"✅ Cached {len(pools)} pools for chain {chain_id}")
+                    print(f"✅ Cached {len(pools)} pools for chain {chain_id}", file=sys.stderr)
                 else:
-                    print(f"⚠️  No pools found for chain {chain_id}")
+                    print(f"⚠️  No pools found for chain {chain_id}", file=sys.stderr)
             except Exception as e:
-                print(f"❌ Failed to cache chain {chain_id}: {type(e).__name__}: {str(e)}")
+                print(f"❌ Failed to cache chain {chain_id}: {type(e).__name__}: {str(e)}", file=sys.stderr)
 
-        print("🚀 Server ready!")
+        print("🚀 Server ready!", file=sys.stderr)
         _cache_initialized = True
 
 
-def _ensure_cache_initialized():
+def _ensure_cache_initialized(start_updates: bool = True):
     """Ensure cache system is initialized if needed (lazy initialization)."""
     global _cache_initialized
     if _cache_initialized:
@@ -480,32 +1136,45 @@ def _ensure_cache_initialized():
     try:
         from .config import SugarConfig, is_stdio_mode
 
-        # Check if in stdio mode (cache disabled)
-        _is_stdio = is_stdio_mode()
-        if _is_stdio:
-            _cache_initialized = True
-            return
-
         # Auto-initialize cache using SugarConfig
         sugar_config = SugarConfig()
 
+        if is_stdio_mode():
+            if sugar_config.stdio_cache_enabled:
+                start_lazy_cache_system(sugar_config.get_cache_config())
+            else:
+                _cache_initialized = True
+            return
+
         # Check if cache should be skipped
         if sugar_config.skip_cache_init:
-            print("⚠️  Skipping cache initialization (SKIP_CACHE_INIT=true)")
+            print("⚠️  Skipping cache initialization (SKIP_CACHE_INIT=true)", file=sys.stderr)
             _cache_initialized = True
             return
 
         cache_config = sugar_config.get_cache_config()
-        start_cache_system(cache_config)
+        start_cache_system(cache_config, start_updates)
     except Exception as e:
-        print(f"⚠️  Failed to auto-initialize cache: {type(e).__name__}: {str(e)}")
+        print(f"⚠️  Failed to auto-initialize cache: {type(e).__name__}: {str(e)}", file=sys.stderr)
         # Mark as initialized anyway to avoid repeated attempts
         _cache_initialized = True
 
 
-def ensure_cache_system_started():
+def get_cache_stats() -> Dict[str, Any]:
+    """Public helper reporting pools cache memory estimates, access scores and evictions per chain,
+    and the memory held by retained pagination cursors."""
+    # Import here to avoid circular dependency
+    from .cursors import get_cursor_store
+
+    stats = _cache.get_cache_stats()
+    stats["cursors"] = get_cursor_store().stats()
+    return stats
+
+
+def ensure_cache_system_started(start_updates: bool = True):
     """Public helper to ensure the cache system is initialized.
 
-    This can be called at server startup to eagerly initialize the Sugar cache.
+    This can be called at server startup to eagerly initialize the Sugar cache. The server passes
+    start_updates=False and runs the refresher on its own event loop with start_refresher().
     """
-    _ensure_cache_initialized()
+    _ensure_cache_initialized(start_updates)
@@ -22,8 +22,8 @@ class SugarConfig:
             print("Error: SUGAR_PK environment variable is not set", file=sys.stderr)
             sys.exit(1)
         
-        if not os.environ.get("SUGAR_RPC_URI_8453"):
-            print("Error: SUGAR_RPC_URI_8453 environment variable is not set", file=sys.stderr)
+        if not os.environ.get("SUGAR_RPC_URI_8453") and not os.environ.get("SUGAR_RPC_URIS_8453"):
+            print("Error: SUGAR_RPC_URI_8453 (or SUGAR_RPC_URIS_8453) environment variable is not set", file=sys.stderr)
             sys.exit(1)
     
     def __init__(self):
@@ -33,6 +33,8 @@ class SugarConfig:
         
         # Cache configuration
         self.skip_cache_init: bool = os.environ.get("SKIP_CACHE_INIT", "false").lower() == "true"
+        # stdio mode: lazily filled in-process cache without background refresh
+        self.stdio_cache_enabled: bool = os.environ.get("SUGAR_STDIO_CACHE_ENABLED", "true").lower() == "true"
         self.cache_duration_minutes: int = int(os.environ.get("SUGAR_CACHE_DURATION_MINUTES", "30"))
         
         cache_chains_str = os.environ.get("SUGAR_CACHE_ENABLED_CHAINS")
@@ -43,16 +45,91 @@ class SugarConfig:
             self.cache_enabled_chains: Optional[List[str]] = ["8453"]
         
         self.cache_filter_invalid_pools: bool = os.environ.get("SUGAR_CACHE_FILTER_INVALID_POOLS", "true").lower() == "true"
+        self.cache_refresh_mode: str = os.environ.get("SUGAR_CACHE_REFRESH_MODE", "ttl").lower()
+        self.cache_block_poll_seconds: int = int(os.environ.get("SUGAR_CACHE_BLOCK_POLL_SECONDS", "15"))
+        self.cache_block_lag_threshold: int = int(os.environ.get("SUGAR_CACHE_BLOCK_LAG_THRESHOLD", "150"))
+        self.cache_adaptive_min_minutes: float = float(os.environ.get("SUGAR_CACHE_ADAPTIVE_MIN_MINUTES", "5"))
+        self.cache_adaptive_max_minutes: float = float(os.environ.get("SUGAR_CACHE_ADAPTIVE_MAX_MINUTES", "120"))
+        self.cache_refresh_strategy: str = os.environ.get("SUGAR_CACHE_REFRESH_STRATEGY", "full").lower()
+        self.cache_delta_max_blocks: int = int(os.environ.get("SUGAR_CACHE_DELTA_MAX_BLOCKS", "2000"))
+        self.cache_delta_full_refresh_minutes: float = float(os.environ.get("SUGAR_CACHE_DELTA_FULL_REFRESH_MINUTES", "240"))
+        self.cache_history_depth: int = int(os.environ.get("SUGAR_CACHE_HISTORY_DEPTH", "48"))
+        self.cache_diff_top_n: int = int(os.environ.get("SUGAR_CACHE_DIFF_TOP_N", "20"))
+        # 0 means no memory budget
+        budget_mb = float(os.environ.get("SUGAR_CACHE_MEMORY_BUDGET_MB", "0"))
+        self.cache_memory_budget_mb: Optional[float] = budget_mb if budget_mb > 0 else None
+        pinned_chains_str = os.environ.get("SUGAR_CACHE_PINNED_CHAINS", "")
+        self.cache_pinned_chains: List[str] = [chain.strip() for chain in pinned_chains_str.split(",") if chain.strip()]
+        self.cache_refresh_workers: int = int(os.environ.get("SUGAR_CACHE_REFRESH_WORKERS", "4"))
+        self.cache_shutdown_grace_seconds: float = float(os.environ.get("SUGAR_CACHE_SHUTDOWN_GRACE_SECONDS", "10"))
+
+        # Uncached (use_cache=False) fetches: identical concurrent fetches always share one result;
+        # a completed result is reused for this many seconds (0 disables reuse)
+        self.direct_fetch_fresh_seconds: float = float(os.environ.get("SUGAR_DIRECT_FETCH_FRESH_SECONDS", "0"))
+
+        # Read-ahead configuration for paginated tools
+        self.prefetch_enabled: bool = os.environ.get("SUGAR_PREFETCH_ENABLED", "true").lower() == "true"
+        self.prefetch_ttl_seconds: float = float(os.environ.get("SUGAR_PREFETCH_TTL_SECONDS", "30"))
+        self.prefetch_max_workers: int = int(os.environ.get("SUGAR_PREFETCH_MAX_WORKERS", "2"))
+
+        # Pagination cursor configuration
+        self.cursor_ttl_seconds: float = float(os.environ.get("SUGAR_CURSOR_TTL_SECONDS", "300"))
+        self.cursor_max_entries: int = int(os.environ.get("SUGAR_CURSOR_MAX_ENTRIES", "256"))
+        self.cursor_max_mb: float = float(os.environ.get("SUGAR_CURSOR_MAX_MB", "64"))
+
+        # Chunked price fetch configuration
+        self.price_chunk_size: int = int(os.environ.get("SUGAR_PRICE_CHUNK_SIZE", "100"))
+        self.price_max_workers: int = int(os.environ.get("SUGAR_PRICE_MAX_WORKERS", "4"))
+
+        # RPC transport configuration
+        self.rpc_timeout: float = float(os.environ.get("SUGAR_RPC_TIMEOUT", "30.0"))
+        self.rpc_batch_enabled: bool = os.environ.get("SUGAR_RPC_BATCH_ENABLED", "true").lower() == "true"
+        self.rpc_batch_window_ms: float = float(os.environ.get("SUGAR_RPC_BATCH_WINDOW_MS", "5"))
+        self.rpc_batch_max_size: int = int(os.environ.get("SUGAR_RPC_BATCH_MAX_SIZE", "50"))
+        self.rpc_hedge_enabled: bool = os.environ.get("SUGAR_RPC_HEDGE_ENABLED", "false").lower() == "true"
+        self.rpc_hedge_min_delay_ms: float = float(os.environ.get("SUGAR_RPC_HEDGE_MIN_DELAY_MS", "100"))
+        self.rpc_hedge_max_workers: int = int(os.environ.get("SUGAR_RPC_HEDGE_MAX_WORKERS", "8"))
     
+    def get_rpc_endpoints(self, chain_id: str) -> List[str]:
+        """Get the RPC endpoints configured for a chain.
+
+        Reads the comma-separated SUGAR_RPC_URIS_<chain_id>, falling back to SUGAR_RPC_URI_<chain_id>.
+        Returns an empty list when neither is set.
+        """
+        uris_str = os.environ.get(f"SUGAR_RPC_URIS_{chain_id}")
+        if uris_str:
+            return [uri.strip() for uri in uris_str.split(",") if uri.strip()]
+        uri = os.environ.get(f"SUGAR_RPC_URI_{chain_id}")
+        return [uri] if uri else []
+
     def get_cache_config(self) -> CacheConfig:
         """Get cache configuration."""
         return CacheConfig(
             duration_minutes=self.cache_duration_minutes,
             enabled_chain_ids=self.cache_enabled_chains,
-            filter_invalid_pools=self.cache_filter_invalid_pools
+            filter_invalid_pools=self.cache_filter_invalid_pools,
+            refresh_mode=self.cache_refresh_mode,
+            block_poll_seconds=self.cache_block_poll_seconds,
+            block_lag_threshold=self.cache_block_lag_threshold,
+            adaptive_min_minutes=self.cache_adaptive_min_minutes,
+            adaptive_max_minutes=self.cache_adaptive_max_minutes,
+            refresh_strategy=self.cache_refresh_strategy,
+            delta_max_blocks=self.cache_delta_max_blocks,
+            delta_full_refresh_minutes=self.cache_delta_full_refresh_minutes,
+            history_depth=self.cache_history_depth,
+            diff_top_n=self.cache_diff_top_n,
+            memory_budget_mb=self.cache_memory_budget_mb,
+            pinned_chain_ids=self.cache_pinned_chains,
+            refresh_workers=self.cache_refresh_workers,
+            shutdown_grace_seconds=self.cache_shutdown_grace_seconds
         )
 
 
+def is_cache_available() -> bool:
+    """Check if the pool cache can be used: always in SSE mode, in stdio mode unless SUGAR_STDIO_CACHE_ENABLED=false."""
+    return not is_stdio_mode() or get_config().stdio_cache_enabled
+
+
 def validate_cache_parameter(use_cache: bool, tool_name: str) -> None:
     """Validate that cache parameter is compatible with current transport mode.
     
@@ -61,12 +138,12 @@ def validate_cache_parameter(use_cache: bool, tool_name: str) -> None:
         tool_name: Name of the tool for error message
     
     Raises:
-        ValueError: If use_cache=True but cache is not available (e.g., in stdio mode)
+        ValueError: If use_cache=True but cache is not available (stdio mode with SUGAR_STDIO_CACHE_ENABLED=false)
     """
-    if use_cache and is_stdio_mode():
+    if use_cache and not is_cache_available():
         raise ValueError(
-            f"Cache is not available in stdio transport mode. "
-            f"Please set use_cache=False for {tool_name}, or use SSE transport mode to enable cache."
+            f"Cache is disabled in stdio transport mode (SUGAR_STDIO_CACHE_ENABLED=false). "
+            f"Please set use_cache=False for {tool_name}, or enable the stdio cache."
         )
 
 
@@ -0,0 +1,165 @@
+"""Opaque pagination cursors over retained, already-ordered tool results."""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import get_config
+from .memory import estimate_items_bytes
+
+
+@dataclass(frozen=True)
+class RetainedScan:
+    """An ordered result kept for paging, pinned to the snapshot it was computed from."""
+    tool: str
+    items: List[Any]
+    block_number: Optional[int]
+    created_at: float
+    size_bytes: int
+    # Chain and PoolsSnapshot.version the result was computed from; None when read directly from chain
+    chain_id: Optional[str] = None
+    snapshot_version: Optional[int] = None
+
+
+class CursorStore:
+    """Thread-safe store of ordered results addressed by opaque cursors.
+
+    The first page of a scan computes the full ordering once and retains it; later pages are
+    slices of the retained result, so they are cheap and unaffected by cache refreshes. Scans
+    record the snapshot version they were computed from, so callers can tell a resumed scan
+    whose snapshot has since been replaced.
+    Scans expire ttl_seconds after they were created; the least recently used are evicted
+    beyond max_entries or once their estimated total size exceeds max_bytes.
+    """
+
+    def __init__(self, ttl_seconds: float = 300, max_entries: int = 256, max_bytes: int = 64 * 2**20):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.scans: "OrderedDict[str, RetainedScan]" = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def retain(
+        self,
+        tool: str,
+        items: List[Any],
+        block_number: Optional[int] = None,
+        chain_id: Optional[str] = None,
+        snapshot_version: Optional[int] = None,
+    ) -> Optional[str]:
+        """Retain an ordered result and return its scan ID, or None if it alone exceeds max_bytes."""
+        # Items may be shared with a cache snapshot, so this is an upper bound of what retaining adds
+        size_bytes = estimate_items_bytes(items)
+        if size_bytes > self.max_bytes:
+            return None
+        scan_id = secrets.token_urlsafe(12)
+        scan = RetainedScan(
+            tool=tool,
+            items=items,
+            block_number=block_number,
+            created_at=time.monotonic(),
+            size_bytes=size_bytes,
+            chain_id=chain_id,
+            snapshot_version=snapshot_version,
+        )
+        with self.lock:
+            self._expire()
+            self.scans[scan_id] = scan
+            self.total_bytes += size_bytes
+            while len(self.scans) > self.max_entries or self.total_bytes > self.max_bytes:
+                self._remove(next(iter(self.scans)))
+        return scan_id
+
+    def resolve(self, tool: str, cursor: str) -> Optional[Tuple[RetainedScan, int]]:
+        """Resolve a cursor to its retained scan and offset, or None if it is unknown, expired or for another tool."""
+        scan_id, _, offset = cursor.rpartition(":")
+        if not scan_id or not offset.isdigit():
+            return None
+        with self.lock:
+            self._expire()
+            scan = self.scans.get(scan_id)
+            if scan is None or scan.tool != tool:
+                return None
+            self.scans.move_to_end(scan_id)
+        return scan, int(offset)
+
+    def _expire(self) -> None:
+        """Drop expired scans. Caller must hold self.lock."""
+        now = time.monotonic()
+        expired = [scan_id for scan_id, scan in self.scans.items() if now - scan.created_at >= self.ttl_seconds]
+        for scan_id in expired:
+            self._remove(scan_id)
+
+    def _remove(self, scan_id: str) -> None:
+        """Drop a scan. Caller must hold self.lock."""
+        self.total_bytes -= self.scans.pop(scan_id).size_bytes
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {"scans": len(self.scans), "estimated_bytes": self.total_bytes, "max_bytes": self.max_bytes}
+
+
+def make_cursor(scan_id: str, offset: int) -> str:
+    return f"{scan_id}:{offset}"
+
+
+def paginate(
+    tool: str,
+    items: List[Any],
+    offset: int,
+    limit: int,
+    block_number: Optional[int] = None,
+    chain_id: Optional[str] = None,
+    snapshot_version: Optional[int] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """Slice the first page of an ordered result, retaining the result if more pages follow.
+
+    chain_id and snapshot_version identify the cache snapshot the result was computed from.
+
+    Returns:
+        Tuple of the page and the cursor for the next page (None on the last page, or when the
+        result is too large to retain and later pages are only reachable by offset)
+    """
+    page = items[offset:offset + limit]
+    if offset + limit >= len(items) or not page:
+        return page, None
+    scan_id = get_cursor_store().retain(tool, items, block_number, chain_id, snapshot_version)
+    return page, make_cursor(scan_id, offset + limit) if scan_id is not None else None
+
+
+def page_from_cursor(tool: str, cursor: str, limit: int) -> Optional[Tuple[List[Any], Optional[str], RetainedScan]]:
+    """Slice the page a cursor points at.
+
+    Returns:
+        Tuple of the page, the cursor for the next page (None on the last page) and the retained
+        scan, or None if the cursor is unknown or expired
+    """
+    resolved = get_cursor_store().resolve(tool, cursor)
+    if resolved is None:
+        return None
+    scan, offset = resolved
+    page = scan.items[offset:offset + limit]
+    scan_id = cursor.rpartition(":")[0]
+    next_cursor = make_cursor(scan_id, offset + limit) if offset + limit < len(scan.items) else None
+    return page, next_cursor, scan
+
+
+_cursor_store: Optional[CursorStore] = None
+_cursor_store_lock = threading.Lock()
+
+
+def get_cursor_store() -> CursorStore:
+    global _cursor_store
+    with _cursor_store_lock:
+        if _cursor_store is None:
+            config = get_config()
+            _cursor_store = CursorStore(
+                ttl_seconds=config.cursor_ttl_seconds,
+                max_entries=config.cursor_max_entries,
+                max_bytes=int(config.cursor_max_mb * 2**20),
+            )
+        return _cursor_store
@@ -0,0 +1,123 @@
+"""Incremental (delta) refresh of pool snapshots from on-chain logs."""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Set, Tuple
+
+from netmind_sugar.chains import LiquidityPool, Token
+from netmind_sugar.helpers import ADDRESS_ZERO, normalize_address
+from web3 import Web3
+
+
+def _topic(signature: str) -> str:
+    return Web3.to_hex(Web3.keccak(text=signature))
+
+
+# Events that change the reserves or fees of v2 (basic) and CL (slipstream) pools
+POOL_CHANGE_TOPICS = [_topic(sig) for sig in (
+    "Swap(address,address,uint256,uint256,uint256,uint256)",
+    "Sync(uint256,uint256)",
+    "Mint(address,uint256,uint256)",
+    "Burn(address,address,uint256,uint256)",
+    "Swap(address,address,int256,int256,uint160,uint128,int24)",
+    "Mint(address,address,int24,int24,uint128,uint256,uint256)",
+    "Burn(address,int24,int24,uint128,uint256,uint256)",
+)]
+
+# Factory events for new v2 and CL pools; the pool address is the first word of the log data
+POOL_CREATED_TOPICS = [_topic(sig) for sig in (
+    "PoolCreated(address,address,bool,address,uint256)",
+    "PoolCreated(address,address,int24,address)",
+)]
+
+# Addresses per eth_getLogs filter, kept under common provider limits
+LOG_ADDRESS_CHUNK_SIZE = 500
+# Concurrent byAddress reads; the RPC transport coalesces them into batch requests
+READ_MAX_WORKERS = 8
+# Token addresses per Sugar tokens() call
+TOKEN_CHUNK_SIZE = 100
+
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _get_logs(chain, addresses: List[str], topics: List[str], from_block: int, to_block: int) -> List:
+    logs = []
+    for chunk in _chunks(addresses, LOG_ADDRESS_CHUNK_SIZE):
+        logs.extend(chain.web3.eth.get_logs({
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "address": chunk,
+            "topics": [topics],
+        }))
+    return logs
+
+
+def get_changed_pool_addresses(chain, pools: List[LiquidityPool], from_block: int, to_block: int) -> Set[str]:
+    """Get the lowercased addresses of pools that emitted Swap/Sync/Mint/Burn logs in a block range (inclusive)."""
+    addresses = [pool.lp for pool in pools]
+    return {log["address"].lower() for log in _get_logs(chain, addresses, POOL_CHANGE_TOPICS, from_block, to_block)}
+
+
+def get_created_pool_addresses(chain, pools: List[LiquidityPool], from_block: int, to_block: int) -> Set[str]:
+    """Get the lowercased addresses of pools created by the snapshot's factories in a block range (inclusive)."""
+    factories = sorted({pool.factory for pool in pools})
+    created = set()
+    for log in _get_logs(chain, factories, POOL_CREATED_TOPICS, from_block, to_block):
+        data = bytes(log["data"])
+        if len(data) >= 32:
+            created.add(Web3.to_checksum_address(data[12:32]).lower())
+    return created
+
+
+def read_pools(chain, addresses: List[str], pools: List[LiquidityPool]) -> Tuple[List[LiquidityPool], Set[str]]:
+    """Re-read pools by address and price them.
+
+    Tokens already present in the snapshot are reused, only unknown tokens are read from Sugar.
+    Prices are read for the tokens of the re-read pools only.
+
+    Args:
+        chain: An open chain context
+        addresses: Pool addresses to read
+        pools: The current snapshot, used to resolve known tokens
+
+    Returns:
+        Tuple of the re-read pools and the lowercased addresses that could not be read
+    """
+    def read(address: str):
+        return chain.sugar.functions.byAddress(Web3.to_checksum_address(address)).call()
+
+    raw_pools, failed = [], set()
+    with ThreadPoolExecutor(max_workers=min(READ_MAX_WORKERS, max(len(addresses), 1))) as executor:
+        for address, future in zip(addresses, [executor.submit(read, address) for address in addresses]):
+            try:
+                raw_pools.append(future.result())
+            except Exception as e:
+                print(f"Failed to re-read pool {address} on chain {chain.chain_id}: {type(e).__name__}: {str(e)}", file=sys.stderr)
+                failed.add(address.lower())
+    if not raw_pools:
+        return [], failed
+
+    known_tokens: Dict[str, Token] = {}
+    for pool in pools:
+        for token in (pool.token0, pool.token1, pool.emissions_token):
+            if token is not None:
+                known_tokens[token.token_address] = token
+
+    stable_addr = normalize_address(chain.settings.stable_token_addr)
+    needed = {stable_addr}
+    for t in raw_pools:
+        needed.update(normalize_address(t[i]) for i in (7, 10, 20) if t[i] != ADDRESS_ZERO)
+
+    unknown = [address for address in needed if address not in known_tokens]
+    # prepare_tokens always prepends the native token, which pricing needs
+    tokens = chain.prepare_tokens([], listed_only=False)
+    for chunk in _chunks(unknown, TOKEN_CHUNK_SIZE):
+        tokens.extend(chain.prepare_tokens(chain.sugar.functions.tokens(len(chunk), 0, ADDRESS_ZERO, chunk).call(), listed_only=False)[1:])
+    tokens.extend(known_tokens[address] for address in needed if address in known_tokens)
+    if stable_addr not in {t.token_address for t in tokens}:
+        tokens.append(chain.get_token(stable_addr))
+
+    return chain.prepare_pools(raw_pools, tokens, chain.get_prices(tokens)), failed
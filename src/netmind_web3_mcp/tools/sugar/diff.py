@@ -0,0 +1,91 @@
+"""Changes between consecutive pools snapshots, computed when a snapshot is published."""
+
+import heapq
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from netmind_sugar.chains import LiquidityPool
+
+from .metrics import PoolMetrics
+
+DIFF_METRICS = ("tvl", "apr", "volume")
+
+# Relative change of any metric above which a pool counts as significantly changed
+SIGNIFICANT_CHANGE = 0.01
+
+
+class PoolChange(NamedTuple):
+    lp: str
+    symbol: str
+    before: float
+    after: float
+
+    @property
+    def change(self) -> float:
+        return self.after - self.before
+
+
+class SnapshotDiff(NamedTuple):
+    """What changed from one snapshot of a chain to the next."""
+    from_block: Optional[int]
+    to_block: Optional[int]
+    from_time: datetime
+    to_time: datetime
+    new_pools: List[str]
+    removed_pools: List[str]
+    # Largest absolute changes per metric name, biggest first
+    movers: Dict[str, List[PoolChange]]
+    changed_count: int
+    # Pools with a metric that moved by more than SIGNIFICANT_CHANGE
+    significant_count: int = 0
+
+
+def compute_snapshot_diff(
+    previous_index: Dict[str, LiquidityPool],
+    previous_metrics: Dict[str, PoolMetrics],
+    current_index: Dict[str, LiquidityPool],
+    current_metrics: Dict[str, PoolMetrics],
+    from_block: Optional[int],
+    to_block: Optional[int],
+    from_time: datetime,
+    to_time: datetime,
+    top_n: int = 20,
+) -> SnapshotDiff:
+    """Diff two snapshots keyed by lowercase pool address.
+
+    Pools whose metrics object was carried over unchanged (delta refreshes reuse them) are
+    skipped without comparing values.
+    """
+    new_pools = [pool.lp for key, pool in current_index.items() if key not in previous_index]
+    removed_pools = [pool.lp for key, pool in previous_index.items() if key not in current_index]
+
+    changes: Dict[str, List[PoolChange]] = {name: [] for name in DIFF_METRICS}
+    changed_count = 0
+    significant_count = 0
+    for key, after in current_metrics.items():
+        before = previous_metrics.get(key)
+        if before is None or before is after:
+            continue
+        pool = current_index[key]
+        changed = significant = False
+        for name in DIFF_METRICS:
+            old, new = getattr(before, name), getattr(after, name)
+            if old != new:
+                changes[name].append(PoolChange(pool.lp, pool.symbol, old, new))
+                changed = True
+                significant = significant or abs(new - old) > SIGNIFICANT_CHANGE * abs(old)
+        changed_count += changed
+        significant_count += significant
+
+    movers = {name: heapq.nlargest(top_n, items, key=lambda c: abs(c.change)) for name, items in changes.items()}
+    return SnapshotDiff(
+        from_block=from_block,
+        to_block=to_block,
+        from_time=from_time,
+        to_time=to_time,
+        new_pools=new_pools,
+        removed_pools=removed_pools,
+        movers=movers,
+        changed_count=changed_count,
+        significant_count=significant_count,
+    )
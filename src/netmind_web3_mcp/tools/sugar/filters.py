@@ -0,0 +1,64 @@
+"""Server-side pool filters over precomputed pool metrics."""
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from .metrics import PoolMetrics
+
+
+@dataclass(frozen=True)
+class PoolFilter:
+    """Structured pool filter. Unset (None) conditions are ignored; bounds are inclusive."""
+    min_tvl: Optional[float] = None
+    max_tvl: Optional[float] = None
+    min_apr: Optional[float] = None
+    max_apr: Optional[float] = None
+    min_volume: Optional[float] = None
+    min_gauge_staked_pct: Optional[float] = None
+    max_gauge_staked_pct: Optional[float] = None
+    has_emissions: Optional[bool] = None
+    is_stable: Optional[bool] = None
+
+    def __post_init__(self):
+        """Validate ranges after initialization."""
+        for low, high in (("min_tvl", "max_tvl"), ("min_apr", "max_apr"), ("min_gauge_staked_pct", "max_gauge_staked_pct")):
+            low_value, high_value = getattr(self, low), getattr(self, high)
+            if low_value is not None and high_value is not None and low_value > high_value:
+                raise ValueError(f"{low} must not be greater than {high}")
+
+    def compile(self) -> Callable[[PoolMetrics], bool]:
+        """Build a single predicate that evaluates only the conditions that are set."""
+        checks: List[Callable[[PoolMetrics], bool]] = []
+        if self.min_tvl is not None:
+            min_tvl = self.min_tvl
+            checks.append(lambda m: m.tvl >= min_tvl)
+        if self.max_tvl is not None:
+            max_tvl = self.max_tvl
+            checks.append(lambda m: m.tvl <= max_tvl)
+        if self.min_apr is not None:
+            min_apr = self.min_apr
+            checks.append(lambda m: m.apr >= min_apr)
+        if self.max_apr is not None:
+            max_apr = self.max_apr
+            checks.append(lambda m: m.apr <= max_apr)
+        if self.min_volume is not None:
+            min_volume = self.min_volume
+            checks.append(lambda m: m.volume >= min_volume)
+        if self.min_gauge_staked_pct is not None:
+            min_staked = self.min_gauge_staked_pct
+            checks.append(lambda m: m.gauge_staked_pct >= min_staked)
+        if self.max_gauge_staked_pct is not None:
+            max_staked = self.max_gauge_staked_pct
+            checks.append(lambda m: m.gauge_staked_pct <= max_staked)
+        if self.has_emissions is not None:
+            has_emissions = self.has_emissions
+            checks.append(lambda m: m.has_emissions == has_emissions)
+        if self.is_stable is not None:
+            is_stable = self.is_stable
+            checks.append(lambda m: m.is_stable == is_stable)
+
+        if not checks:
+            return lambda m: True
+        if len(checks) == 1:
+            return checks[0]
+        return lambda m: all(check(m) for check in checks)
@@ -0,0 +1,101 @@
+"""Bounded in-memory history of pool metrics across cache refreshes."""
+
+import threading
+from array import array
+from typing import Dict, List, NamedTuple, Optional
+
+from .metrics import PoolMetrics
+
+
+class HistoryPoint(NamedTuple):
+    timestamp: float
+    block_number: Optional[int]
+    tvl: float
+    apr: float
+    volume: float
+
+
+class PoolHistory:
+    """Fixed-size ring buffer of one pool's metrics, backed by preallocated arrays."""
+
+    __slots__ = ("depth", "head", "count", "timestamps", "blocks", "tvl", "apr", "volume")
+
+    def __init__(self, depth: int):
+        self.depth = depth
+        # Index of the next slot to write
+        self.head = 0
+        self.count = 0
+        self.timestamps = array("d", bytes(8 * depth))
+        # -1 marks an unknown block number
+        self.blocks = array("q", bytes(8 * depth))
+        self.tvl = array("d", bytes(8 * depth))
+        self.apr = array("d", bytes(8 * depth))
+        self.volume = array("d", bytes(8 * depth))
+
+    def append(self, timestamp: float, block_number: Optional[int], metrics: PoolMetrics) -> None:
+        i = self.head
+        self.timestamps[i] = timestamp
+        self.blocks[i] = block_number if block_number is not None else -1
+        self.tvl[i] = metrics.tvl
+        self.apr[i] = metrics.apr
+        self.volume[i] = metrics.volume
+        self.head = (i + 1) % self.depth
+        self.count = min(self.count + 1, self.depth)
+
+    def points(self, limit: Optional[int] = None) -> List[HistoryPoint]:
+        """Get the most recent points, oldest first."""
+        n = self.count if limit is None else min(limit, self.count)
+        result = []
+        for k in range(n, 0, -1):
+            i = (self.head - k) % self.depth
+            block = self.blocks[i]
+            result.append(HistoryPoint(self.timestamps[i], block if block >= 0 else None, self.tvl[i], self.apr[i], self.volume[i]))
+        return result
+
+
+class HistoryStore:
+    """Per-chain, per-pool metric history. Memory is bounded by depth times the number of live pools.
+
+    Recording is done by the cache writer for each published snapshot; pools that drop out of
+    the snapshot lose their history.
+    """
+
+    def __init__(self, depth: int = 48):
+        self.depth = depth
+        self.histories: Dict[str, Dict[str, PoolHistory]] = {}
+        self.lock = threading.Lock()
+
+    def record(self, chain_id: str, timestamp: float, block_number: Optional[int], pool_metrics: Dict[str, PoolMetrics]) -> None:
+        """Append one point per pool from a snapshot's metrics (keyed by lowercase pool address)."""
+        if self.depth <= 0:
+            return
+        with self.lock:
+            previous = self.histories.get(chain_id, {})
+            current: Dict[str, PoolHistory] = {}
+            for key, metrics in pool_metrics.items():
+                history = previous.get(key)
+                if history is None:
+                    history = PoolHistory(self.depth)
+                history.append(timestamp, block_number, metrics)
+                current[key] = history
+            self.histories[chain_id] = current
+
+    def get(self, chain_id: str, lp: str, limit: Optional[int] = None) -> List[HistoryPoint]:
+        """Get a pool's recent points, oldest first. Empty if the pool has no history."""
+        with self.lock:
+            history = self.histories.get(chain_id, {}).get(lp.lower())
+            return history.points(limit) if history is not None else []
+
+    def size_bytes(self, chain_id: str) -> int:
+        """Approximate memory held by a chain's history."""
+        with self.lock:
+            histories = self.histories.get(chain_id, {})
+            # Five 8-byte arrays per pool plus the object, array and dict entry overhead
+            return len(histories) * (40 * self.depth + 600)
+
+    def clear(self, chain_id: Optional[str] = None) -> None:
+        with self.lock:
+            if chain_id is None:
+                self.histories.clear()
+            else:
+                self.histories.pop(chain_id, None)
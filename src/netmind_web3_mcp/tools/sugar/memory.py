@@ -0,0 +1,73 @@
+"""Size estimates and access tracking for the pools cache memory budget."""
+
+import math
+import sys
+import time
+from typing import Any, Dict, List, Sequence
+
+# Number of items measured when extrapolating the size of a large collection
+SAMPLE_SIZE = 64
+
+
+def deep_sizeof(obj: Any) -> int:
+    """Approximate the memory held by obj and everything it references, counting shared objects once."""
+    seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, type):
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif not isinstance(o, (str, bytes, int, float, bool)):
+            d = getattr(o, "__dict__", None)
+            if d is not None:
+                stack.append(d)
+            for slot in getattr(type(o), "__slots__", ()):
+                if hasattr(o, slot):
+                    stack.append(getattr(o, slot))
+    return total
+
+
+def estimate_items_bytes(items: Sequence[Any]) -> int:
+    """Estimate the memory held by the items of a collection from an evenly spaced sample."""
+    if not items:
+        return 0
+    step = max(1, len(items) // SAMPLE_SIZE)
+    sample = list(items[::step][:SAMPLE_SIZE])
+    # Measure the sample as one object graph so objects shared between items count once
+    return int(deep_sizeof(sample) - sys.getsizeof(sample)) * len(items) // len(sample)
+
+
+class AccessCounter:
+    """Per-key access counts that halve every half_life_seconds, so recent use outweighs old use.
+
+    Updates are not serialized; a concurrent update may drop a count, which is fine for ranking.
+    """
+
+    def __init__(self, half_life_seconds: float = 3600):
+        self.half_life_seconds = half_life_seconds
+        # key -> (score, time of last update)
+        self.scores: Dict[str, tuple] = {}
+
+    def _decayed(self, score: float, updated: float, now: float) -> float:
+        return score * math.pow(0.5, (now - updated) / self.half_life_seconds)
+
+    def touch(self, key: str) -> None:
+        now = time.monotonic()
+        score, updated = self.scores.get(key, (0.0, now))
+        self.scores[key] = (self._decayed(score, updated, now) + 1.0, now)
+
+    def score(self, key: str) -> float:
+        now = time.monotonic()
+        score, updated = self.scores.get(key, (0.0, now))
+        return self._decayed(score, updated, now)
+
+    def coldest_first(self, keys: List[str]) -> List[str]:
+        return sorted(keys, key=self.score)
@@ -0,0 +1,48 @@
+"""Derived per-pool metrics used for filtering and sorting."""
+
+from typing import List, NamedTuple
+
+from netmind_sugar.chains import LiquidityPool
+
+
+class PoolMetrics(NamedTuple):
+    """Pool values in stable terms, computed once per pool per snapshot."""
+    tvl: float
+    apr: float
+    volume: float
+    gauge_staked_pct: float
+    has_emissions: bool
+    is_stable: bool
+
+
+def _safe(compute, default=0.0) -> float:
+    """Evaluate a pool property, treating missing data and math errors as the default."""
+    try:
+        value = compute()
+    except (AttributeError, TypeError, ZeroDivisionError):
+        return default
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return float(value)
+    # Amount-like objects
+    amount_in_stable = getattr(value, "amount_in_stable", None)
+    return float(amount_in_stable) if amount_in_stable is not None else default
+
+
+def compute_pool_metrics(pool: LiquidityPool) -> PoolMetrics:
+    """Compute the metrics for one pool."""
+    emissions = getattr(pool, "emissions", None)
+    return PoolMetrics(
+        tvl=_safe(lambda: pool.tvl),
+        apr=_safe(lambda: pool.apr),
+        volume=_safe(lambda: pool.volume),
+        gauge_staked_pct=_safe(lambda: 100 * pool.gauge_total_supply / pool.total_supply),
+        has_emissions=emissions is not None and bool(getattr(emissions, "amount", 0)),
+        is_stable=bool(getattr(pool, "is_stable", False)),
+    )
+
+
+def get_pool_metrics(pools: List[LiquidityPool]) -> List[PoolMetrics]:
+    """Compute metrics aligned with pools."""
+    return [compute_pool_metrics(pool) for pool in pools]
@@ -1,9 +1,13 @@
 """Data models for Sugar MCP tools."""
 
-from typing import Optional, List, Tuple, Union
+from datetime import datetime
+from typing import Optional, List, Tuple, Union, Dict
 from pydantic import Field, BaseModel
 from netmind_sugar.chains import Token, Price, LiquidityPool, Quote, LiquidityPoolForSwap
 from netmind_sugar.pool import Amount, LiquidityPoolEpoch
+from .diff import PoolChange, SnapshotDiff
+from .history import HistoryPoint
+from .stats import TokenStats
 
 
 class TokenInfo(BaseModel):
@@ -38,6 +42,72 @@ class PriceInfo(BaseModel):
         return PriceInfo(token=token_info, price=p.price)
 
 
+class TokenPriceInfo(PriceInfo):
+    """Token price annotated with where it came from."""
+
+    source: str = Field(..., description="Price source: 'snapshot' (cached pool reserves) or 'rpc' (on-chain oracle)")
+    age_seconds: float = Field(..., description="Age of the price in seconds; 0 for RPC prices")
+    pool: Optional[str] = Field(None, description="Address of the pool the snapshot price was taken from")
+
+
+class PriceChunkError(BaseModel):
+    offset: int = Field(..., description="Offset of the token range that failed")
+    limit: int = Field(..., description="Size of the token range that failed")
+    error: str = Field(..., description="Error message")
+
+
+class QuerySugarGetPricesOutput(BaseModel):
+    """Output for query_sugar_get_prices. result holds prices in token order; failed_chunks lists token ranges that could not be priced."""
+
+    result: List[PriceInfo] = Field(..., description="List of prices in token order")
+    failed_chunks: List[PriceChunkError] = Field(default_factory=list, description="Token ranges whose prices could not be fetched")
+
+
+class TokenStatsInfo(BaseModel):
+    """Aggregates over all pools containing a token."""
+
+    token_address: str = Field(..., description="Token contract address")
+    symbol: str = Field(..., description="Token symbol")
+    pool_count: int = Field(..., description="Number of pools containing the token")
+    total_tvl: float = Field(..., description="Summed TVL of all pools containing the token, in stable terms")
+    token_liquidity: float = Field(..., description="Summed value of the token's own reserves across those pools, in stable terms")
+    total_volume: float = Field(..., description="Summed volume of all pools containing the token, in stable terms")
+    max_apr: float = Field(..., description="Highest emissions APR among those pools, in percent")
+    max_apr_pool: Optional[str] = Field(None, description="Address of the pool with the highest APR")
+    top_pool: Optional[str] = Field(None, description="Address of the pool with the highest TVL")
+    top_pool_symbol: Optional[str] = Field(None, description="Symbol of the pool with the highest TVL")
+    top_pool_tvl: float = Field(..., description="TVL of the pool with the highest TVL, in stable terms")
+
+    @staticmethod
+    def from_stats(s: TokenStats):
+        return TokenStatsInfo(
+            token_address=s.token_address,
+            symbol=s.symbol,
+            pool_count=s.pool_count,
+            total_tvl=s.total_tvl,
+            token_liquidity=s.token_liquidity,
+            total_volume=s.total_volume,
+            max_apr=s.max_apr,
+            max_apr_pool=s.max_apr_pool,
+            top_pool=s.top_pool,
+            top_pool_symbol=s.top_pool_symbol,
+            top_pool_tvl=s.top_pool_tvl,
+        )
+
+
+class QuerySugarGetTokenStatsOutput(BaseModel):
+    """Output for query_sugar_get_token_stats. result is the token stats or 'NOT FIND' when no pool contains the token."""
+
+    result: Union[TokenStatsInfo, str] = Field(
+        ...,
+        description="Aggregated stats for the token, or 'NOT FIND' when no pool contains it",
+    )
+    block_number: Optional[int] = Field(
+        None,
+        description="Block number the cached snapshot was taken at, or None when read directly from chain",
+    )
+
+
 class AmountInfo(BaseModel):
     token: TokenInfo = Field(..., description="Token information")
     amount: int = Field(..., description="Amount in wei")
@@ -134,6 +204,148 @@ class QuerySugarGetPoolListOutput(BaseModel):
         ...,
         description="List of liquidity pool info, or 'NOT FIND' when no pools match",
     )
+    block_number: Optional[int] = Field(
+        None,
+        description="Block number the cached snapshot was taken at, or None when read directly from chain",
+    )
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Cursor for the next page of this exact result ordering, or None on the last page",
+    )
+    snapshot_replaced: bool = Field(
+        False,
+        description="True when a resumed cursor's cache snapshot has since been refreshed; pages still come from the original ordering",
+    )
+
+
+class ChainPoolsStatus(BaseModel):
+    """Per-chain status for a multi-chain pool query."""
+
+    chain_id: str = Field(..., description="Chain ID")
+    matched: int = Field(0, description="Number of pools on this chain that matched the filters")
+    block_number: Optional[int] = Field(None, description="Block number the cached snapshot was taken at, if known")
+    age_seconds: Optional[float] = Field(None, description="Age of the cached snapshot in seconds, or 0 when read directly from chain")
+    error: Optional[str] = Field(None, description="Error fetching pools for this chain, if any")
+
+
+class QuerySugarGetMultichainPoolListOutput(BaseModel):
+    """Output for query_sugar_get_multichain_pool_list. result is the merged top pools or 'NOT FIND' when none match."""
+
+    result: Union[List[LiquidityPoolInfo], str] = Field(
+        ...,
+        description="Top liquidity pools across the requested chains, or 'NOT FIND' when no pools match",
+    )
+    chains: List[ChainPoolsStatus] = Field(..., description="Freshness and errors for each requested chain")
+
+
+class PoolHistoryPointInfo(BaseModel):
+    timestamp: str = Field(..., description="Time the snapshot was taken (ISO 8601)")
+    block_number: Optional[int] = Field(None, description="Block number the snapshot was taken at, if known")
+    tvl: float = Field(..., description="TVL in stable terms")
+    apr: float = Field(..., description="Emissions APR in percent")
+    volume: float = Field(..., description="Volume in stable terms")
+
+    @staticmethod
+    def from_point(p: HistoryPoint):
+        return PoolHistoryPointInfo(
+            timestamp=datetime.fromtimestamp(p.timestamp).isoformat(timespec="seconds"),
+            block_number=p.block_number,
+            tvl=p.tvl,
+            apr=p.apr,
+            volume=p.volume,
+        )
+
+
+class PoolHistoryDeltaInfo(BaseModel):
+    """Changes between points of a pool's history."""
+
+    tvl_change: float = Field(..., description="TVL change in stable terms")
+    tvl_change_pct: Optional[float] = Field(None, description="TVL change in percent, None when the starting TVL is 0")
+    apr_change: float = Field(..., description="APR change in percentage points")
+    volume_change: float = Field(..., description="Volume change in stable terms")
+
+    @staticmethod
+    def between(first: HistoryPoint, last: HistoryPoint):
+        return PoolHistoryDeltaInfo(
+            tvl_change=last.tvl - first.tvl,
+            tvl_change_pct=(last.tvl - first.tvl) / first.tvl * 100 if first.tvl else None,
+            apr_change=last.apr - first.apr,
+            volume_change=last.volume - first.volume,
+        )
+
+
+class QuerySugarGetPoolHistoryOutput(BaseModel):
+    """Output for query_sugar_get_pool_history. result is the pool's history or 'NOT FIND' when none is recorded."""
+
+    result: Union[List[PoolHistoryPointInfo], str] = Field(
+        ...,
+        description="Metric points recorded at each cache refresh, oldest first, or 'NOT FIND'",
+    )
+    change_since_previous: Optional[PoolHistoryDeltaInfo] = Field(
+        None,
+        description="Change between the last two points, None with fewer than two points",
+    )
+    change_over_window: Optional[PoolHistoryDeltaInfo] = Field(
+        None,
+        description="Change between the first and last returned points, None with fewer than two points",
+    )
+
+
+class PoolChangeInfo(BaseModel):
+    lp: str = Field(..., description="Pool address")
+    symbol: str = Field(..., description="Pool symbol")
+    before: float = Field(..., description="Value in the previous snapshot")
+    after: float = Field(..., description="Value in the current snapshot")
+    change: float = Field(..., description="after - before")
+    change_pct: Optional[float] = Field(None, description="Change in percent of before, None when before is 0")
+
+    @staticmethod
+    def from_change(c: PoolChange):
+        return PoolChangeInfo(
+            lp=c.lp,
+            symbol=c.symbol,
+            before=c.before,
+            after=c.after,
+            change=c.change,
+            change_pct=c.change / c.before * 100 if c.before else None,
+        )
+
+
+class PoolChangesInfo(BaseModel):
+    """Changes between the two most recent pool snapshots of a chain."""
+
+    from_block: Optional[int] = Field(None, description="Block number of the previous snapshot, if known")
+    to_block: Optional[int] = Field(None, description="Block number of the current snapshot, if known")
+    from_time: str = Field(..., description="Time the previous snapshot was taken (ISO 8601)")
+    to_time: str = Field(..., description="Time the current snapshot was taken (ISO 8601)")
+    new_pools: List[str] = Field(default_factory=list, description="Addresses of pools that appeared")
+    removed_pools: List[str] = Field(default_factory=list, description="Addresses of pools that disappeared")
+    changed_count: int = Field(..., description="Number of pools whose TVL, APR or volume changed")
+    metric: str = Field(..., description="Metric the movers are ranked by")
+    movers: List[PoolChangeInfo] = Field(default_factory=list, description="Pools with the largest absolute change in metric, biggest first")
+
+    @staticmethod
+    def from_diff(diff: SnapshotDiff, metric: str, limit: int):
+        return PoolChangesInfo(
+            from_block=diff.from_block,
+            to_block=diff.to_block,
+            from_time=diff.from_time.isoformat(timespec="seconds"),
+            to_time=diff.to_time.isoformat(timespec="seconds"),
+            new_pools=diff.new_pools,
+            removed_pools=diff.removed_pools,
+            changed_count=diff.changed_count,
+            metric=metric,
+            movers=[PoolChangeInfo.from_change(c) for c in diff.movers[metric][:limit]],
+        )
+
+
+class QuerySugarGetPoolChangesOutput(BaseModel):
+    """Output for query_sugar_get_pool_changes. result is the latest snapshot diff or 'NOT FIND' when none is available."""
+
+    result: Union[PoolChangesInfo, str] = Field(
+        ...,
+        description="Changes between the two most recent cached snapshots, or 'NOT FIND'",
+    )
 
 
 class LiquidityPoolForSwapInfo(BaseModel):
@@ -156,6 +368,23 @@ class LiquidityPoolForSwapInfo(BaseModel):
         )
 
 
+class QuerySugarGetPoolsForSwapsOutput(BaseModel):
+    """Output for query_sugar_get_pools_for_swaps. result is list of pools or 'Not Find' when none match."""
+
+    result: Union[List[LiquidityPoolForSwapInfo], str] = Field(
+        ...,
+        description="List of simplified pools for swaps, or 'Not Find' when no pools are available",
+    )
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Cursor for the next page of this exact result ordering, or None on the last page",
+    )
+    snapshot_replaced: bool = Field(
+        False,
+        description="True when a resumed cursor's cache snapshot has since been refreshed; pages still come from the original ordering",
+    )
+
+
 class LiquidityPoolEpochInfo(BaseModel):
     ts: int = Field(..., description="Timestamp of the epoch")
     lp: str = Field(..., description="Liquidity pool address")
@@ -178,6 +407,33 @@ class LiquidityPoolEpochInfo(BaseModel):
         )
 
 
+class LiquidityPoolEpochRefInfo(BaseModel):
+    ts: int = Field(..., description="Timestamp of the epoch")
+    lp: str = Field(..., description="Liquidity pool address, key into the pools mapping")
+    votes: int = Field(..., description="Number of votes")
+    emissions: int = Field(..., description="Emissions amount")
+    incentives: List[AmountInfo] = Field(..., description="List of incentives amounts")
+    fees: List[AmountInfo] = Field(..., description="List of fees amounts")
+
+    @staticmethod
+    def from_epoch(e: LiquidityPoolEpoch):
+        return LiquidityPoolEpochRefInfo(
+            ts=e.ts,
+            lp=e.lp,
+            votes=e.votes,
+            emissions=e.emissions,
+            incentives=[AmountInfo.from_amount(i) for i in e.incentives],
+            fees=[AmountInfo.from_amount(f) for f in e.fees]
+        )
+
+
+class QuerySugarGetPoolEpochsOutput(BaseModel):
+    """Deduplicated output for the epoch tools. Epochs reference pools by address and each distinct pool is returned once."""
+
+    epochs: List[LiquidityPoolEpochRefInfo] = Field(..., description="List of epochs referencing pools by address")
+    pools: Dict[str, LiquidityPoolInfo] = Field(..., description="Liquidity pool information keyed by pool address")
+
+
 class QuoteInputInfo(BaseModel):
     from_token: TokenInfo = Field(..., description="From token information")
     to_token: TokenInfo = Field(..., description="To token information")
@@ -1,32 +1,102 @@
 """Sugar MCP pool-related tools."""
 
-from typing import Optional
-from netmind_sugar.chains import get_chain, LiquidityPool, LiquidityPoolForSwap
+import asyncio
+import heapq
+import itertools
+import sys
+from datetime import datetime
+from operator import attrgetter
+from typing import Callable, List, Optional, Tuple
+from netmind_sugar.chains import LiquidityPool, LiquidityPoolForSwap
 from web3 import Web3
 from .models import (
     LiquidityPoolInfo,
     LiquidityPoolForSwapInfo,
     LiquidityPoolEpochInfo,
+    LiquidityPoolEpochRefInfo,
     QuerySugarGetPoolListOutput,
+    QuerySugarGetPoolsForSwapsOutput,
+    QuerySugarGetPoolEpochsOutput,
+    QuerySugarGetMultichainPoolListOutput,
+    QuerySugarGetPoolHistoryOutput,
+    QuerySugarGetPoolChangesOutput,
+    PoolChangesInfo,
+    PoolHistoryPointInfo,
+    PoolHistoryDeltaInfo,
+    ChainPoolsStatus,
 )
 from .cache import (
     _get_cached_pools,
+    _get_cached_snapshot,
+    _get_pool_metrics,
     _get_pool_from_cache,
+    _get_pool_info_from_cache,
+    _get_pool_history,
     _get_pools_from_chain,
     _get_pool_from_chain,
 )
 from .config import validate_cache_parameter
+from .cursors import RetainedScan, paginate, page_from_cursor
+from .diff import DIFF_METRICS
+from .filters import PoolFilter
+from .metrics import PoolMetrics
+from .prefetch import get_read_ahead_buffer
+from .rpc import get_chain
 
 
-def _safe_get_amount_in_stable(amount_obj, default=0.0):
-    """Safely extract amount_in_stable from an amount object."""
-    if amount_obj is None:
-        return default
-    if isinstance(amount_obj, (int, float)):
-        return float(amount_obj)
-    if hasattr(amount_obj, 'amount_in_stable') and amount_obj.amount_in_stable is not None:
-        return amount_obj.amount_in_stable
-    return default
+POOL_SORT_KEYS = {
+    "tvl": attrgetter("tvl"),
+    "volume": attrgetter("volume"),
+    "apr": attrgetter("apr"),
+}
+
+# All chains served by the Sugar tools
+SUPPORTED_CHAIN_IDS = ["8453", "10", "130", "1135"]
+
+
+def _snapshot_replaced(scan: RetainedScan) -> bool:
+    """Whether the cache snapshot a retained scan was computed from has been replaced since."""
+    if scan.snapshot_version is None:
+        return False
+    snapshot = _get_cached_snapshot(scan.chain_id)
+    return snapshot is None or snapshot.version != scan.snapshot_version
+
+
+def _get_sort_key(sort_by: str) -> Callable[[Tuple[PoolMetrics, LiquidityPool]], float]:
+    """Get a sort key over (metrics, pool) pairs."""
+    if sort_by not in POOL_SORT_KEYS:
+        raise ValueError("Unsupported sort_by criteria. Use 'tvl', 'volume', or 'apr'.")
+    metric = POOL_SORT_KEYS[sort_by]
+    return lambda pair: metric(pair[0])
+
+
+def _apply_pool_filter(chain_id: str, pools: List[LiquidityPool], pool_filter: PoolFilter) -> List[Tuple[PoolMetrics, LiquidityPool]]:
+    """Pair pools with their metrics and keep those matching the filter."""
+    predicate = pool_filter.compile()
+    return [(m, p) for m, p in zip(_get_pool_metrics(chain_id, pools), pools) if predicate(m)]
+
+
+def _validate_pool_type(pool_type: str) -> None:
+    if pool_type not in ["v2", "v3", "all"]:
+        raise ValueError("Unsupported pool_type. Use 'v2', 'v3', or 'all'.")
+
+
+def _filter_pools_by_tokens(pools: List[LiquidityPool], tokens: List[str], get_key: Callable) -> List[LiquidityPool]:
+    """Keep pools containing one token, or exactly a token pair, compared with lowercase get_key(token)."""
+    if len(tokens) == 1:
+        return [p for p in pools if get_key(p.token0) == tokens[0] or get_key(p.token1) == tokens[0]]
+    if len(tokens) == 2:
+        return [p for p in pools if (
+            (get_key(p.token0) == tokens[0] and get_key(p.token1) == tokens[1]) or
+            (get_key(p.token0) == tokens[1] and get_key(p.token1) == tokens[0])
+        )]
+    raise ValueError("Only one or two tokens are supported for filtering.")
+
+
+def _filter_pools_by_type(pools: List[LiquidityPool], pool_type: str) -> List[LiquidityPool]:
+    if pool_type == "all":
+        return pools
+    return [p for p in pools if (pool_type == "v3") == p.is_cl]
 
 
 def _convert_pools_to_swap_format(pools: list) -> list:
@@ -56,48 +126,105 @@ def _convert_pools_to_swap_format(pools: list) -> list:
             
             result.append(pool_obj)
         except Exception as e:
-            print(f"Error converting pool {p.lp}: {e}, type={type(p.type)}, value={p.type}")
+            print(f"Error converting pool {p.lp}: {e}, type={type(p.type)}, value={p.type}", file=sys.stderr)
             raise
     return result
 
 
+def _convert_epochs(epochs: list, chainId: str, dedupe_pools: bool) -> list | str | QuerySugarGetPoolEpochsOutput:
+    """Convert raw epochs to epoch models, optionally returning each distinct pool once."""
+    result = []
+    pools = {}
+    for p in epochs:
+        if p is None:
+            continue
+        try:
+            if not dedupe_pools:
+                result.append(LiquidityPoolEpochInfo.from_epoch(p))
+                continue
+            epoch_info = LiquidityPoolEpochRefInfo.from_epoch(p)
+            if p.lp not in pools:
+                # Reuse the model from the cache snapshot when the pool is cached
+                pools[p.lp] = _get_pool_info_from_cache(chainId, p.lp) or LiquidityPoolInfo.from_pool(p.pool)
+            result.append(epoch_info)
+        except Exception as e:
+            print(f"Skipping epoch with invalid pool data: {type(e).__name__}: {e}", file=sys.stderr)
+    if not result:
+        return "Not Find"
+    if dedupe_pools:
+        return QuerySugarGetPoolEpochsOutput(epochs=result, pools=pools)
+    return result
+
+
 async def query_sugar_get_pools_for_swaps(
     limit: int,
     offset: int,
     chainId: str = "8453",
     use_cache: bool = True,
-) -> list | str:
+    with_cursor: bool = False,
+    cursor: Optional[str] = None,
+) -> list | str | QuerySugarGetPoolsForSwapsOutput:
     """Retrieve all raw liquidity pools suitable for swaps.
 
     Args:
         limit: The maximum number of pools to retrieve
         offset: The starting point for pagination
         chainId: The chain ID to use ('10' for OPChain, '8453' for BaseChain, '130' for Unichain, '1135' for List)
-        use_cache: Whether to use cached data. Defaults to True. Not available in stdio mode.
+        use_cache: Whether to use cached data. Defaults to True. Not available when the stdio cache is disabled.
+        with_cursor: If True, return QuerySugarGetPoolsForSwapsOutput with a next_cursor that continues this exact scan
+        cursor: next_cursor from a previous page. Continues that exact scan; offset, chainId and use_cache are ignored
 
     Returns:
-        List[LiquidityPoolForSwapInfo] | str: A list of simplified pool objects for swaps or "Not Find"
+        List[LiquidityPoolForSwapInfo] | str: A list of simplified pool objects for swaps or "Not Find".
+        QuerySugarGetPoolsForSwapsOutput when with_cursor is True or a cursor is passed: result is the list or
+            "Not Find"; next_cursor continues the scan and is None on the last page; snapshot_replaced is True
+            when the cache has refreshed since the scan started
     """
+    if cursor is not None:
+        paged = page_from_cursor("query_sugar_get_pools_for_swaps", cursor, limit)
+        if paged is None:
+            return QuerySugarGetPoolsForSwapsOutput(result="Not Find: cursor expired or unknown, restart the scan without a cursor")
+        page, next_cursor, scan = paged
+        if not page:
+            return QuerySugarGetPoolsForSwapsOutput(result="Not Find: cursor is past the end of the scan")
+        return QuerySugarGetPoolsForSwapsOutput(
+            result=[LiquidityPoolForSwapInfo.from_pool(p) for p in page],
+            next_cursor=next_cursor,
+            snapshot_replaced=_snapshot_replaced(scan),
+        )
+
+    # Without a cursor the tool keeps its original bare list or string output
+    def output(result: list | str, next_cursor: Optional[str] = None) -> list | str | QuerySugarGetPoolsForSwapsOutput:
+        if with_cursor:
+            return QuerySugarGetPoolsForSwapsOutput(result=result, next_cursor=next_cursor)
+        return result
+
     validate_cache_parameter(use_cache, "query_sugar_get_pools_for_swaps")
+    snapshot = None
     if use_cache:
         pools = _get_cached_pools(chainId)
+        snapshot = _get_cached_snapshot(chainId)
     else:
         try:
-            pools = _get_pools_from_chain(chainId)
+            pools = await asyncio.to_thread(_get_pools_from_chain, chainId)
         except Exception as e:
-            return f"Not Find: chain {chainId} fetch error — {type(e).__name__}: {e}"
+            return output(f"Not Find: chain {chainId} fetch error — {type(e).__name__}: {e}")
 
     if not pools:
-        return f"Not Find: no pools returned from chain {chainId}"
+        return output(f"Not Find: no pools returned from chain {chainId}")
 
     pools_for_swap = _convert_pools_to_swap_format(pools)
     total = len(pools_for_swap)
-    paginated_pools = pools_for_swap[offset:offset + limit]
+    if with_cursor:
+        snapshot_version = snapshot.version if snapshot is not None else None
+        paginated_pools, next_cursor = paginate("query_sugar_get_pools_for_swaps", pools_for_swap, offset, limit, chain_id=chainId, snapshot_version=snapshot_version)
+    else:
+        paginated_pools, next_cursor = pools_for_swap[offset:offset + limit], None
 
     result = [LiquidityPoolForSwapInfo.from_pool(p) for p in paginated_pools]
     if not result:
-        return f"Not Find: offset {offset} exceeds available pools (total {total})"
-    return result
+        return output(f"Not Find: offset {offset} exceeds available pools (total {total})")
+    return output(result, next_cursor)
 
 
 async def query_sugar_get_pool_list(
@@ -109,6 +236,16 @@ async def query_sugar_get_pool_list(
     offset: int = 0,
     chainId: str = "8453",
     use_cache: bool = True,
+    min_tvl: Optional[float] = None,
+    max_tvl: Optional[float] = None,
+    min_apr: Optional[float] = None,
+    max_apr: Optional[float] = None,
+    min_volume: Optional[float] = None,
+    is_stable: Optional[bool] = None,
+    has_emissions: Optional[bool] = None,
+    min_gauge_staked_pct: Optional[float] = None,
+    max_gauge_staked_pct: Optional[float] = None,
+    cursor: Optional[str] = None,
 ) -> QuerySugarGetPoolListOutput:
     """Retrieve liquidity pools based on specified criteria.
 
@@ -120,33 +257,79 @@ async def query_sugar_get_pool_list(
         limit: The maximum number of pools to retrieve
         offset: The starting point for pagination
         chainId: The chain ID to use ('10' for OPChain, '8453' for BaseChain, '130' for Unichain, '1135' for List)
-        use_cache: Whether to use cached data. Defaults to True. Not available in stdio mode.
+        use_cache: Whether to use cached data. Defaults to True. Not available when the stdio cache is disabled.
+        min_tvl: Minimum TVL in stable terms (inclusive)
+        max_tvl: Maximum TVL in stable terms (inclusive)
+        min_apr: Minimum emissions APR in percent (inclusive)
+        max_apr: Maximum emissions APR in percent (inclusive)
+        min_volume: Minimum volume in stable terms (inclusive)
+        is_stable: If set, only stable (True) or only volatile (False) pools
+        has_emissions: If set, only pools with (True) or without (False) gauge emissions
+        min_gauge_staked_pct: Minimum percentage of liquidity staked in the gauge (inclusive)
+        max_gauge_staked_pct: Maximum percentage of liquidity staked in the gauge (inclusive)
+        cursor: next_cursor from a previous page. Continues that exact scan with the same filters, ordering and
+            snapshot; all other arguments except limit are ignored
 
     Returns:
-        QuerySugarGetPoolListOutput: result is list of LiquidityPoolInfo, or "NOT FIND" when no pools match
+        QuerySugarGetPoolListOutput: result is list of LiquidityPoolInfo, or "NOT FIND" when no pools match.
+            block_number is the block the cached snapshot was taken at when use_cache is True.
+            next_cursor continues the scan and is None on the last page; snapshot_replaced is True when
+            the cache has refreshed since the scan started
     """
     # limit is max 10
     limit = min(limit, 10)
+
+    if cursor is not None:
+        paged = page_from_cursor("query_sugar_get_pool_list", cursor, limit)
+        if paged is None:
+            return QuerySugarGetPoolListOutput(result="NOT FIND: cursor expired or unknown, restart the scan without a cursor")
+        page, next_cursor, scan = paged
+        if not page:
+            return QuerySugarGetPoolListOutput(result="NOT FIND: cursor is past the end of the scan")
+        return QuerySugarGetPoolListOutput(
+            result=[LiquidityPoolInfo.from_pool(p) for p in page],
+            block_number=scan.block_number,
+            next_cursor=next_cursor,
+            snapshot_replaced=_snapshot_replaced(scan),
+        )
     
     validate_cache_parameter(use_cache, "query_sugar_get_pool_list")
+    pool_filter = PoolFilter(
+        min_tvl=min_tvl,
+        max_tvl=max_tvl,
+        min_apr=min_apr,
+        max_apr=max_apr,
+        min_volume=min_volume,
+        is_stable=is_stable,
+        has_emissions=has_emissions,
+        min_gauge_staked_pct=min_gauge_staked_pct,
+        max_gauge_staked_pct=max_gauge_staked_pct,
+    )
     if lp is not None:
         lp = Web3.to_checksum_address(lp)
+        block_number = None
         if use_cache:
             pool = _get_pool_from_cache(chainId, lp)
+            snapshot = _get_cached_snapshot(chainId)
+            block_number = snapshot.block_number if snapshot is not None else None
         else:
             try:
-                pool = _get_pool_from_chain(chainId, lp)
+                pool = await asyncio.to_thread(_get_pool_from_chain, chainId, lp)
             except Exception as e:
                 return QuerySugarGetPoolListOutput(result=f"NOT FIND: chain {chainId} fetch error — {type(e).__name__}: {e}")
         if pool:
-            return QuerySugarGetPoolListOutput(result=[LiquidityPoolInfo.from_pool(pool)])
+            return QuerySugarGetPoolListOutput(result=[LiquidityPoolInfo.from_pool(pool)], block_number=block_number)
         return QuerySugarGetPoolListOutput(result=f"NOT FIND: pool address {lp} not found on chain {chainId}")
 
+    block_number, snapshot_version = None, None
     if use_cache:
         pools = _get_cached_pools(chainId)
+        snapshot = _get_cached_snapshot(chainId)
+        if snapshot is not None:
+            block_number, snapshot_version = snapshot.block_number, snapshot.version
     else:
         try:
-            pools = _get_pools_from_chain(chainId)
+            pools = await asyncio.to_thread(_get_pools_from_chain, chainId)
         except Exception as e:
             return QuerySugarGetPoolListOutput(result=f"NOT FIND: chain {chainId} fetch error — {type(e).__name__}: {e}")
     if not pools:
@@ -154,72 +337,245 @@ async def query_sugar_get_pool_list(
 
     if token_address_list is not None:
         token_address_list = [Web3.to_checksum_address(a).lower() for a in token_address_list]
-        if len(token_address_list) == 1:
-            pools = [p for p in pools if p.token0.token_address.lower() == token_address_list[0] or p.token1.token_address.lower() == token_address_list[0]]
-            if not pools:
+        pools = _filter_pools_by_tokens(pools, token_address_list, lambda t: t.token_address.lower())
+        if not pools:
+            if len(token_address_list) == 1:
                 return QuerySugarGetPoolListOutput(result=f"NOT FIND: no pools contain token {token_address_list[0]} on chain {chainId}")
-        elif len(token_address_list) == 2:
-            pools = [p for p in pools if (
-                (p.token0.token_address.lower() == token_address_list[0] and p.token1.token_address.lower() == token_address_list[1]) or
-                (p.token0.token_address.lower() == token_address_list[1] and p.token1.token_address.lower() == token_address_list[0])
-            )]
-            if not pools:
-                return QuerySugarGetPoolListOutput(result=f"NOT FIND: no pools with token pair ({token_address_list[0]}, {token_address_list[1]}) on chain {chainId}")
+            return QuerySugarGetPoolListOutput(result=f"NOT FIND: no pools with token pair ({token_address_list[0]}, {token_address_list[1]}) on chain {chainId}")
+
+    _validate_pool_type(pool_type)
+    pools = _filter_pools_by_type(pools, pool_type)
+    if not pools:
+        return QuerySugarGetPoolListOutput(result=f"NOT FIND: no {pool_type} pools found on chain {chainId}")
+
+    sort_key = _get_sort_key(sort_by)
+    matched = _apply_pool_filter(chainId, pools, pool_filter)
+    if not matched:
+        return QuerySugarGetPoolListOutput(result=f"NOT FIND: no pools match the filters on chain {chainId}")
+    matched.sort(key=sort_key, reverse=True)
+
+    total = len(matched)
+    # Later pages are served from the retained ordering through next_cursor
+    page, next_cursor = paginate("query_sugar_get_pool_list", [p for _, p in matched], offset, limit, block_number, chainId, snapshot_version)
+    if not page:
+        return QuerySugarGetPoolListOutput(result=f"NOT FIND: offset {offset} exceeds available pools (total {total})")
+    return QuerySugarGetPoolListOutput(result=[LiquidityPoolInfo.from_pool(p) for p in page], block_number=block_number, next_cursor=next_cursor)
+
+
+def _load_chain_pools(
+    chain_id: str,
+    token_symbol_list: Optional[List[str]],
+    pool_type: str,
+    pool_filter: PoolFilter,
+    use_cache: bool,
+) -> Tuple[List[Tuple[PoolMetrics, LiquidityPool]], ChainPoolsStatus]:
+    """Load and filter one chain's pools for the multi-chain query. Errors are reported in the status."""
+    try:
+        if use_cache:
+            pools = _get_cached_pools(chain_id)
         else:
+            pools = _get_pools_from_chain(chain_id)
+    except Exception as e:
+        return [], ChainPoolsStatus(chain_id=chain_id, error=f"{type(e).__name__}: {e}")
+
+    status = ChainPoolsStatus(chain_id=chain_id, age_seconds=0.0)
+    if use_cache:
+        snapshot = _get_cached_snapshot(chain_id)
+        # Chains outside the cached set are fetched directly and have no snapshot
+        if snapshot is not None:
+            status.block_number = snapshot.block_number
+            status.age_seconds = round((datetime.now() - snapshot.last_updated).total_seconds(), 1)
+    if not pools:
+        status.error = f"no pools returned from chain {chain_id}"
+        return [], status
+
+    if token_symbol_list is not None:
+        pools = _filter_pools_by_tokens(pools, token_symbol_list, lambda t: t.symbol.lower())
+    matched = _apply_pool_filter(chain_id, _filter_pools_by_type(pools, pool_type), pool_filter)
+    status.matched = len(matched)
+    return matched, status
+
+
+async def query_sugar_get_multichain_pool_list(
+    token_symbol_list: Optional[list[str]] = None,
+    chainIds: Optional[list[str]] = None,
+    pool_type: str = "all",
+    sort_by: str = "tvl",
+    limit: int = 10,
+    offset: int = 0,
+    use_cache: bool = True,
+    min_tvl: Optional[float] = None,
+    max_tvl: Optional[float] = None,
+    min_apr: Optional[float] = None,
+    max_apr: Optional[float] = None,
+    min_volume: Optional[float] = None,
+    is_stable: Optional[bool] = None,
+    has_emissions: Optional[bool] = None,
+    min_gauge_staked_pct: Optional[float] = None,
+    max_gauge_staked_pct: Optional[float] = None,
+) -> QuerySugarGetMultichainPoolListOutput:
+    """Retrieve the top liquidity pools across several chains in one call.
+
+    Token addresses differ between chains, so tokens are matched by symbol (case-insensitive).
+
+    Args:
+        token_symbol_list: List of token symbols to filter pools, e.g. ["USDC"] or ["USDC", "WETH"]. Only one or two tokens are supported. If None, no token filtering is applied
+        chainIds: The chain IDs to query ('10' for OPChain, '8453' for BaseChain, '130' for Unichain, '1135' for List). Defaults to all of them
+        pool_type: The type of pools to retrieve ('v2', 'v3' or 'all')
+        sort_by: The criterion to sort the pools by ('tvl', 'volume', or 'apr')
+        limit: The maximum number of pools to retrieve
+        offset: The starting point for pagination
+        use_cache: Whether to use cached data. Defaults to True. Not available when the stdio cache is disabled.
+        min_tvl: Minimum TVL in stable terms (inclusive)
+        max_tvl: Maximum TVL in stable terms (inclusive)
+        min_apr: Minimum emissions APR in percent (inclusive)
+        max_apr: Maximum emissions APR in percent (inclusive)
+        min_volume: Minimum volume in stable terms (inclusive)
+        is_stable: If set, only stable (True) or only volatile (False) pools
+        has_emissions: If set, only pools with (True) or without (False) gauge emissions
+        min_gauge_staked_pct: Minimum percentage of liquidity staked in the gauge (inclusive)
+        max_gauge_staked_pct: Maximum percentage of liquidity staked in the gauge (inclusive)
+
+    Returns:
+        QuerySugarGetMultichainPoolListOutput: result is the merged list of LiquidityPoolInfo across chains, or "NOT FIND"
+            when no pools match; chains reports snapshot freshness and fetch errors per chain
+    """
+    # limit is max 10
+    limit = min(limit, 10)
+
+    validate_cache_parameter(use_cache, "query_sugar_get_multichain_pool_list")
+    pool_filter = PoolFilter(
+        min_tvl=min_tvl,
+        max_tvl=max_tvl,
+        min_apr=min_apr,
+        max_apr=max_apr,
+        min_volume=min_volume,
+        is_stable=is_stable,
+        has_emissions=has_emissions,
+        min_gauge_staked_pct=min_gauge_staked_pct,
+        max_gauge_staked_pct=max_gauge_staked_pct,
+    )
+    _validate_pool_type(pool_type)
+    sort_key = _get_sort_key(sort_by)
+    if token_symbol_list is not None:
+        token_symbol_list = [s.lower() for s in token_symbol_list]
+        if len(token_symbol_list) not in (1, 2):
             raise ValueError("Only one or two tokens are supported for filtering.")
+    chain_ids = list(dict.fromkeys(chainIds or SUPPORTED_CHAIN_IDS))
 
-    if pool_type not in ["v2", "v3", "all"]:
-        raise ValueError("Unsupported pool_type. Use 'v2', 'v3', or 'all'.")
+    loaded = await asyncio.gather(*[
+        asyncio.to_thread(_load_chain_pools, chain_id, token_symbol_list, pool_type, pool_filter, use_cache)
+        for chain_id in chain_ids
+    ])
+    chains = [status for _, status in loaded]
 
-    if pool_type != "all":
-        pools = [p for p in pools if (pool_type == "v3") == p.is_cl]
-        if not pools:
-            return QuerySugarGetPoolListOutput(result=f"NOT FIND: no {pool_type} pools found on chain {chainId}")
-
-    sort_keys = {
-        "tvl": lambda p: p.tvl if p.tvl is not None else 0.0,
-        "volume": lambda p: _safe_get_amount_in_stable(p.volume),
-        "apr": lambda p: p.apr if p.apr is not None else 0.0,
-    }
-    if sort_by not in sort_keys:
-        raise ValueError("Unsupported sort_by criteria. Use 'tvl', 'volume', or 'apr'.")
-    pools.sort(key=sort_keys[sort_by], reverse=True)
+    # Only offset + limit pools are needed, so keep a bounded heap instead of sorting every match
+    top = heapq.nlargest(offset + limit, itertools.chain.from_iterable(matched for matched, _ in loaded), key=sort_key)
+    top = top[offset:offset + limit]
+    if not top:
+        total = sum(status.matched for status in chains)
+        if total == 0:
+            return QuerySugarGetMultichainPoolListOutput(result=f"NOT FIND: no matching pools on chains {', '.join(chain_ids)}", chains=chains)
+        return QuerySugarGetMultichainPoolListOutput(result=f"NOT FIND: offset {offset} exceeds available pools (total {total})", chains=chains)
+    return QuerySugarGetMultichainPoolListOutput(result=[LiquidityPoolInfo.from_pool(p) for _, p in top], chains=chains)
 
-    total = len(pools)
-    pools = pools[offset:offset + limit]
-    if not pools:
-        return QuerySugarGetPoolListOutput(result=f"NOT FIND: offset {offset} exceeds available pools (total {total})")
-    return QuerySugarGetPoolListOutput(result=[LiquidityPoolInfo.from_pool(p) for p in pools])
+
+async def query_sugar_get_pool_history(
+    lp: str,
+    chainId: str = "8453",
+    limit: int = 24,
+) -> QuerySugarGetPoolHistoryOutput:
+    """Retrieve a pool's recent TVL, APR and volume history, recorded at each pool cache refresh.
+
+    History is kept in memory for the last SUGAR_CACHE_HISTORY_DEPTH refreshes and starts empty
+    when the server starts. Requires the pool cache, so it is not available when the stdio cache is disabled.
+
+    Args:
+        lp: The pool address
+        chainId: The chain ID to use ('10' for OPChain, '8453' for BaseChain, '130' for Unichain, '1135' for List)
+        limit: The maximum number of most recent points to return
+
+    Returns:
+        QuerySugarGetPoolHistoryOutput: result is the list of PoolHistoryPointInfo, oldest first, or "NOT FIND"
+            when no history is recorded for the pool. change_since_previous and change_over_window hold
+            the deltas between the last two points and across the returned points
+    """
+    validate_cache_parameter(True, "query_sugar_get_pool_history")
+    if limit <= 0:
+        return QuerySugarGetPoolHistoryOutput(result="NOT FIND: limit must be positive")
+
+    points = _get_pool_history(chainId, lp, limit)
+    if not points:
+        return QuerySugarGetPoolHistoryOutput(result=f"NOT FIND: no history for pool {lp} on chain {chainId}")
+
+    output = QuerySugarGetPoolHistoryOutput(result=[PoolHistoryPointInfo.from_point(p) for p in points])
+    if len(points) >= 2:
+        output.change_since_previous = PoolHistoryDeltaInfo.between(points[-2], points[-1])
+        output.change_over_window = PoolHistoryDeltaInfo.between(points[0], points[-1])
+    return output
+
+
+async def query_sugar_get_pool_changes(
+    chainId: str = "8453",
+    metric: str = "tvl",
+    limit: int = 10,
+) -> QuerySugarGetPoolChangesOutput:
+    """Retrieve what changed between the two most recent pool cache refreshes: new pools, removed pools
+    and the pools with the largest TVL, APR or volume changes.
+
+    The diff is computed when the cache refreshes, so this is a single lookup. Use it to monitor a
+    market instead of re-reading and comparing full pool lists. Not available when the stdio cache is disabled.
+
+    Args:
+        chainId: The chain ID to use ('10' for OPChain, '8453' for BaseChain, '130' for Unichain, '1135' for List)
+        metric: Metric to rank movers by: 'tvl', 'apr' or 'volume'
+        limit: The maximum number of movers to return (at most SUGAR_CACHE_DIFF_TOP_N)
+
+    Returns:
+        QuerySugarGetPoolChangesOutput: result is PoolChangesInfo, or "NOT FIND" when the chain is not cached
+            or has not refreshed since the server started
+    """
+    validate_cache_parameter(True, "query_sugar_get_pool_changes")
+    if metric not in DIFF_METRICS:
+        raise ValueError(f"Unsupported metric. Use {', '.join(repr(m) for m in DIFF_METRICS)}.")
+    if limit <= 0:
+        return QuerySugarGetPoolChangesOutput(result="NOT FIND: limit must be positive")
+
+    # Refreshes the snapshot if it is due, which also computes its diff
+    _get_cached_pools(chainId)
+    snapshot = _get_cached_snapshot(chainId)
+    if snapshot is None:
+        return QuerySugarGetPoolChangesOutput(result=f"NOT FIND: chain {chainId} is not cached")
+    if snapshot.diff is None:
+        return QuerySugarGetPoolChangesOutput(result=f"NOT FIND: no previous snapshot to compare with on chain {chainId}")
+    return QuerySugarGetPoolChangesOutput(result=PoolChangesInfo.from_diff(snapshot.diff, metric, limit))
 
 
 async def query_sugar_get_latest_pool_epochs(
     offset: int,
     limit: int = 10,
     chainId: str = "8453",
-) -> list | str:
+    dedupe_pools: bool = False,
+) -> list | str | QuerySugarGetPoolEpochsOutput:
     """Retrieve the latest epoch data for all pools.
 
     Args:
         limit: The maximum number of epochs to retrieve
         offset: The starting point for pagination
         chainId: The chain ID to use ('10' for OPChain, '8453' for BaseChain, '130' for Unichain, '1135' for List)
+        dedupe_pools: If True, epochs reference pools by address and each distinct pool is returned once
 
     Returns:
-        List[LiquidityPoolEpochInfo] | str: A list of epochs or "Not Find"
+        List[LiquidityPoolEpochInfo] | QuerySugarGetPoolEpochsOutput | str: A list of epochs, the deduplicated output, or "Not Find"
     """
-    with get_chain(chainId) as chain:
-        epochs = chain.get_latest_pool_epochs_page(limit, offset)
-        result = []
-        for p in epochs:
-            if p is None:
-                continue
-            try:
-                result.append(LiquidityPoolEpochInfo.from_epoch(p))
-            except Exception as e:
-                print(f"Skipping epoch with invalid pool data: {type(e).__name__}: {e}")
-        if not result:
-            return "Not Find"
-        return result
+    def fetch_page(page_limit: int, page_offset: int) -> list:
+        with get_chain(chainId) as chain:
+            return chain.get_latest_pool_epochs_page(page_limit, page_offset)
+
+    epochs = await asyncio.to_thread(
+        get_read_ahead_buffer().get_page, "query_sugar_get_latest_pool_epochs", chainId, limit, offset, fetch_page
+    )
+    return _convert_epochs(epochs, chainId, dedupe_pools)
 
 
 async def query_sugar_get_pool_epochs(
@@ -227,7 +583,8 @@ async def query_sugar_get_pool_epochs(
     offset: int = 0,
     limit: int = 10,
     chainId: str = "8453",
-) -> list | str:
+    dedupe_pools: bool = False,
+) -> list | str | QuerySugarGetPoolEpochsOutput:
     """Retrieve historical epoch data for a given liquidity pool.
 
     Args:
@@ -235,22 +592,13 @@ async def query_sugar_get_pool_epochs(
         offset: Offset for pagination
         limit: Number of epochs to retrieve
         chainId: The chain ID to use ('10' for OPChain, '8453' for BaseChain, '130' for Unichain, '1135' for List)
+        dedupe_pools: If True, epochs reference the pool by address and the pool is returned once
 
     Returns:
-        List[LiquidityPoolEpochInfo] | str: A list of epoch entries or "Not Find"
+        List[LiquidityPoolEpochInfo] | QuerySugarGetPoolEpochsOutput | str: A list of epoch entries, the deduplicated output, or "Not Find"
     """
     lp = Web3.to_checksum_address(lp)
     with get_chain(chainId) as chain:
         epochs = chain.get_pool_epochs_page(lp, offset, limit)
-        result = []
-        for p in epochs:
-            if p is None:
-                continue
-            try:
-                result.append(LiquidityPoolEpochInfo.from_epoch(p))
-            except Exception as e:
-                print(f"Skipping epoch with invalid pool data: {type(e).__name__}: {e}")
-        if not result:
-            return "Not Find"
-        return result
+        return _convert_epochs(epochs, chainId, dedupe_pools)
     
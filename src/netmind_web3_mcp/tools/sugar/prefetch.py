@@ -0,0 +1,131 @@
+"""Read-ahead buffer for paginated Sugar tools."""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .config import get_config
+
+# (tool, chain_id, limit, offset)
+PageKey = Tuple[str, str, int, int]
+
+
+class ReadAheadBuffer:
+    """Thread-safe per-chain read-ahead buffer for sequential page scans.
+
+    When page k of a tool is served, page k+1 is fetched in the background and kept
+    for a short time, so agents paging with offset += limit hit a warm page.
+    """
+
+    def __init__(self, ttl_seconds: float = 30, max_pages_per_chain: int = 8, max_workers: int = 2, enabled: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.max_pages_per_chain = max_pages_per_chain
+        self.max_workers = max_workers
+        self.enabled = enabled
+
+        # chain_id -> {page key -> (scheduled_at, future)}, oldest first
+        self.pages: Dict[str, "OrderedDict[PageKey, Tuple[float, Future]]"] = {}
+        self.lock = threading.Lock()
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def get_page(
+        self,
+        tool: str,
+        chain_id: str,
+        limit: int,
+        offset: int,
+        fetch: Callable[[int, int], Any],
+        has_more: Callable[[Any], bool] = bool,
+    ) -> Any:
+        """Serve a page from the buffer or fetch it, then read ahead the next page.
+
+        Args:
+            tool: Tool name, part of the page key
+            chain_id: The chain ID
+            limit: Page size
+            offset: Page offset
+            fetch: Callable taking (limit, offset) and returning the raw page
+            has_more: Returns False for a page that ends the scan. Defaults to a non-empty check
+
+        Returns:
+            The page returned by fetch
+        """
+        result = None
+        future = self._pop((tool, chain_id, limit, offset))
+        if future is not None:
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Read-ahead fetch failed for {tool} on chain {chain_id} (offset {offset}), fetching directly: {type(e).__name__}: {e}", file=sys.stderr)
+
+        if result is None:
+            result = fetch(limit, offset)
+
+        # A page that ends the scan has nothing to read ahead
+        if self.enabled and limit > 0 and has_more(result):
+            next_offset = offset + limit
+            self._schedule((tool, chain_id, limit, next_offset), lambda: fetch(limit, next_offset))
+
+        return result
+
+    def _pop(self, key: PageKey) -> Optional[Future]:
+        """Remove and return the buffered future for a page if it has not expired."""
+        with self.lock:
+            chain_pages = self.pages.get(key[1])
+            if not chain_pages:
+                return None
+            self._expire(chain_pages)
+            entry = chain_pages.pop(key, None)
+        return entry[1] if entry is not None else None
+
+    def _schedule(self, key: PageKey, fetch: Callable[[], Any]) -> None:
+        """Start a background fetch for a page unless one is already buffered."""
+        with self.lock:
+            chain_pages = self.pages.setdefault(key[1], OrderedDict())
+            self._expire(chain_pages)
+            if key in chain_pages:
+                return
+
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sugar-read-ahead")
+            chain_pages[key] = (time.monotonic(), self.executor.submit(fetch))
+
+            while len(chain_pages) > self.max_pages_per_chain:
+                _, (_, evicted) = chain_pages.popitem(last=False)
+                evicted.cancel()
+
+    def _expire(self, chain_pages: "OrderedDict[PageKey, Tuple[float, Future]]") -> None:
+        """Drop expired pages. Caller must hold self.lock."""
+        now = time.monotonic()
+        expired = [key for key, (scheduled_at, _) in chain_pages.items() if now - scheduled_at >= self.ttl_seconds]
+        for key in expired:
+            _, future = chain_pages.pop(key)
+            future.cancel()
+
+    def clear(self) -> None:
+        """Drop all buffered pages."""
+        with self.lock:
+            for chain_pages in self.pages.values():
+                for _, future in chain_pages.values():
+                    future.cancel()
+            self.pages.clear()
+
+
+_read_ahead: Optional[ReadAheadBuffer] = None
+_read_ahead_lock = threading.Lock()
+
+
+def get_read_ahead_buffer() -> ReadAheadBuffer:
+    global _read_ahead
+    with _read_ahead_lock:
+        if _read_ahead is None:
+            config = get_config()
+            _read_ahead = ReadAheadBuffer(
+                ttl_seconds=config.prefetch_ttl_seconds,
+                max_workers=config.prefetch_max_workers,
+                enabled=config.prefetch_enabled,
+            )
+        return _read_ahead
@@ -1,11 +1,12 @@
 """Sugar MCP quote-related tools."""
 
+import sys
 from typing import Optional
-from netmind_sugar.chains import get_chain
 from .models import QuoteInfo
 from .cache import _get_cached_pools
 from .pools import _convert_pools_to_swap_format
 from .config import validate_cache_parameter
+from .rpc import get_chain
 
 
 async def query_sugar_get_quote(
@@ -25,7 +26,7 @@ async def query_sugar_get_quote(
         to_token: The token to swap to. Same options as from_token
         amount: The amount to swap (unit is wei)
         chainId: The chain ID to use ('10' for OPChain, '8453' for BaseChain, '130' for Unichain, '1135' for List)
-        use_cache: Whether to use cached pool addresses. Defaults to True. Not available in stdio mode.
+        use_cache: Whether to use cached pool addresses. Defaults to True. Not available when the stdio cache is disabled.
 
     Returns:
         Optional[QuoteInfo]: The best available quote, or None if no valid quote was found
@@ -64,7 +65,7 @@ async def query_sugar_get_quote(
                     finally:
                         chain.get_pools_for_swaps = original_get_pools_for_swaps
                 except Exception as e:
-                    print(f"Warning: Failed to use cached pools, falling back to chain query: {e}")
+                    print(f"Warning: Failed to use cached pools, falling back to chain query: {e}", file=sys.stderr)
         
         quote = chain.get_quote(from_token_obj, to_token_obj, amount)
         return QuoteInfo.from_quote(quote) if quote else None
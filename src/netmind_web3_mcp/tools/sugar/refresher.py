@@ -0,0 +1,175 @@
+"""Asyncio background refresher for the pools cache."""
+
+import asyncio
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+class CacheRefresher:
+    """Refreshes due chains of a PoolsCache from an asyncio task.
+
+    Blocking chain reads run on daemon threads, at most max_workers at a time. Refreshes of the
+    same chain are coalesced: a refresh requested while one is in flight awaits the in-flight one.
+    Cancelling a refresh stops waiting for it and keeps it from publishing its snapshot; its
+    worker thread sends no further RPC requests and, being a daemon, never holds up exit.
+    """
+
+    def __init__(self, cache, max_workers: int = 4, shutdown_grace_seconds: float = 10.0):
+        self.cache = cache
+        self.shutdown_grace_seconds = shutdown_grace_seconds
+        self.workers = asyncio.Semaphore(max_workers)
+        self.task: Optional[asyncio.Task] = None
+        self.inflight: Dict[str, asyncio.Task] = {}
+        # Set when running on a dedicated event loop thread rather than the caller's loop
+        self.thread: Optional[threading.Thread] = None
+        self.thread_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def running(self) -> bool:
+        return self.task is not None and not self.task.done()
+
+    async def start(self) -> None:
+        """Start the periodic refresh task on the running event loop."""
+        if not self.running:
+            self.task = asyncio.get_running_loop().create_task(self._run(), name="sugar-cache-refresher")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.cache.get_poll_interval())
+            try:
+                updated_count = await self.refresh_due()
+                if updated_count > 0:
+                    print(f"🔄 Cache updated: {updated_count} entries refreshed", file=sys.stderr)
+            except Exception as e:
+                print(f"❌ Cache update error: {type(e).__name__}: {str(e)}", file=sys.stderr)
+
+    async def refresh_due(self) -> int:
+        """Refresh every cached chain that is due, concurrently.
+
+        Returns:
+            int: Number of chains that were refreshed
+        """
+        due = []
+        for chain_id, snapshot in self.cache.get_refresh_candidates():
+            # Block mode polls the chain head here, so the check runs off the loop
+            if await self._run_in_thread(self.cache.needs_refresh, chain_id, snapshot):
+                due.append((chain_id, snapshot))
+
+        results = await asyncio.gather(*(self._refresh(chain_id, snapshot) for chain_id, snapshot in due), return_exceptions=True)
+        updated_count = 0
+        for (chain_id, _), result in zip(due, results):
+            if isinstance(result, BaseException):
+                print(f"Error updating cache for chain {chain_id}: {type(result).__name__}: {str(result)}", file=sys.stderr)
+            elif result:
+                updated_count += 1
+        return updated_count
+
+    async def refresh_now(self, chain_id: str) -> bool:
+        """Refresh a chain immediately, or wait for its in-flight refresh.
+
+        Returns:
+            bool: Whether a refresh ran and was not cancelled
+        """
+        return await self._refresh(chain_id, None)
+
+    def cancel(self, chain_id: str) -> bool:
+        """Cancel a chain's in-flight refresh. Returns whether one was in flight."""
+        task = self.inflight.get(chain_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    async def _refresh(self, chain_id: str, expected) -> bool:
+        task = self.inflight.get(chain_id)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._run_refresh(chain_id, expected))
+            self.inflight[chain_id] = task
+            task.add_done_callback(lambda t: self.inflight.pop(chain_id, None) if self.inflight.get(chain_id) is t else None)
+        # A cancelled waiter must not cancel the refresh other waiters share
+        return await asyncio.shield(task)
+
+    async def _run_refresh(self, chain_id: str, expected) -> bool:
+        cancel = threading.Event()
+        try:
+            return await self._run_in_thread(self.cache.refresh_chain, chain_id, expected, cancel)
+        except asyncio.CancelledError:
+            cancel.set()
+            print(f"Cache refresh for chain {chain_id} cancelled", file=sys.stderr)
+            return False
+
+    async def _run_in_thread(self, fn: Callable[..., Any], *args) -> Any:
+        """Run a blocking call on a new daemon thread once a worker slot is free.
+
+        A cancelled caller frees its slot right away; the thread finishes on its own and its
+        result is dropped.
+        """
+        async with self.workers:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+
+            def resolve(result: Any, error: Optional[BaseException]) -> None:
+                if future.done():
+                    return
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+            def target() -> None:
+                result, error = None, None
+                try:
+                    result = fn(*args)
+                except BaseException as e:
+                    error = e
+                try:
+                    loop.call_soon_threadsafe(resolve, result, error)
+                except RuntimeError:
+                    # The event loop closed after the call was abandoned
+                    pass
+
+            threading.Thread(target=target, name="sugar-refresh", daemon=True).start()
+            return await future
+
+    async def stop(self, grace_seconds: Optional[float] = None) -> None:
+        """Stop scheduling refreshes and shut down.
+
+        In-flight refreshes get grace_seconds to finish and publish their snapshots; the rest
+        are cancelled without publishing and their threads abandoned.
+        """
+        grace_seconds = self.shutdown_grace_seconds if grace_seconds is None else grace_seconds
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+        pending: List[asyncio.Task] = list(self.inflight.values())
+        if pending:
+            print(f"Waiting up to {grace_seconds}s for {len(pending)} in-flight cache refreshes", file=sys.stderr)
+            _, not_done = await asyncio.wait(pending, timeout=grace_seconds)
+            for task in not_done:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            if not_done:
+                print(f"Cancelled {len(not_done)} cache refreshes that did not finish in time", file=sys.stderr)
+        print("🛑 Cache refresher stopped", file=sys.stderr)
+
+    def start_in_thread(self) -> None:
+        """Run the refresher on a dedicated event loop thread, for callers without a running loop."""
+        loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=loop.run_forever, name="sugar-cache-refresher", daemon=True)
+        self.thread.start()
+        self.thread_loop = loop
+        asyncio.run_coroutine_threadsafe(self.start(), loop).result()
+
+    def stop_in_thread(self) -> None:
+        """Stop a refresher started with start_in_thread and its event loop thread."""
+        loop, thread = self.thread_loop, self.thread
+        if loop is None or thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        self.thread_loop = self.thread = None
@@ -0,0 +1,462 @@
+"""RPC transport for Sugar chains.
+
+Concurrent eth_calls issued within a short window are coalesced into one JSON-RPC
+batch request and the responses are demultiplexed back to each caller. Chains with
+several RPC endpoints get latency-aware endpoint selection, failover and optional
+hedged reads.
+"""
+
+import itertools
+import json
+import math
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import httpx
+from netmind_sugar.chains import get_chain as _get_sugar_chain, Chain
+from web3 import HTTPProvider
+from web3._utils.caching import handle_request_caching
+from web3._utils.empty import Empty
+from web3._utils.encoding import FriendlyJsonSerde, Web3JsonEncoder
+from web3.providers.rpc.utils import ExceptionRetryConfiguration, check_if_retry_on_failure
+
+# Read-only methods that are safe to coalesce into batches. web3's validation
+# middleware looks up eth_chainId alongside calls, so it is coalesced too.
+COALESCED_METHODS = {"eth_call", "eth_chainId"}
+
+# Read-only methods that may be resent to another endpoint, on failover or as a hedge. Anything
+# else may change state, and a request that failed in transit may still have been applied.
+READ_ONLY_METHODS = {
+    "eth_call", "eth_chainId", "net_version", "eth_blockNumber", "eth_getBalance", "eth_getCode",
+    "eth_getLogs", "eth_getBlockByNumber", "eth_getBlockByHash", "eth_getTransactionByHash",
+    "eth_getTransactionReceipt", "eth_getTransactionCount", "eth_estimateGas", "eth_gasPrice",
+    "eth_maxPriorityFeePerGas", "eth_feeHistory",
+}
+
+
+class RequestCancelled(Exception):
+    """Raised instead of sending an RPC request once the chain context's cancel event is set."""
+
+
+class RpcTransport:
+    """Sends JSON-RPC payloads to one endpoint over a shared keep-alive HTTP client."""
+
+    def __init__(self, endpoint_uri: str, timeout: float = 30.0):
+        self.endpoint_uri = endpoint_uri
+        self.client = httpx.Client(timeout=timeout, headers={"Content-Type": "application/json"})
+
+    def post(self, payload: Any) -> Any:
+        """POST a JSON-RPC request or batch and return the decoded response."""
+        content = FriendlyJsonSerde().json_encode(payload, Web3JsonEncoder)
+        response = self.client.post(self.endpoint_uri, content=content)
+        response.raise_for_status()
+        return json.loads(response.content)
+
+    def close(self):
+        self.client.close()
+
+
+class _EndpointState:
+    """Latency and health statistics for one endpoint of an RpcEndpointPool."""
+
+    def __init__(self, transport: RpcTransport, latency_window: int = 100):
+        self.transport = transport
+        self.latency_ewma: Optional[float] = None
+        self.latencies: deque = deque(maxlen=latency_window)
+        self.failures = 0
+        self.cooldown_until = 0.0
+
+    def p95_latency(self) -> Optional[float]:
+        """95th percentile of recent latencies, or None until enough samples exist."""
+        if len(self.latencies) < 20:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+class RpcEndpointPool:
+    """Spreads JSON-RPC payloads over several endpoints of one chain.
+
+    Requests go to the healthy endpoint with the lowest observed latency. Endpoints that
+    fail are put in an exponential cooldown and read-only requests fail over to the next one.
+    With hedging enabled, a read that has not completed after the primary's p95 latency
+    is also sent to the next endpoint and the first successful response wins. Hedged requests
+    run on at most hedge_max_workers threads; a losing request keeps its worker until it
+    completes, so when none is free a request is sent without waiting for one.
+    """
+
+    def __init__(
+        self,
+        endpoint_uris: List[str],
+        timeout: float = 30.0,
+        hedge_enabled: bool = False,
+        hedge_min_delay_seconds: float = 0.1,
+        hedge_max_workers: int = 8,
+        cooldown_seconds: float = 5.0,
+        max_cooldown_seconds: float = 60.0,
+    ):
+        if not endpoint_uris:
+            raise ValueError("endpoint_uris cannot be an empty list")
+        self.endpoint_uri = endpoint_uris[0]
+        self.endpoints = [_EndpointState(RpcTransport(uri, timeout=timeout)) for uri in endpoint_uris]
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_delay_seconds = hedge_min_delay_seconds
+        self.hedge_max_workers = hedge_max_workers
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+
+        self.lock = threading.Lock()
+        self.hedge_executor: Optional[ThreadPoolExecutor] = None
+        self.hedge_slots = threading.BoundedSemaphore(hedge_max_workers)
+
+    def post(self, payload: Any) -> Any:
+        """POST a JSON-RPC request or batch, failing over between endpoints if it is read-only."""
+        candidates = self._rank_endpoints()
+        if not self._is_read_only(payload):
+            return self._post_to(candidates[0], payload)
+        last_error: Optional[BaseException] = None
+
+        if self.hedge_enabled and len(candidates) > 1:
+            try:
+                return self._post_hedged(payload, candidates[0], candidates[1])
+            except Exception as e:
+                last_error = e
+                candidates = candidates[2:]
+
+        for endpoint in candidates:
+            try:
+                return self._post_to(endpoint, payload)
+            except Exception as e:
+                last_error = e
+                print(f"RPC endpoint {endpoint.transport.endpoint_uri} failed, failing over: {type(e).__name__}: {e}", file=sys.stderr)
+
+        raise last_error
+
+    def _post_to(self, endpoint: _EndpointState, payload: Any) -> Any:
+        """POST to one endpoint and record its latency or failure."""
+        start = time.monotonic()
+        try:
+            response = endpoint.transport.post(payload)
+        except Exception:
+            self._record_failure(endpoint)
+            raise
+        self._record_success(endpoint, time.monotonic() - start)
+        return response
+
+    def _submit_hedged(self, endpoint: _EndpointState, payload: Any) -> Optional[Future]:
+        """Run a request on a hedge worker, or return None if every worker is busy."""
+        if not self.hedge_slots.acquire(blocking=False):
+            return None
+        with self.lock:
+            if self.hedge_executor is None:
+                self.hedge_executor = ThreadPoolExecutor(max_workers=self.hedge_max_workers, thread_name_prefix="sugar-rpc-hedge")
+        future = self.hedge_executor.submit(self._post_to, endpoint, payload)
+        future.add_done_callback(lambda _: self.hedge_slots.release())
+        return future
+
+    def _post_hedged(self, payload: Any, primary: _EndpointState, secondary: _EndpointState) -> Any:
+        """Send to primary, and to secondary too if primary is slower than its p95."""
+        with self.lock:
+            delay = max(self.hedge_min_delay_seconds, primary.p95_latency() or 0.0)
+
+        first = self._submit_hedged(primary, payload)
+        if first is None:
+            # Every worker is held by slow earlier requests: send unhedged rather than queue
+            return self._post_to(primary, payload)
+        done, _ = wait({first}, timeout=delay)
+        if done and first.exception() is None:
+            return first.result()
+
+        hedge = self._submit_hedged(secondary, payload)
+        if hedge is None:
+            # No worker is free for the hedge, so this thread sends it
+            try:
+                return self._post_to(secondary, payload)
+            except Exception:
+                return first.result()
+
+        futures = {first, hedge}
+        last_error: Optional[BaseException] = None
+        while futures:
+            done, futures = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                last_error = future.exception()
+        raise last_error
+
+    def _rank_endpoints(self) -> List[_EndpointState]:
+        """Order endpoints: healthy ones by latency (untried first), then cooling down ones by expiry."""
+        now = time.monotonic()
+        with self.lock:
+            healthy = [e for e in self.endpoints if e.cooldown_until <= now]
+            cooling = [e for e in self.endpoints if e.cooldown_until > now]
+        healthy.sort(key=lambda e: e.latency_ewma if e.latency_ewma is not None else 0.0)
+        cooling.sort(key=lambda e: e.cooldown_until)
+        return healthy + cooling
+
+    def _record_success(self, endpoint: _EndpointState, latency: float) -> None:
+        with self.lock:
+            endpoint.latencies.append(latency)
+            if endpoint.latency_ewma is None:
+                endpoint.latency_ewma = latency
+            else:
+                endpoint.latency_ewma = 0.8 * endpoint.latency_ewma + 0.2 * latency
+            endpoint.failures = 0
+            endpoint.cooldown_until = 0.0
+
+    def _record_failure(self, endpoint: _EndpointState) -> None:
+        with self.lock:
+            endpoint.failures += 1
+            cooldown = min(self.cooldown_seconds * 2 ** (endpoint.failures - 1), self.max_cooldown_seconds)
+            endpoint.cooldown_until = time.monotonic() + cooldown
+
+    @staticmethod
+    def _is_read_only(payload: Any) -> bool:
+        requests = payload if isinstance(payload, list) else [payload]
+        return all(request.get("method") in READ_ONLY_METHODS for request in requests)
+
+    def close(self):
+        for endpoint in self.endpoints:
+            endpoint.transport.close()
+
+
+class _PendingCall:
+    """A single call waiting for its batch to be sent."""
+
+    def __init__(self, method: str, params: Any):
+        self.method = method
+        self.params = params
+        self.done = threading.Event()
+        self.response: Optional[Dict] = None
+        self.error: Optional[BaseException] = None
+
+
+class RpcBatcher:
+    """Coalesces concurrent calls to one transport into JSON-RPC batch requests.
+
+    The first caller of a window becomes the leader: it waits for the window to close
+    (or the batch to fill up), sends everything queued so far and wakes the other callers.
+    """
+
+    def __init__(self, transport: Union[RpcTransport, RpcEndpointPool], window_seconds: float = 0.005, max_batch_size: int = 50):
+        self.transport = transport
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+
+        self.pending: List[_PendingCall] = []
+        self.lock = threading.Lock()
+        self.flush_scheduled = False
+        self.batch_full = threading.Event()
+
+    def call(self, method: str, params: Any) -> Dict:
+        """Queue a call, wait for its batch to be sent and return its JSON-RPC response."""
+        pending_call = _PendingCall(method, params)
+        with self.lock:
+            self.pending.append(pending_call)
+            is_leader = not self.flush_scheduled
+            if is_leader:
+                self.flush_scheduled = True
+                self.batch_full.clear()
+            elif len(self.pending) >= self.max_batch_size:
+                self.batch_full.set()
+
+        if is_leader:
+            self.batch_full.wait(self.window_seconds)
+            with self.lock:
+                batch, self.pending = self.pending, []
+                self.flush_scheduled = False
+            for start in range(0, len(batch), self.max_batch_size):
+                self._send(batch[start:start + self.max_batch_size])
+
+        pending_call.done.wait()
+        if pending_call.error is not None:
+            raise pending_call.error
+        return pending_call.response
+
+    def _send(self, batch: List[_PendingCall]) -> None:
+        """Send one batch and hand each response back to its caller."""
+        try:
+            if len(batch) == 1:
+                call = batch[0]
+                responses = [self.transport.post({"jsonrpc": "2.0", "method": call.method, "params": call.params or [], "id": 0})]
+            else:
+                payload = [
+                    {"jsonrpc": "2.0", "method": call.method, "params": call.params or [], "id": request_id}
+                    for request_id, call in enumerate(batch)
+                ]
+                responses = self.transport.post(payload)
+
+            if not isinstance(responses, list):
+                # RPC errors for the whole batch come back as a single response
+                for call in batch:
+                    call.response = responses
+                return
+
+            responses_by_id = {response.get("id"): response for response in responses if isinstance(response, dict)}
+            for request_id, call in enumerate(batch):
+                response = responses_by_id.get(request_id)
+                if response is None:
+                    call.error = ValueError(f"Missing response for batched {call.method} (id {request_id})")
+                else:
+                    call.response = response
+        except Exception as e:
+            for call in batch:
+                call.error = e
+        finally:
+            for call in batch:
+                call.done.set()
+
+
+class BatchingHTTPProvider(HTTPProvider):
+    """web3 HTTP provider that coalesces eth_calls through a shared RpcBatcher.
+
+    Requests keep HTTPProvider's behavior: methods on the retry allowlist are retried with
+    exponential backoff on the errors of exception_retry_configuration, and request caching
+    applies when cache_allowed_requests is set. Requests are sent with httpx, so the default
+    retry errors are httpx's transport and HTTP status errors. Once cancel is set, every
+    further request raises RequestCancelled without being sent, so a long multi-request read
+    stops at its next page.
+    """
+
+    def __init__(self, transport: Union[RpcTransport, RpcEndpointPool], batcher: Optional[RpcBatcher] = None, cancel: Optional[threading.Event] = None, **kwargs):
+        super().__init__(endpoint_uri=transport.endpoint_uri, **kwargs)
+        self.transport = transport
+        self.batcher = batcher
+        self.cancel = cancel
+        self.request_ids = itertools.count()
+
+    def _check_cancelled(self) -> None:
+        if self.cancel is not None and self.cancel.is_set():
+            raise RequestCancelled("RPC request cancelled")
+
+    @property
+    def exception_retry_configuration(self) -> Optional[ExceptionRetryConfiguration]:
+        if isinstance(self._exception_retry_configuration, Empty):
+            self._exception_retry_configuration = ExceptionRetryConfiguration(errors=(httpx.TransportError, httpx.HTTPStatusError))
+        return self._exception_retry_configuration
+
+    @exception_retry_configuration.setter
+    def exception_retry_configuration(self, value: Union[ExceptionRetryConfiguration, Empty, None]) -> None:
+        self._exception_retry_configuration = value
+
+    @handle_request_caching
+    def make_request(self, method, params):
+        retry = self.exception_retry_configuration
+        if retry is None or not check_if_retry_on_failure(method, retry.method_allowlist):
+            return self._send(method, params)
+        for attempt in range(retry.retries):
+            try:
+                return self._send(method, params)
+            except tuple(retry.errors):
+                if attempt == retry.retries - 1:
+                    raise
+                time.sleep(retry.backoff_factor * 2 ** attempt)
+
+    def _send(self, method, params):
+        self._check_cancelled()
+        if self.batcher is not None and method in COALESCED_METHODS:
+            return self.batcher.call(method, params)
+        return self.transport.post({"jsonrpc": "2.0", "method": method, "params": params or [], "id": next(self.request_ids)})
+
+    def make_batch_request(self, batch_requests):
+        self._check_cancelled()
+        payload = [
+            {"jsonrpc": "2.0", "method": method, "params": params or [], "id": next(self.request_ids)}
+            for method, params in batch_requests
+        ]
+        response = self.transport.post(payload)
+        if not isinstance(response, list):
+            # RPC errors return only one response with the error object
+            return response
+        return sorted(response, key=lambda r: r.get("id") if isinstance(r.get("id"), int) else -1)
+
+
+# One endpoint pool and batcher per endpoint list, shared by every chain context
+_transports: Dict[Tuple[str, ...], Tuple[RpcEndpointPool, Optional[RpcBatcher]]] = {}
+_transports_lock = threading.Lock()
+
+
+def _get_transport(endpoint_uris: List[str]) -> Tuple[RpcEndpointPool, Optional[RpcBatcher]]:
+    """Get or create the shared endpoint pool and batcher for a list of endpoints."""
+    # Import here to avoid circular dependency
+    from .config import get_config
+
+    key = tuple(endpoint_uris)
+    with _transports_lock:
+        if key not in _transports:
+            config = get_config()
+            pool = RpcEndpointPool(
+                endpoint_uris,
+                timeout=config.rpc_timeout,
+                hedge_enabled=config.rpc_hedge_enabled,
+                hedge_min_delay_seconds=config.rpc_hedge_min_delay_ms / 1000,
+                hedge_max_workers=config.rpc_hedge_max_workers,
+            )
+            batcher = None
+            if config.rpc_batch_enabled:
+                batcher = RpcBatcher(
+                    pool,
+                    window_seconds=config.rpc_batch_window_ms / 1000,
+                    max_batch_size=config.rpc_batch_max_size,
+                )
+            _transports[key] = (pool, batcher)
+        return _transports[key]
+
+
+class _ChainContext:
+    """Context manager that enters a Sugar chain and installs the shared transport on it."""
+
+    def __init__(self, chain: Chain, endpoint_uris: Optional[List[str]] = None, cancel: Optional[threading.Event] = None):
+        self.chain = chain
+        self.endpoint_uris = endpoint_uris
+        self.cancel = cancel
+
+    def __enter__(self) -> Chain:
+        # Import here to avoid circular dependency
+        from .config import get_config
+
+        chain = self.chain.__enter__()
+        endpoint_uris = self.endpoint_uris or get_config().get_rpc_endpoints(chain.chain_id) or [chain.settings.rpc_uri]
+        transport, batcher = _get_transport(endpoint_uris)
+        # Chain.__enter__ builds web3 and its contracts around a fresh HTTPProvider, so the chain
+        # cannot be created with the batching provider. Contracts reach the provider through web3
+        # at call time, so swapping it here reroutes them; the original provider's retry and
+        # request caching settings are carried over rather than reset to defaults.
+        original = chain.web3.provider
+        chain.web3.provider = BatchingHTTPProvider(
+            transport,
+            batcher,
+            cancel=self.cancel,
+            exception_retry_configuration=original._exception_retry_configuration,
+            cache_allowed_requests=original.cache_allowed_requests,
+            cacheable_requests=original.cacheable_requests,
+            request_cache_validation_threshold=original.request_cache_validation_threshold,
+        )
+        return chain
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self.chain.__exit__(exc_type, exc_val, exc_tb)
+
+
+def get_chain(chain_id: str, cancel: Optional[threading.Event] = None, **kwargs) -> _ChainContext:
+    """Get a Sugar chain whose RPC traffic goes through the shared transport.
+
+    Use as a context manager, like netmind_sugar.chains.get_chain. Endpoints come from
+    SUGAR_RPC_URIS_<chain_id> when set; an explicit rpc_uri keyword takes precedence.
+    Once cancel is set, the chain's RPC requests raise RequestCancelled instead of being sent.
+    """
+    endpoint_uris = [kwargs["rpc_uri"]] if kwargs.get("rpc_uri") else None
+    return _ChainContext(_get_sugar_chain(chain_id, **kwargs), endpoint_uris, cancel)
+
+
+def close_transports():
+    """Close all shared RPC endpoint pools."""
+    with _transports_lock:
+        for transport, _ in _transports.values():
+            transport.close()
+        _transports.clear()
@@ -0,0 +1,68 @@
+"""Per-token aggregate statistics over a pools snapshot."""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from netmind_sugar.chains import LiquidityPool, Price
+
+from .metrics import PoolMetrics
+
+
+@dataclass
+class TokenStats:
+    """Aggregates over all pools containing a token."""
+    token_address: str
+    symbol: str
+    pool_count: int = 0
+    # Summed TVL of every pool containing the token (both sides of each pool)
+    total_tvl: float = 0.0
+    # Summed value of this token's own reserves across those pools
+    token_liquidity: float = 0.0
+    total_volume: float = 0.0
+    max_apr: float = 0.0
+    max_apr_pool: Optional[str] = None
+    top_pool: Optional[str] = None
+    top_pool_symbol: Optional[str] = None
+    top_pool_tvl: float = 0.0
+    # Token price taken from the deepest pool with a usable price for the token
+    price: Optional[Price] = None
+    price_pool: Optional[str] = None
+    price_pool_tvl: float = 0.0
+
+
+def _reserve_price(amount) -> Optional[Price]:
+    price = getattr(amount, "price", None) if amount is not None else None
+    value = getattr(price, "price", None)
+    return price if isinstance(value, (int, float)) and value > 0 else None
+
+
+def _reserve_in_stable(amount) -> float:
+    value = getattr(amount, "amount_in_stable", None) if amount is not None else None
+    return float(value) if isinstance(value, (int, float)) else 0.0
+
+
+def compute_token_stats(pools: List[LiquidityPool], metrics: List[PoolMetrics]) -> Dict[str, TokenStats]:
+    """Compute per-token aggregates in one pass over pools and their aligned metrics.
+
+    Returns:
+        Dict[str, TokenStats]: Stats keyed by lowercase token address
+    """
+    stats: Dict[str, TokenStats] = {}
+    for pool, m in zip(pools, metrics):
+        for token, reserve in ((pool.token0, pool.reserve0), (pool.token1, pool.reserve1)):
+            key = token.token_address.lower()
+            s = stats.get(key)
+            if s is None:
+                s = stats[key] = TokenStats(token_address=token.token_address, symbol=token.symbol)
+            s.pool_count += 1
+            s.total_tvl += m.tvl
+            s.token_liquidity += _reserve_in_stable(reserve)
+            s.total_volume += m.volume
+            if s.max_apr_pool is None or m.apr > s.max_apr:
+                s.max_apr, s.max_apr_pool = m.apr, pool.lp
+            if s.top_pool is None or m.tvl > s.top_pool_tvl:
+                s.top_pool, s.top_pool_symbol, s.top_pool_tvl = pool.lp, pool.symbol, m.tvl
+            price = _reserve_price(reserve)
+            if price is not None and (s.price is None or m.tvl > s.price_pool_tvl):
+                s.price, s.price_pool, s.price_pool_tvl = price, pool.lp, m.tvl
+    return stats
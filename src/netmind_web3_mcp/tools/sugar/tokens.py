@@ -1,8 +1,49 @@
 """Sugar MCP token-related tools."""
 
-from netmind_sugar.chains import get_chain, Token, Price
+import asyncio
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import List, Optional, Union
+from netmind_sugar.chains import Token, Price
 from web3 import Web3
-from .models import TokenInfo, PriceInfo
+from .cache import (
+    _get_cached_pools,
+    _get_cached_snapshot,
+    _get_fresh_snapshot,
+    _get_token_stats_from_cache,
+    _get_pools_from_chain,
+)
+from .config import get_config, is_cache_available, validate_cache_parameter
+from .metrics import get_pool_metrics
+from .models import (
+    TokenInfo,
+    PriceInfo,
+    TokenPriceInfo,
+    PriceChunkError,
+    QuerySugarGetPricesOutput,
+    TokenStatsInfo,
+    QuerySugarGetTokenStatsOutput,
+)
+from .prefetch import get_read_ahead_buffer
+from .rpc import get_chain
+from .stats import compute_token_stats
+
+
+def _fetch_tokens_page(chainId: str, limit: int, offset: int) -> list:
+    """Fetch one page of tokens from chain."""
+    with get_chain(chainId) as chain:
+        tokens = chain.get_tokens_page(limit, offset)
+        tokens = list(
+            map(
+                lambda t: TokenInfo.from_token(
+                    Token.from_tuple(t, chain_id=chain.chain_id, chain_name=chain.name)
+                ),
+                tokens,
+            )
+        )
+        return tokens
 
 
 async def query_sugar_get_all_tokens(
@@ -20,33 +61,64 @@ async def query_sugar_get_all_tokens(
     Returns:
         List[TokenInfo]: A list of Token objects
     """
-    with get_chain(chainId) as chain:
-        tokens = chain.get_tokens_page(limit, offset)
-        tokens = list(
-            map(
-                lambda t: TokenInfo.from_token(
-                    Token.from_tuple(t, chain_id=chain.chain_id, chain_name=chain.name)
-                ),
-                tokens,
-            )
-        )
-        return tokens
+    # A cold page blocks on chain calls, so keep it off the event loop the refresher shares
+    return await asyncio.to_thread(
+        get_read_ahead_buffer().get_page,
+        "query_sugar_get_all_tokens",
+        chainId,
+        limit,
+        offset,
+        lambda page_limit, page_offset: _fetch_tokens_page(chainId, page_limit, page_offset),
+    )
+
+
+def _get_snapshot_token_price(chainId: str, token_address: str) -> Optional[TokenPriceInfo]:
+    """Get a token price from the deepest pool in the fresh cache snapshot, or None on a miss."""
+    snapshot = _get_fresh_snapshot(chainId)
+    if snapshot is None:
+        return None
+    stats = snapshot.token_stats.get(token_address.lower())
+    if stats is None or stats.price is None:
+        return None
+    return TokenPriceInfo(
+        token=TokenInfo.from_token(stats.price.token),
+        price=stats.price.price,
+        source="snapshot",
+        age_seconds=round((datetime.now() - snapshot.last_updated).total_seconds(), 1),
+        pool=stats.price_pool,
+    )
 
 
 async def query_sugar_get_token_prices(
     token_address: str,
     chainId: str = "8453",
+    price_source: str = "snapshot",
 ) -> list:
     """Retrieve prices for a specific token in terms of the stable token.
 
     Args:
         token_address: The address of the token to retrieve prices for
         chainId: The chain ID to use ('10' for OPChain, '8453' for BaseChain, '130' for Unichain, '1135' for List)
+        price_source: 'snapshot' to price the token from the deepest pool in the cached pool snapshot, falling back
+            to RPC when the token is not in a fresh snapshot; 'rpc' for a real-time on-chain price. Defaults to 'snapshot'
 
     Returns:
-        List[PriceInfo]: A list of Price objects with token-price mappings
+        List[TokenPriceInfo]: A list of prices with token-price mappings, each with its source and age
     """
+    if price_source not in ("snapshot", "rpc"):
+        raise ValueError("Unsupported price_source. Use 'snapshot' or 'rpc'.")
     token_address = Web3.to_checksum_address(token_address)
+
+    if price_source == "snapshot" and is_cache_available():
+        price = _get_snapshot_token_price(chainId, token_address)
+        if price is not None:
+            return [price]
+
+    return await asyncio.to_thread(_fetch_token_prices, chainId, token_address)
+
+
+def _fetch_token_prices(chainId: str, token_address: str) -> list:
+    """Fetch a token price over RPC."""
     with get_chain(chainId) as chain:
         append_stable = False
         append_native = False
@@ -69,7 +141,7 @@ async def query_sugar_get_token_prices(
             append_native = True
 
         prices = chain.get_prices(tokens)
-        prices = [PriceInfo.from_price(p) for p in prices]
+        prices = [TokenPriceInfo(**PriceInfo.from_price(p).model_dump(), source="rpc", age_seconds=0.0) for p in prices]
         if append_stable:
             prices = [
                 p
@@ -88,71 +160,185 @@ async def query_sugar_get_token_prices(
         return prices
 
 
+def _fetch_price_chunk(chain, limit: int, offset: int, get_stable_token) -> list:
+    """Fetch prices for one chunk of tokens using an open chain context."""
+    tokens = chain.get_tokens_page(limit, offset)
+    tokens = list(
+        map(
+            lambda t: Token.from_tuple(
+                t, chain_id=chain.chain_id, chain_name=chain.name
+            ),
+            tokens,
+        )
+    )
+
+    append_stable = False
+    append_native = False
+
+    token_address_list = [t.token_address.lower() for t in tokens]
+    if chain.settings.stable_token_addr.lower() not in token_address_list:
+        tokens.append(get_stable_token())
+        append_stable = True
+
+    if chain.settings.native_token_symbol.lower() not in token_address_list:
+        tokens.append(
+            Token.make_native_token(
+                chain.settings.native_token_symbol,
+                chain.settings.wrapped_native_token_addr,
+                chain.settings.native_token_decimals,
+                chain_id=chain.chain_id,
+                chain_name=chain.name,
+            )
+        )
+        append_native = True
+
+    prices = chain.get_prices(tokens)
+    prices = [PriceInfo.from_price(p) for p in prices]
+    if append_stable:
+        prices = [
+            p
+            for p in prices
+            if p.token.token_address.lower()
+            != chain.settings.stable_token_addr.lower()
+        ]
+
+    if append_native:
+        prices = [
+            p
+            for p in prices
+            if p.token.token_address.lower()
+            != chain.settings.native_token_symbol.lower()
+        ]
+
+    return prices
+
+
+def _fetch_prices_page(chainId: str, limit: int, offset: int) -> QuerySugarGetPricesOutput:
+    """Fetch prices for one page of tokens, splitting large pages into chunks fetched concurrently."""
+    config = get_config()
+    chunk_size = max(config.price_chunk_size, 1)
+    chunks = [(offset + start, min(chunk_size, limit - start)) for start in range(0, limit, chunk_size)]
+
+    # Resolving the stable token loads the full token list, so do it at most once per page
+    stable_token = []
+    stable_token_lock = threading.Lock()
+
+    def get_stable_token(chain) -> Token:
+        with stable_token_lock:
+            if not stable_token:
+                stable_token.append(chain.get_token(chain.settings.stable_token_addr))
+            return stable_token[0]
+
+    def fetch_chunk(chunk):
+        chunk_offset, chunk_limit = chunk
+        # A chain's price oracle cache is not thread-safe, so every chunk gets its own chain
+        with get_chain(chainId) as chain:
+            return _fetch_price_chunk(chain, chunk_limit, chunk_offset, lambda: get_stable_token(chain))
+
+    if len(chunks) <= 1:
+        results = [fetch_chunk(chunk) for chunk in chunks]
+        return QuerySugarGetPricesOutput(result=[p for prices in results for p in prices])
+
+    results = [[] for _ in chunks]
+    failed_chunks = []
+    with ThreadPoolExecutor(max_workers=min(config.price_max_workers, len(chunks))) as executor:
+        future_to_index = {executor.submit(fetch_chunk, chunk): i for i, chunk in enumerate(chunks)}
+        for future in as_completed(future_to_index):
+            i = future_to_index[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                chunk_offset, chunk_limit = chunks[i]
+                print(f"Failed to fetch prices for tokens {chunk_offset}-{chunk_offset + chunk_limit} on chain {chainId}: {type(e).__name__}: {e}", file=sys.stderr)
+                failed_chunks.append(PriceChunkError(offset=chunk_offset, limit=chunk_limit, error=f"{type(e).__name__}: {e}"))
+
+    failed_chunks.sort(key=lambda c: c.offset)
+    return QuerySugarGetPricesOutput(result=[p for prices in results for p in prices], failed_chunks=failed_chunks)
+
+
 async def query_sugar_get_prices(
     limit: int,
     offset: int,
     listed_only: bool = False,
     chainId: str = "8453",
-) -> list:
+    with_errors: bool = False,
+) -> Union[List[PriceInfo], QuerySugarGetPricesOutput]:
     """Retrieve prices for a list of tokens in terms of the stable token.
 
+    Large pages are split into chunks fetched concurrently. By default a chunk that fails
+    fails the call; with with_errors=True the prices of the other chunks are still returned
+    along with the token ranges that failed.
+
     Args:
         limit: Maximum number of prices to return
         offset: The starting point to retrieve prices
         listed_only: If True, only return prices for tokens that are marked as 'listed'
         chainId: The chain ID to use ('10' for OPChain, '8453' for BaseChain, '130' for Unichain, '1135' for List)
+        with_errors: If True, return QuerySugarGetPricesOutput with partial results and failed_chunks
 
     Returns:
-        List[PriceInfo]: A list of Price objects with token-price mappings
+        List[PriceInfo]: Prices in token order. With with_errors=True, QuerySugarGetPricesOutput
+            whose result is the list of prices and failed_chunks lists token ranges that failed
+
+    Raises:
+        RuntimeError: If a chunk failed and with_errors is False
     """
-    with get_chain(chainId) as chain:
-        tokens = chain.get_tokens_page(limit, offset)
-        tokens = list(
-            map(
-                lambda t: Token.from_tuple(
-                    t, chain_id=chain.chain_id, chain_name=chain.name
-                ),
-                tokens,
-            )
-        )
+    page = await asyncio.to_thread(
+        get_read_ahead_buffer().get_page,
+        "query_sugar_get_prices",
+        chainId,
+        limit,
+        offset,
+        lambda page_limit, page_offset: _fetch_prices_page(chainId, page_limit, page_offset),
+        has_more=lambda page: bool(page.result),
+    )
+    if with_errors:
+        return page
+    if page.failed_chunks:
+        chunk = page.failed_chunks[0]
+        raise RuntimeError(f"Failed to fetch prices for tokens {chunk.offset}-{chunk.offset + chunk.limit} on chain {chainId}: {chunk.error}")
+    return page.result
 
-        append_stable = False
-        append_native = False
 
-        token_address_list = [t.token_address.lower() for t in tokens]
-        if chain.settings.stable_token_addr.lower() not in token_address_list:
-            tokens.append(chain.get_token(chain.settings.stable_token_addr))
-            append_stable = True
+async def query_sugar_get_token_stats(
+    token_address: str,
+    chainId: str = "8453",
+    use_cache: bool = True,
+) -> QuerySugarGetTokenStatsOutput:
+    """Retrieve aggregate pool statistics for a token: pool count, summed TVL and volume, best APR and top pool.
 
-        if chain.settings.native_token_symbol.lower() not in token_address_list:
-            tokens.append(
-                Token.make_native_token(
-                    chain.settings.native_token_symbol,
-                    chain.settings.wrapped_native_token_addr,
-                    chain.settings.native_token_decimals,
-                    chain_id=chain.chain_id,
-                    chain_name=chain.name,
-                )
-            )
-            append_native = True
+    Stats are precomputed when the pool cache refreshes, so this is a single lookup.
 
-        prices = chain.get_prices(tokens)
-        prices = [PriceInfo.from_price(p) for p in prices]
-        if append_stable:
-            prices = [
-                p
-                for p in prices
-                if p.token.token_address.lower()
-                != chain.settings.stable_token_addr.lower()
-            ]
+    Args:
+        token_address: The token address
+        chainId: The chain ID to use ('10' for OPChain, '8453' for BaseChain, '130' for Unichain, '1135' for List)
+        use_cache: Whether to use cached data. Defaults to True. Not available when the stdio cache is disabled.
 
-        if append_native:
-            prices = [
-                p
-                for p in prices
-                if p.token.token_address.lower()
-                != chain.settings.native_token_symbol.lower()
-            ]
+    Returns:
+        QuerySugarGetTokenStatsOutput: result is TokenStatsInfo, or "NOT FIND" when no pool contains the token.
+            block_number is the block the cached snapshot was taken at when use_cache is True
+    """
+    validate_cache_parameter(use_cache, "query_sugar_get_token_stats")
+    token_address = Web3.to_checksum_address(token_address)
 
-        return prices
+    block_number = None
+    if use_cache:
+        # A cold cache fetches the chain's pools, which blocks
+        pools = await asyncio.to_thread(_get_cached_pools, chainId)
+        snapshot = _get_cached_snapshot(chainId)
+        if snapshot is not None:
+            block_number = snapshot.block_number
+            stats = _get_token_stats_from_cache(chainId, token_address)
+        else:
+            # Chains outside the cached set are fetched directly and have no precomputed stats
+            stats = compute_token_stats(pools, get_pool_metrics(pools)).get(token_address.lower())
+    else:
+        try:
+            pools = await asyncio.to_thread(_get_pools_from_chain, chainId)
+        except Exception as e:
+            return QuerySugarGetTokenStatsOutput(result=f"NOT FIND: chain {chainId} fetch error — {type(e).__name__}: {e}")
+        stats = compute_token_stats(pools, get_pool_metrics(pools)).get(token_address.lower())
 
+    if stats is None:
+        return QuerySugarGetTokenStatsOutput(result=f"NOT FIND: no pools contain token {token_address} on chain {chainId}", block_number=block_number)
+    return QuerySugarGetTokenStatsOutput(result=TokenStatsInfo.from_stats(stats), block_number=block_number)
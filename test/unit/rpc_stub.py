@@ -0,0 +1,86 @@
+"""Local JSON-RPC stub server for RPC transport tests."""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients closing keep-alive connections at teardown are expected
+        pass
+
+
+class StubRpcServer:
+    """Answers eth_call with its data argument echoed back, in shuffled order for batches.
+
+    Calls whose data is in error_data get a JSON-RPC error entry. latency delays every
+    response and fail_requests makes the next N requests return HTTP 503. Other methods
+    answer "0x0", or the entry for the method in results, called with the request if callable.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.error_data = set()
+        self.fail_requests = 0
+        self.fail_always = False
+        self.payloads = []
+        self.results = {}
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with stub.lock:
+                    stub.payloads.append(payload)
+                    fail = stub.fail_always or stub.fail_requests > 0
+                    if stub.fail_requests > 0:
+                        stub.fail_requests -= 1
+                time.sleep(stub.latency)
+                if fail:
+                    body, status = b"{}", 503
+                else:
+                    body, status = json.dumps(stub.respond(payload)).encode(), 200
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = _QuietServer(("127.0.0.1", 0), Handler)
+        self.uri = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def respond(self, payload):
+        if isinstance(payload, list):
+            responses = [self.respond_one(request) for request in payload]
+            random.shuffle(responses)
+            return responses
+        return self.respond_one(payload)
+
+    def respond_one(self, request):
+        if request["method"] == "eth_chainId":
+            return {"jsonrpc": "2.0", "id": request["id"], "result": "0x2105"}
+        if request["method"] in self.results:
+            result = self.results[request["method"]]
+            return {"jsonrpc": "2.0", "id": request["id"], "result": result(request) if callable(result) else result}
+        if request["method"] != "eth_call":
+            return {"jsonrpc": "2.0", "id": request["id"], "result": "0x0"}
+        data = request["params"][0]["data"]
+        if data in self.error_data:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": 3, "message": f"execution reverted: {data}"}}
+        return {"jsonrpc": "2.0", "id": request["id"], "result": data}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,113 @@
+"""Tests for the CoinGecko per-coin chart store."""
+
+import asyncio
+import time
+
+import pytest
+
+from netmind_web3_mcp.tools.coingecko import charts
+from netmind_web3_mcp.tools.coingecko.charts import ChartStore, _infer_step_ms, _merge, _trim
+
+HOUR_MS = 3600 * 1000
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def hourly(start_ms, count):
+    return [[start_ms + i * HOUR_MS, float(i)] for i in range(count)]
+
+
+def test_infer_step_ms_uses_median_gap():
+    points = hourly(0, 5) + [[4 * HOUR_MS + 60_000, 9.0]]
+    assert _infer_step_ms(points) == HOUR_MS
+    assert _infer_step_ms([[0, 1.0]]) == charts.DEFAULT_STEP_MS
+
+
+def test_merge_skips_points_not_newer_than_last():
+    points = hourly(0, 3)
+    _merge(points, [[HOUR_MS, 7.0], [2 * HOUR_MS, 7.0]], HOUR_MS)
+    assert points == hourly(0, 3)
+
+
+def test_merge_replaces_live_tail_and_appends_full_steps():
+    # The last point is the live price, taken 10 minutes after the previous one
+    points = hourly(0, 3) + [[2 * HOUR_MS + 600_000, 2.5]]
+    _merge(points, [[2 * HOUR_MS + 1_200_000, 2.7], [3 * HOUR_MS, 3.0], [3 * HOUR_MS + 300_000, 3.1]], HOUR_MS)
+    assert points == hourly(0, 4) + [[3 * HOUR_MS + 300_000, 3.1]]
+
+
+def test_trim_drops_points_before_cutoff():
+    points = hourly(0, 4)
+    assert _trim(points, 2 * HOUR_MS) == hourly(0, 4)[2:]
+    assert _trim(points, 0) is points
+    assert _trim(points, 10 * HOUR_MS) == []
+
+
+class FakeApi:
+    def __init__(self, now_ms):
+        self.now_ms = now_ms
+        self.calls = []
+        self.fail = False
+
+    async def get_json(self, endpoint, params=None):
+        self.calls.append(endpoint)
+        if self.fail:
+            raise RuntimeError("boom")
+        if endpoint.endswith("/range"):
+            points = [[self.now_ms, 99.0]]
+        else:
+            points = hourly(self.now_ms - 3 * HOUR_MS, 3)
+        return {name: [list(p) for p in points] for name in charts.SERIES_KEYS}
+
+
+@pytest.fixture
+def api(monkeypatch):
+    fake = FakeApi(time.time() * 1000)
+    monkeypatch.setattr(charts, "get_json", fake.get_json)
+    return fake
+
+
+def test_get_chart_downloads_then_serves_fresh_chart(api):
+    store = ChartStore(refresh_seconds=300)
+    chart, error = run(store.get_chart("bitcoin", "usd"))
+    assert error is None and len(chart["prices"]) == 3
+    chart, error = run(store.get_chart("bitcoin", "usd"))
+    assert error is None and api.calls == ["/coins/bitcoin/market_chart"]
+
+
+def test_get_chart_extends_older_chart(api):
+    store = ChartStore(refresh_seconds=300)
+    run(store.get_chart("bitcoin", "usd"))
+    store.entries[("bitcoin", "usd")].fetched_at -= 600
+    chart, error = run(store.get_chart("bitcoin", "usd"))
+    assert error is None
+    assert api.calls[-1] == "/coins/bitcoin/market_chart/range"
+    assert chart["prices"][-1] == [api.now_ms, 99.0]
+
+
+def test_failed_update_serves_stale_chart_with_error(api):
+    store = ChartStore(refresh_seconds=300, max_stale_seconds=3600)
+    run(store.get_chart("bitcoin", "usd"))
+    store.entries[("bitcoin", "usd")].fetched_at -= 600
+    api.fail = True
+    chart, error = run(store.get_chart("bitcoin", "usd"))
+    assert len(chart["prices"]) == 3
+    assert error.startswith("RuntimeError: boom")
+
+
+def test_failed_update_raises_beyond_max_stale(api):
+    store = ChartStore(refresh_seconds=300, max_stale_seconds=3600)
+    run(store.get_chart("bitcoin", "usd"))
+    store.entries[("bitcoin", "usd")].fetched_at -= 7200
+    api.fail = True
+    with pytest.raises(RuntimeError):
+        run(store.get_chart("bitcoin", "usd"))
+
+
+def test_store_evicts_least_recently_used(api):
+    store = ChartStore(max_coins=2)
+    for coin_id in ("a", "b", "a", "c"):
+        run(store.get_chart(coin_id, "usd"))
+    assert list(store.entries) == [("a", "usd"), ("c", "usd")]
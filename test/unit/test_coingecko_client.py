@@ -0,0 +1,67 @@
+"""Tests for coalescing of concurrent CoinGecko requests."""
+
+import asyncio
+
+import pytest
+
+from netmind_web3_mcp.tools.coingecko import client
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    async def request(path, params):
+        calls.append((path, params))
+        await asyncio.sleep(0.02)
+        if path == "/fail":
+            raise RuntimeError("boom")
+        return FakeResponse(b'{"path": "%s"}' % path.encode())
+
+    monkeypatch.setattr(client, "_request", request)
+    monkeypatch.setattr(client, "get_response_cache", lambda: None)
+    return calls
+
+
+def test_identical_requests_share_one_upstream_request(upstream):
+    async def scenario():
+        return await asyncio.gather(
+            client.get_json("/coins/markets", {"vs_currency": "usd", "page": 1}),
+            client.get_json("/coins/markets", {"page": 1, "vs_currency": "usd"}),
+            client.get_json("/coins/list"),
+        )
+
+    first, second, other = asyncio.run(scenario())
+    assert first == second == {"path": "/coins/markets"}
+    assert other == {"path": "/coins/list"}
+    # Each caller decodes its own copy
+    assert first is not second
+    assert len(upstream) == 2
+    assert client._inflight == {}
+
+
+def test_cancelled_caller_does_not_cancel_shared_request(upstream):
+    async def scenario():
+        first = asyncio.ensure_future(client.get_json("/coins/markets"))
+        second = asyncio.ensure_future(client.get_json("/coins/markets"))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == {"path": "/coins/markets"}
+    assert len(upstream) == 1
+
+
+def test_error_reaches_every_caller_and_is_not_kept(upstream):
+    async def scenario():
+        return await asyncio.gather(client.get_json("/fail"), client.get_json("/fail"), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+    assert len(upstream) == 1
+    assert client._inflight == {}
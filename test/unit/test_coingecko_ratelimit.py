@@ -0,0 +1,104 @@
+"""Tests for the CoinGecko rate limit and adaptive concurrency limit."""
+
+import asyncio
+import time
+
+from netmind_web3_mcp.tools.coingecko.ratelimit import AIMDLimiter, RateLimiter, TokenBucket, parse_retry_after
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_bucket_allows_burst_then_spaces_requests():
+    bucket = TokenBucket(rate_per_minute=600, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Later requests wait one interval (0.1s) per request past the burst
+    delays = [bucket.reserve() for _ in range(2)]
+    assert 0.09 < delays[0] <= 0.1
+    assert 0.19 < delays[1] <= 0.2
+
+
+def test_bucket_pause_holds_back_requests():
+    bucket = TokenBucket(rate_per_minute=600, burst=3)
+    bucket.pause(1.0)
+    assert 0.99 < bucket.reserve() <= 1.0
+
+
+def test_aimd_increases_by_one_over_limit_up_to_maximum():
+    limiter = AIMDLimiter(initial=2, minimum=1, maximum=3)
+    limiter.on_success()
+    assert limiter.limit == 2.5
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.limit == 3
+
+
+def test_aimd_halves_once_per_cooldown():
+    limiter = AIMDLimiter(initial=8, minimum=1, maximum=8, cooldown_seconds=0.05)
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert limiter.limit == 4
+    time.sleep(0.06)
+    limiter.on_throttle()
+    assert limiter.limit == 2
+    limiter.last_decrease = 0.0
+    limiter.on_throttle()
+    limiter.last_decrease = 0.0
+    limiter.on_throttle()
+    assert limiter.limit == 1
+
+
+def test_aimd_limits_concurrency_and_wakes_waiters():
+    async def scenario():
+        limiter = AIMDLimiter(initial=2, minimum=1, maximum=4)
+        peak = 0
+
+        async def task():
+            nonlocal peak
+            await limiter.acquire()
+            peak = max(peak, limiter.active)
+            await asyncio.sleep(0.01)
+            limiter.release()
+
+        await asyncio.gather(*[task() for _ in range(6)])
+        return peak, limiter.active, len(limiter.waiters)
+
+    assert run(scenario()) == (2, 0, 0)
+
+
+def test_aimd_cancelled_waiter_hands_slot_on():
+    async def scenario():
+        limiter = AIMDLimiter(initial=1, minimum=1, maximum=1)
+        await limiter.acquire()
+        first = asyncio.ensure_future(limiter.acquire())
+        second = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        # Wake the first waiter, then cancel it before it runs
+        limiter.release()
+        first.cancel()
+        await asyncio.wait_for(second, 1.0)
+        return limiter.active
+
+    assert run(scenario()) == 1
+
+
+def test_rate_limiter_throttle_counts_and_stats():
+    limiter = RateLimiter(
+        bucket=TokenBucket(600, 5),
+        concurrency=AIMDLimiter(4, 1, 4),
+        max_retries=3,
+        retry_base_delay=0.5,
+        retry_max_delay=2.0,
+    )
+    limiter.on_throttle(None)
+    assert limiter.stats() == {"concurrency_limit": 2.0, "active": 0, "waiting": 0, "throttled": 1, "retries": 0}
+    assert all(0 <= limiter.backoff(attempt) <= 2.0 for attempt in range(6))
@@ -0,0 +1,113 @@
+"""Tests for the CoinGecko response cache."""
+
+import asyncio
+import os
+import shutil
+import time
+
+from netmind_web3_mcp.tools.coingecko.response_cache import ResponseCache, cache_key
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def make_cache(max_bytes=1000, disk_dir=None, **kwargs):
+    return ResponseCache(ttls=[(r"^/coins/markets$", 60), (r"^/coins/[^/]+/market_chart$", 300), (r"/trades$", 0)], max_bytes=max_bytes, disk_dir=disk_dir, **kwargs)
+
+
+def test_cache_key_normalizes_params_and_addresses():
+    address = "0x" + "AbC" * 13 + "D"
+    assert cache_key(f"/onchain/tokens/{address}", {"b": 2, "a": 1, "c": None}) == f"/onchain/tokens/{address.lower()}?a=1&b=2"
+    assert cache_key("coins/markets/") == "/coins/markets"
+
+
+def test_ttl_for_matches_first_pattern():
+    cache = make_cache()
+    assert cache.ttl_for("/coins/markets") == 60
+    assert cache.ttl_for("/coins/bitcoin/market_chart") == 300
+    assert cache.ttl_for("/onchain/pools/0x1/trades") == 0
+    assert cache.ttl_for("/unknown") == 0
+
+
+def test_hit_and_expiry():
+    cache = make_cache()
+    run(cache.set("k", b"body", 0.05))
+    assert run(cache.get("k")) == b"body"
+    time.sleep(0.06)
+    assert run(cache.get("k")) is None
+    assert cache.stats() == {"entries": 0, "bytes": 0, "hits": 1, "misses": 1}
+
+
+def test_evicts_least_recently_used_by_bytes():
+    cache = make_cache(max_bytes=300)
+    for key in ("a", "b", "c"):
+        run(cache.set(key, b"x" * 100, 60))
+    # Reading a makes b the least recently used
+    run(cache.get("a"))
+    run(cache.set("d", b"x" * 100, 60))
+
+    assert run(cache.get("b")) is None
+    assert all(run(cache.get(key)) is not None for key in ("a", "c", "d"))
+    assert cache.total_bytes == 300
+
+
+def test_replacing_an_entry_updates_its_size():
+    cache = make_cache(max_bytes=300)
+    run(cache.set("a", b"x" * 200, 60))
+    run(cache.set("a", b"x" * 50, 60))
+    run(cache.set("b", b"x" * 250, 60))
+
+    assert cache.total_bytes == 300
+    assert run(cache.get("a")) == b"x" * 50
+
+
+def test_body_larger_than_budget_is_not_cached():
+    cache = make_cache(max_bytes=100)
+    run(cache.set("small", b"x" * 10, 60))
+    run(cache.set("big", b"x" * 101, 60))
+
+    assert run(cache.get("big")) is None
+    assert run(cache.get("small")) is not None
+
+
+def test_disk_tier_survives_restart_and_drops_expired_files(tmp_path):
+    run(make_cache(disk_dir=str(tmp_path)).set("k", b"body", 60))
+    run(make_cache(disk_dir=str(tmp_path)).set("old", b"stale", 0.01))
+    time.sleep(0.02)
+
+    restarted = make_cache(disk_dir=str(tmp_path))
+    assert run(restarted.get("k")) == b"body"
+    # Promoted to memory
+    assert restarted.stats()["entries"] == 1
+    assert run(restarted.get("old")) is None
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_disk_tier_removes_expired_then_soonest_expiring_files_over_budget(tmp_path):
+    # Each file is a ~19 byte expiry header and a 50 byte body
+    cache = make_cache(disk_dir=str(tmp_path), disk_max_bytes=200)
+    run(cache.set("expired", b"x" * 50, 0.01))
+    time.sleep(0.02)
+    run(cache.set("a", b"x" * 50, 60))
+    run(cache.set("b", b"x" * 50, 120))
+    assert not os.path.exists(cache._disk_path("expired"))
+    assert os.path.exists(cache._disk_path("a"))
+
+    run(cache.set("c", b"x" * 50, 180))
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(cache._disk_path(key)) for key in ("b", "c"))
+    assert cache.disk_bytes <= 200
+
+
+def test_disk_write_failure_is_reported_on_stderr(tmp_path, capsys):
+    disk_dir = tmp_path / "cache"
+    cache = make_cache(disk_dir=str(disk_dir))
+    shutil.rmtree(disk_dir)
+
+    run(cache.set("k", b"body", 60))
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "failed to write CoinGecko cache file" in captured.err
+    # The memory tier still has the entry
+    assert run(cache.get("k")) == b"body"
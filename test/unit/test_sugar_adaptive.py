@@ -0,0 +1,54 @@
+"""Tests for change-rate driven refresh intervals."""
+
+from datetime import datetime
+
+import pytest
+
+from netmind_web3_mcp.tools.sugar.adaptive import change_ratio, next_interval
+from netmind_web3_mcp.tools.sugar.diff import SnapshotDiff
+
+
+def diff(significant=0, new=0, removed=0):
+    return SnapshotDiff(
+        from_block=None,
+        to_block=None,
+        from_time=datetime(2026, 1, 1),
+        to_time=datetime(2026, 1, 1),
+        new_pools=["n"] * new,
+        removed_pools=["r"] * removed,
+        movers={},
+        changed_count=significant,
+        significant_count=significant,
+    )
+
+
+def test_change_ratio_counts_significant_new_and_removed_pools():
+    assert change_ratio(diff(significant=5, new=3, removed=2), 100) == 0.1
+    assert change_ratio(diff(new=1), 0) == 1.0
+
+
+@pytest.mark.parametrize(
+    "ratio, expected",
+    [
+        (0.5, 60.0),    # fast-moving data halves the interval
+        (0.05, 120.0),  # in between keeps it
+        (0.0, 180.0),   # quiet data grows it by half
+    ],
+)
+def test_next_interval(ratio, expected):
+    assert next_interval(120.0, ratio, min_seconds=10.0, max_seconds=600.0) == expected
+
+
+def test_next_interval_is_clamped():
+    assert next_interval(15.0, 0.5, min_seconds=10.0, max_seconds=600.0) == 10.0
+    assert next_interval(500.0, 0.0, min_seconds=10.0, max_seconds=600.0) == 600.0
+
+
+def test_interval_converges_to_bounds():
+    interval = 120.0
+    for _ in range(20):
+        interval = next_interval(interval, 0.0, 10.0, 600.0)
+    assert interval == 600.0
+    for _ in range(20):
+        interval = next_interval(interval, 0.9, 10.0, 600.0)
+    assert interval == 10.0
@@ -0,0 +1,96 @@
+"""Tests for block-pinned snapshots and block-lag driven refreshes."""
+
+from datetime import datetime, timedelta
+
+from netmind_web3_mcp.tools.sugar import cache as cache_module
+from netmind_web3_mcp.tools.sugar.cache import CacheConfig, PoolsCache
+from test_sugar_cache import make_pool, publish
+
+
+class StubEth:
+    def __init__(self, chain):
+        self.chain = chain
+
+    @property
+    def block_number(self):
+        if self.chain.head is None:
+            raise ConnectionError("head unavailable")
+        self.chain.events.append(("block", self.chain.head))
+        return self.chain.head
+
+
+class StubChain:
+    """Chain context whose head advances while its pools are read."""
+
+    def __init__(self, head=100, pools=None):
+        self.chain_id = "8453"
+        self.head = head
+        self.pools = pools if pools is not None else [make_pool(1), make_pool(2)]
+        self.events = []
+        self.web3 = type("Web3", (), {"eth": StubEth(self)})()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+    def get_pools(self):
+        self.events.append(("pools", self.head))
+        if self.head is not None:
+            self.head += 5
+        return self.pools
+
+
+def block_cache(monkeypatch, latest_block):
+    cache = PoolsCache(config=CacheConfig(refresh_mode="block", block_lag_threshold=150))
+    monkeypatch.setattr(cache, "_get_latest_block", lambda chain_id: latest_block)
+    return cache
+
+
+def test_block_mode_refreshes_once_the_head_lags_by_the_threshold(monkeypatch):
+    snapshot = publish(block_cache(monkeypatch, None), "8453", [make_pool(1)], block_number=100)
+
+    assert not block_cache(monkeypatch, 249).needs_refresh("8453", snapshot)
+    assert block_cache(monkeypatch, 250).needs_refresh("8453", snapshot)
+    # A failed head poll keeps the snapshot until it ages out
+    assert not block_cache(monkeypatch, None).needs_refresh("8453", snapshot)
+
+
+def test_stale_snapshots_refresh_without_polling_the_head(monkeypatch):
+    cache = block_cache(monkeypatch, None)
+    monkeypatch.setattr(cache, "_get_latest_block", lambda chain_id: 1 / 0)
+    snapshot = publish(cache, "8453", [make_pool(1)], block_number=100)
+
+    stale = cache._make_snapshot(snapshot.pools, datetime.now() - timedelta(minutes=31), 100)
+    assert cache.needs_refresh("8453", stale)
+
+
+def test_ttl_mode_does_not_poll_the_head(monkeypatch):
+    cache = PoolsCache(config=CacheConfig(refresh_mode="ttl"))
+    monkeypatch.setattr(cache, "_get_latest_block", lambda chain_id: 1 / 0)
+    snapshot = publish(cache, "8453", [make_pool(1)], block_number=100)
+
+    assert not cache.needs_refresh("8453", snapshot)
+
+
+def test_snapshot_is_pinned_to_the_block_read_before_the_sweep(monkeypatch):
+    chain = StubChain(head=100)
+    monkeypatch.setattr(cache_module, "get_chain", lambda chain_id, cancel=None: chain)
+    cache = PoolsCache()
+
+    cache._fetch_and_cache_pools("8453", datetime.now())
+
+    assert chain.events == [("block", 100), ("pools", 100)]
+    assert cache.get_snapshot("8453").block_number == 100
+
+
+def test_snapshot_without_a_readable_head_has_no_block(monkeypatch):
+    chain = StubChain(head=None)
+    monkeypatch.setattr(cache_module, "get_chain", lambda chain_id, cancel=None: chain)
+    cache = PoolsCache()
+
+    pools = cache._fetch_and_cache_pools("8453", datetime.now())
+
+    assert len(pools) == 2
+    assert cache.get_snapshot("8453").block_number is None
@@ -0,0 +1,94 @@
+"""Tests for the pools cache snapshots."""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from netmind_web3_mcp.tools.sugar.cache import PoolsCache
+
+
+def token(name):
+    return SimpleNamespace(token_address="0x" + name * 40, symbol=name.upper())
+
+
+def make_pool(i, tvl=100.0, token0="a", token1="b", price0=1.0, price1=2.0):
+    def reserve(t, price):
+        return SimpleNamespace(price=SimpleNamespace(token=t, price=price), amount_in_stable=tvl / 2)
+
+    t0, t1 = token(token0), token(token1)
+    return SimpleNamespace(
+        lp=f"0x{i:040x}",
+        symbol=f"P{i}",
+        token0=t0,
+        token1=t1,
+        reserve0=reserve(t0, price0),
+        reserve1=reserve(t1, price1),
+        emissions=SimpleNamespace(amount=0),
+        tvl=tvl,
+        apr=1.0,
+        volume=1.0,
+        gauge_total_supply=0,
+        total_supply=1,
+        is_stable=False,
+    )
+
+
+def publish(cache, chain_id, pools, block_number=None):
+    snapshot = cache._make_snapshot(pools, datetime.now(), block_number)
+    cache._publish(chain_id, snapshot)
+    return cache.get_snapshot(chain_id)
+
+
+def test_every_published_snapshot_gets_a_new_version():
+    cache = PoolsCache()
+    first = publish(cache, "8453", [make_pool(1)], block_number=10)
+    other_chain = publish(cache, "10", [make_pool(1)], block_number=10)
+    second = publish(cache, "8453", [make_pool(1)], block_number=11)
+
+    assert len({first.version, other_chain.version, second.version}) == 3
+    assert second.version > first.version
+    assert cache.get_cache_stats()["chains"]["8453"]["snapshot_version"] == second.version
+
+
+def budgeted_cache(monkeypatch, budget_mb, pinned=None, touches=None):
+    cache = PoolsCache()
+    cache.set_memory_budget(budget_mb, pinned)
+    # Every chain counts as 1 MB
+    monkeypatch.setattr(cache, "_chain_bytes", lambda chain_id, snapshot: 2**20)
+    for chain_id, count in (touches or {}).items():
+        for _ in range(count):
+            cache.access.touch(chain_id)
+    return cache
+
+
+def test_memory_budget_evicts_coldest_chains_first(monkeypatch):
+    cache = budgeted_cache(monkeypatch, 2.5, touches={"a": 3, "b": 1, "c": 2, "d": 5})
+
+    for chain_id in "abc":
+        publish(cache, chain_id, [make_pool(1)])
+    assert sorted(cache.cache) == ["a", "c"]
+
+    publish(cache, "d", [make_pool(1)])
+    assert sorted(cache.cache) == ["a", "d"]
+    assert cache.evictions == 2
+
+
+def test_memory_budget_skips_pinned_chains(monkeypatch):
+    cache = budgeted_cache(monkeypatch, 2.5, pinned=["b"], touches={"a": 3, "b": 1, "c": 2})
+
+    for chain_id in "abc":
+        publish(cache, chain_id, [make_pool(1)])
+
+    assert sorted(cache.cache) == ["b", "c"]
+
+
+def test_chain_over_the_whole_budget_is_kept_when_published(monkeypatch, capsys):
+    cache = budgeted_cache(monkeypatch, 0.5, touches={"a": 5})
+
+    publish(cache, "a", [make_pool(1)])
+    publish(cache, "a", [make_pool(1)])
+    assert list(cache.cache) == ["a"]
+    assert capsys.readouterr().err.count("over the 0.5 MB budget") == 1
+
+    # Another chain's refresh may still evict it, however hot
+    publish(cache, "b", [make_pool(1)])
+    assert list(cache.cache) == ["b"]
@@ -0,0 +1,151 @@
+"""Tests for snapshot-pinned pagination cursors."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from netmind_web3_mcp.tools.sugar import cursors, pools
+from netmind_web3_mcp.tools.sugar.cursors import CursorStore, make_cursor, page_from_cursor, paginate
+from netmind_web3_mcp.tools.sugar.memory import estimate_items_bytes
+from netmind_web3_mcp.tools.sugar.models import QuerySugarGetPoolsForSwapsOutput
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = CursorStore(ttl_seconds=60, max_entries=4)
+    monkeypatch.setattr(cursors, "_cursor_store", store)
+    return store
+
+
+def test_resolve_returns_scan_and_offset(store):
+    scan_id = store.retain("tool", list(range(10)), block_number=7)
+
+    scan, offset = store.resolve("tool", make_cursor(scan_id, 4))
+
+    assert offset == 4 and scan.items == list(range(10)) and scan.block_number == 7
+
+
+@pytest.mark.parametrize("cursor", ["unknown:0", "no-offset", ":3", "abc:x"])
+def test_unknown_or_malformed_cursor(store, cursor):
+    store.retain("tool", [1, 2])
+    assert store.resolve("tool", cursor) is None
+
+
+def test_cursor_is_bound_to_its_tool(store):
+    scan_id = store.retain("tool", [1, 2])
+    assert store.resolve("other_tool", make_cursor(scan_id, 1)) is None
+
+
+def test_scans_expire(store):
+    store.ttl_seconds = 0.05
+    scan_id = store.retain("tool", [1, 2])
+    time.sleep(0.06)
+
+    assert store.resolve("tool", make_cursor(scan_id, 1)) is None
+    assert store.stats()["scans"] == 0 and store.total_bytes == 0
+
+
+def test_least_recently_used_scan_is_evicted_beyond_max_entries(store):
+    scan_ids = [store.retain("tool", [i]) for i in range(4)]
+    # Resolving marks the oldest scan as recently used
+    store.resolve("tool", make_cursor(scan_ids[0], 0))
+    store.retain("tool", [4])
+
+    assert store.resolve("tool", make_cursor(scan_ids[0], 0)) is not None
+    assert store.resolve("tool", make_cursor(scan_ids[1], 0)) is None
+
+
+def test_retained_bytes_stay_within_budget():
+    items = [{"lp": f"0x{i:040x}", "symbol": f"P{i}"} for i in range(200)]
+    size = estimate_items_bytes(items)
+    store = CursorStore(max_entries=100, max_bytes=int(size * 2.5))
+
+    scan_ids = [store.retain("tool", list(items)) for _ in range(4)]
+
+    assert store.stats()["scans"] == 2
+    assert store.total_bytes <= store.max_bytes
+    assert store.resolve("tool", make_cursor(scan_ids[0], 0)) is None
+    assert store.resolve("tool", make_cursor(scan_ids[3], 0)) is not None
+
+
+def test_scan_larger_than_budget_is_not_retained():
+    store = CursorStore(max_bytes=100)
+    assert store.retain("tool", [{"lp": f"0x{i:040x}"} for i in range(100)]) is None
+    assert store.total_bytes == 0
+
+
+def test_paginate_and_follow_cursors(store):
+    items = list(range(25))
+    page, cursor = paginate("tool", items, 0, 10)
+    pages = [page]
+    while cursor is not None:
+        page, cursor, _ = page_from_cursor("tool", cursor, 10)
+        pages.append(page)
+
+    assert pages == [items[0:10], items[10:20], items[20:25]]
+
+
+def test_last_page_retains_nothing(store):
+    page, cursor = paginate("tool", list(range(5)), 0, 10)
+    assert page == list(range(5)) and cursor is None
+    assert store.stats()["scans"] == 0
+
+
+def _fake_pools(count):
+    token = SimpleNamespace(token_address="0x" + "a" * 40)
+    return [SimpleNamespace(chain_id="8453", chain_name="Base", lp=f"0x{i:040x}", type=0, token0=token, token1=token) for i in range(count)]
+
+
+def test_pools_for_swaps_keeps_list_output_without_cursor(store, monkeypatch):
+    monkeypatch.setattr(pools, "_get_cached_pools", lambda chain_id: _fake_pools(15))
+
+    result = asyncio.run(pools.query_sugar_get_pools_for_swaps(limit=10, offset=0))
+
+    assert isinstance(result, list) and len(result) == 10
+    assert store.stats()["scans"] == 0
+
+
+def test_pools_for_swaps_with_cursor(store, monkeypatch):
+    monkeypatch.setattr(pools, "_get_cached_pools", lambda chain_id: _fake_pools(15))
+
+    first = asyncio.run(pools.query_sugar_get_pools_for_swaps(limit=10, offset=0, with_cursor=True))
+    second = asyncio.run(pools.query_sugar_get_pools_for_swaps(limit=10, offset=0, cursor=first.next_cursor))
+
+    assert isinstance(first, QuerySugarGetPoolsForSwapsOutput) and len(first.result) == 10
+    assert [p.lp for p in second.result] == [f"0x{i:040x}" for i in range(10, 15)]
+    assert second.next_cursor is None
+
+
+def test_retained_scan_pins_snapshot_version(store):
+    page, cursor = paginate("tool", list(range(20)), 0, 10, block_number=7, chain_id="8453", snapshot_version=3)
+
+    _, _, scan = page_from_cursor("tool", cursor, 10)
+
+    assert (scan.chain_id, scan.snapshot_version, scan.block_number) == ("8453", 3, 7)
+
+
+def test_resumed_scan_flags_replaced_snapshot(store, monkeypatch):
+    snapshot = SimpleNamespace(version=1, block_number=100)
+    monkeypatch.setattr(pools, "_get_cached_pools", lambda chain_id: _fake_pools(25))
+    monkeypatch.setattr(pools, "_get_cached_snapshot", lambda chain_id: snapshot)
+
+    first = asyncio.run(pools.query_sugar_get_pools_for_swaps(limit=10, offset=0, with_cursor=True))
+    second = asyncio.run(pools.query_sugar_get_pools_for_swaps(limit=10, offset=0, cursor=first.next_cursor))
+    assert not first.snapshot_replaced and not second.snapshot_replaced
+
+    # A refresh publishes a new snapshot; the scan keeps serving its original ordering
+    snapshot = SimpleNamespace(version=2, block_number=110)
+    third = asyncio.run(pools.query_sugar_get_pools_for_swaps(limit=10, offset=0, cursor=second.next_cursor))
+    assert third.snapshot_replaced
+    assert [p.lp for p in third.result] == [f"0x{i:040x}" for i in range(20, 25)]
+
+
+def test_scan_read_from_chain_is_never_flagged(store, monkeypatch):
+    monkeypatch.setattr(pools, "_get_cached_snapshot", lambda chain_id: None)
+    page, cursor = paginate("query_sugar_get_pools_for_swaps", pools._convert_pools_to_swap_format(_fake_pools(15)), 0, 10)
+
+    output = asyncio.run(pools.query_sugar_get_pools_for_swaps(limit=10, offset=0, cursor=cursor))
+
+    assert not output.snapshot_replaced and len(output.result) == 5
@@ -0,0 +1,131 @@
+"""Tests for delta refreshes of pool snapshots from logs."""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from web3 import Web3
+
+from netmind_web3_mcp.tools.sugar import cache as cache_module
+from netmind_web3_mcp.tools.sugar import delta
+from netmind_web3_mcp.tools.sugar.cache import CacheConfig, PoolsCache
+from rpc_stub import StubRpcServer
+from test_sugar_cache import make_pool, publish
+
+FACTORY = Web3.to_checksum_address("0x" + "f" * 40)
+
+
+def log(address, topic, data="0x"):
+    return {
+        "address": Web3.to_checksum_address(address),
+        "topics": [topic],
+        "data": data,
+        "blockNumber": "0x65",
+        "blockHash": "0x" + "0" * 64,
+        "transactionHash": "0x" + "0" * 64,
+        "transactionIndex": "0x0",
+        "logIndex": "0x0",
+        "removed": False,
+    }
+
+
+def factory_pool(i, tvl=100.0):
+    pool = make_pool(i, tvl=tvl)
+    pool.factory = FACTORY
+    return pool
+
+
+@pytest.fixture
+def stub():
+    server = StubRpcServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def chain(stub):
+    return SimpleNamespace(chain_id="8453", web3=Web3(Web3.HTTPProvider(stub.uri)))
+
+
+def get_logs_filters(stub):
+    return [payload["params"][0] for payload in stub.payloads if payload["method"] == "eth_getLogs"]
+
+
+def test_changed_pools_are_read_from_pool_change_logs(stub, chain):
+    pools = [factory_pool(i) for i in range(1, 4)]
+    stub.results["eth_getLogs"] = [log(pools[1].lp, delta.POOL_CHANGE_TOPICS[0])]
+
+    changed = delta.get_changed_pool_addresses(chain, pools, 101, 110)
+
+    assert changed == {pools[1].lp.lower()}
+    (log_filter,) = get_logs_filters(stub)
+    assert log_filter["topics"] == [delta.POOL_CHANGE_TOPICS]
+    assert (log_filter["fromBlock"], log_filter["toBlock"]) == ("0x65", "0x6e")
+
+
+def test_log_filters_are_chunked_by_address(stub, chain, monkeypatch):
+    monkeypatch.setattr(delta, "LOG_ADDRESS_CHUNK_SIZE", 2)
+    pools = [factory_pool(i) for i in range(1, 6)]
+    # Every chunk reports a change for its first address
+    stub.results["eth_getLogs"] = lambda request: [log(request["params"][0]["address"][0], delta.POOL_CHANGE_TOPICS[1])]
+
+    changed = delta.get_changed_pool_addresses(chain, pools, 101, 110)
+
+    assert [len(f["address"]) for f in get_logs_filters(stub)] == [2, 2, 1]
+    assert changed == {pools[0].lp.lower(), pools[2].lp.lower(), pools[4].lp.lower()}
+
+
+def test_created_pools_are_read_from_factory_logs(stub, chain):
+    created = "0x" + "c" * 40
+    data = "0x" + "0" * 24 + created[2:] + "0" * 64
+    stub.results["eth_getLogs"] = [log(FACTORY, delta.POOL_CREATED_TOPICS[0], data)]
+
+    assert delta.get_created_pool_addresses(chain, [factory_pool(1), factory_pool(2)], 101, 110) == {created}
+    (log_filter,) = get_logs_filters(stub)
+    assert log_filter["address"] == [FACTORY]
+    assert log_filter["topics"] == [delta.POOL_CREATED_TOPICS]
+
+
+def test_delta_refresh_merges_changed_pools_into_the_snapshot(stub, chain, monkeypatch):
+    cache = PoolsCache(config=CacheConfig(refresh_strategy="delta"))
+    base_pools = [factory_pool(i) for i in range(1, 4)]
+    base = publish(cache, "8453", base_pools, block_number=100)
+    new_pool = factory_pool(9, tvl=300.0)
+
+    def get_logs(request):
+        if request["params"][0]["topics"] == [delta.POOL_CHANGE_TOPICS]:
+            return [log(base_pools[1].lp, delta.POOL_CHANGE_TOPICS[0])]
+        return [log(FACTORY, delta.POOL_CREATED_TOPICS[0], "0x" + "0" * 24 + new_pool.lp[2:] + "0" * 64)]
+
+    stub.results["eth_getLogs"] = get_logs
+    reads = []
+
+    def read_pools(chain, addresses, pools):
+        reads.append(addresses)
+        return [factory_pool(2, tvl=200.0), new_pool], set()
+
+    monkeypatch.setattr(cache_module, "read_pools", read_pools)
+
+    snapshot = cache._delta_refresh(chain, "8453", 110, datetime.now())
+
+    assert reads == [sorted({base_pools[1].lp.lower(), new_pool.lp.lower()})]
+    assert [pool.lp for pool in snapshot.pools] == [base_pools[0].lp, base_pools[1].lp, base_pools[2].lp, new_pool.lp]
+    assert snapshot.pool_index[base_pools[1].lp.lower()].tvl == 200.0
+    assert snapshot.pools[0] is base_pools[0]
+    assert snapshot.block_number == 110
+    assert snapshot.last_full_refresh == base.last_full_refresh
+
+
+def test_delta_refresh_runs_a_full_sweep_once_the_last_is_too_old(chain):
+    cache = PoolsCache(config=CacheConfig(refresh_strategy="delta", duration_minutes=30, delta_full_refresh_minutes=120))
+    base = publish(cache, "8453", [factory_pool(1)], block_number=100)
+
+    # Older than the cache duration but within the full refresh interval: still a delta
+    assert cache._delta_refresh(chain, "8453", 100, base.last_full_refresh + timedelta(minutes=60)) is not None
+    assert cache._delta_refresh(chain, "8453", 100, base.last_full_refresh + timedelta(minutes=120)) is None
+
+
+def test_delta_in_ttl_mode_needs_a_longer_full_refresh_interval():
+    with pytest.raises(ValueError):
+        CacheConfig(refresh_strategy="delta", duration_minutes=30, delta_full_refresh_minutes=30)
+    CacheConfig(refresh_strategy="delta", refresh_mode="block", duration_minutes=30, delta_full_refresh_minutes=30)
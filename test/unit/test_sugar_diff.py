@@ -0,0 +1,52 @@
+"""Tests for snapshot-to-snapshot diffs."""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from netmind_web3_mcp.tools.sugar.diff import compute_snapshot_diff
+from netmind_web3_mcp.tools.sugar.metrics import PoolMetrics
+
+T0, T1 = datetime(2026, 1, 1, 0, 0), datetime(2026, 1, 1, 0, 5)
+
+
+def metrics(tvl, apr=1.0, volume=1.0):
+    return PoolMetrics(tvl=tvl, apr=apr, volume=volume, gauge_staked_pct=0.0, has_emissions=False, is_stable=False)
+
+
+def index(*keys):
+    return {key: SimpleNamespace(lp=key.upper(), symbol=f"P-{key}") for key in keys}
+
+
+def test_new_removed_and_changed_pools():
+    before = {"a": metrics(100.0), "b": metrics(100.0), "c": metrics(50.0)}
+    after = {"a": metrics(100.5), "b": metrics(200.0), "d": metrics(10.0)}
+
+    diff = compute_snapshot_diff(index("a", "b", "c"), before, index("a", "b", "d"), after, 1, 2, T0, T1)
+
+    assert diff.new_pools == ["D"] and diff.removed_pools == ["C"]
+    assert diff.changed_count == 2
+    # a moved by 0.5%, below the significance threshold
+    assert diff.significant_count == 1
+    assert [c.lp for c in diff.movers["tvl"]] == ["B", "A"]
+    assert diff.movers["tvl"][0].change == 100.0
+    assert diff.movers["apr"] == [] and diff.movers["volume"] == []
+    assert (diff.from_block, diff.to_block, diff.from_time, diff.to_time) == (1, 2, T0, T1)
+
+
+def test_movers_are_ranked_by_absolute_change_and_capped():
+    keys = [f"p{i}" for i in range(10)]
+    before = {key: metrics(100.0) for key in keys}
+    after = {key: metrics(100.0 + (i if i % 2 else -i) * 10) for i, key in enumerate(keys)}
+
+    diff = compute_snapshot_diff(index(*keys), before, index(*keys), after, None, None, T0, T1, top_n=3)
+
+    assert [c.lp for c in diff.movers["tvl"]] == ["P9", "P8", "P7"]
+    assert diff.movers["tvl"][1].change == -80.0
+
+
+def test_reused_metrics_objects_are_skipped():
+    shared = metrics(100.0)
+    diff = compute_snapshot_diff(index("a"), {"a": shared}, index("a"), {"a": shared}, 1, 2, T0, T1)
+
+    assert diff.changed_count == 0 and diff.significant_count == 0
+    assert all(movers == [] for movers in diff.movers.values())
@@ -0,0 +1,64 @@
+"""Tests for converting pool epochs, with and without pool deduplication."""
+
+from types import SimpleNamespace
+
+from netmind_web3_mcp.tools.sugar import pools
+from netmind_web3_mcp.tools.sugar.models import LiquidityPoolEpochInfo, LiquidityPoolInfo, QuerySugarGetPoolEpochsOutput
+
+CACHED, UNCACHED = "0x" + "1" * 40, "0x" + "2" * 40
+
+
+def epoch(lp, ts=1):
+    return SimpleNamespace(ts=ts, lp=lp, pool=SimpleNamespace(lp=lp), votes=1, emissions=2, incentives=[], fees=[])
+
+
+def pool_info(lp, chain_name):
+    return LiquidityPoolInfo.model_construct(lp=lp, chain_name=chain_name)
+
+
+def patch_pool_models(monkeypatch):
+    built = []
+
+    def from_pool(pool):
+        if pool is None:
+            raise AttributeError("pool")
+        built.append(pool.lp)
+        return pool_info(pool.lp, "built")
+
+    monkeypatch.setattr(LiquidityPoolInfo, "from_pool", staticmethod(from_pool))
+    monkeypatch.setattr(pools, "_get_pool_info_from_cache", lambda chain_id, lp: pool_info(lp, "cached") if lp == CACHED else None)
+    return built
+
+
+def test_dedupe_returns_each_pool_once(monkeypatch):
+    built = patch_pool_models(monkeypatch)
+    epochs = [epoch(CACHED, 1), epoch(UNCACHED, 1), None, epoch(CACHED, 2), epoch(UNCACHED, 2)]
+
+    output = pools._convert_epochs(epochs, "8453", dedupe_pools=True)
+
+    assert isinstance(output, QuerySugarGetPoolEpochsOutput)
+    assert [(e.lp, e.ts) for e in output.epochs] == [(CACHED, 1), (UNCACHED, 1), (CACHED, 2), (UNCACHED, 2)]
+    assert sorted(output.pools) == [CACHED, UNCACHED]
+    # Cached pools reuse the snapshot's model; the rest are built once per pool
+    assert output.pools[CACHED].chain_name == "cached"
+    assert built == [UNCACHED]
+
+
+def test_without_dedupe_every_epoch_embeds_its_pool(monkeypatch):
+    built = patch_pool_models(monkeypatch)
+
+    output = pools._convert_epochs([epoch(CACHED, 1), epoch(CACHED, 2)], "8453", dedupe_pools=False)
+
+    assert all(isinstance(e, LiquidityPoolEpochInfo) for e in output)
+    assert [e.pool.lp for e in output] == [CACHED, CACHED]
+    assert built == [CACHED, CACHED]
+
+
+def test_invalid_epochs_are_skipped(monkeypatch):
+    patch_pool_models(monkeypatch)
+    invalid = SimpleNamespace(ts=1, lp=UNCACHED, pool=None, votes=1, emissions=2, incentives=[], fees=[])
+
+    output = pools._convert_epochs([invalid, epoch(CACHED)], "8453", dedupe_pools=True)
+    assert [e.lp for e in output.epochs] == [CACHED]
+
+    assert pools._convert_epochs([invalid, None], "8453", dedupe_pools=True) == "Not Find"
@@ -0,0 +1,50 @@
+"""Tests for server-side pool filters."""
+
+import pytest
+
+from netmind_web3_mcp.tools.sugar.filters import PoolFilter
+from netmind_web3_mcp.tools.sugar.metrics import PoolMetrics
+
+
+def metrics(tvl=100.0, apr=10.0, volume=50.0, gauge_staked_pct=40.0, has_emissions=True, is_stable=False):
+    return PoolMetrics(tvl, apr, volume, gauge_staked_pct, has_emissions, is_stable)
+
+
+def test_empty_filter_matches_everything():
+    assert PoolFilter().compile()(metrics(tvl=0.0, apr=0.0))
+
+
+@pytest.mark.parametrize(
+    "pool_filter, matching, failing",
+    [
+        (PoolFilter(min_tvl=100.0), metrics(tvl=100.0), metrics(tvl=99.9)),
+        (PoolFilter(max_tvl=100.0), metrics(tvl=100.0), metrics(tvl=100.1)),
+        (PoolFilter(min_apr=10.0), metrics(apr=10.0), metrics(apr=9.9)),
+        (PoolFilter(max_apr=10.0), metrics(apr=10.0), metrics(apr=10.1)),
+        (PoolFilter(min_volume=50.0), metrics(volume=50.0), metrics(volume=49.9)),
+        (PoolFilter(min_gauge_staked_pct=40.0), metrics(gauge_staked_pct=40.0), metrics(gauge_staked_pct=39.9)),
+        (PoolFilter(max_gauge_staked_pct=40.0), metrics(gauge_staked_pct=40.0), metrics(gauge_staked_pct=40.1)),
+        (PoolFilter(has_emissions=False), metrics(has_emissions=False), metrics(has_emissions=True)),
+        (PoolFilter(is_stable=True), metrics(is_stable=True), metrics(is_stable=False)),
+    ],
+)
+def test_each_condition_is_inclusive(pool_filter, matching, failing):
+    predicate = pool_filter.compile()
+    assert predicate(matching)
+    assert not predicate(failing)
+
+
+def test_combined_conditions_must_all_hold():
+    predicate = PoolFilter(min_tvl=50.0, max_apr=20.0, is_stable=False).compile()
+
+    assert predicate(metrics())
+    assert not predicate(metrics(tvl=10.0))
+    assert not predicate(metrics(apr=30.0))
+    assert not predicate(metrics(is_stable=True))
+
+
+@pytest.mark.parametrize("low, high", [("min_tvl", "max_tvl"), ("min_apr", "max_apr"), ("min_gauge_staked_pct", "max_gauge_staked_pct")])
+def test_inverted_range_is_rejected(low, high):
+    with pytest.raises(ValueError, match=f"{low} must not be greater than {high}"):
+        PoolFilter(**{low: 2.0, high: 1.0})
+    PoolFilter(**{low: 1.0, high: 1.0})
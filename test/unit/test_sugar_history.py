@@ -0,0 +1,61 @@
+"""Tests for the per-pool metric history ring buffers."""
+
+from netmind_web3_mcp.tools.sugar.history import HistoryStore, PoolHistory
+from netmind_web3_mcp.tools.sugar.metrics import PoolMetrics
+
+
+def metrics(tvl):
+    return PoolMetrics(tvl=tvl, apr=tvl / 10, volume=tvl * 2, gauge_staked_pct=0.0, has_emissions=False, is_stable=False)
+
+
+def test_ring_buffer_keeps_latest_points_oldest_first():
+    history = PoolHistory(depth=3)
+    for i in range(5):
+        history.append(float(i), 100 + i, metrics(float(i)))
+
+    points = history.points()
+
+    assert [p.timestamp for p in points] == [2.0, 3.0, 4.0]
+    assert [p.block_number for p in points] == [102, 103, 104]
+    assert points[-1].apr == 0.4 and points[-1].volume == 8.0
+
+
+def test_partial_buffer_and_limit():
+    history = PoolHistory(depth=5)
+    for i in range(3):
+        history.append(float(i), None, metrics(float(i)))
+
+    assert [p.timestamp for p in history.points()] == [0.0, 1.0, 2.0]
+    assert [p.timestamp for p in history.points(limit=2)] == [1.0, 2.0]
+    assert history.points(limit=10)[0].block_number is None
+
+
+def test_store_appends_per_pool_and_drops_vanished_pools():
+    store = HistoryStore(depth=4)
+    store.record("8453", 1.0, 10, {"0xa": metrics(1.0), "0xb": metrics(2.0)})
+    store.record("8453", 2.0, 11, {"0xa": metrics(3.0)})
+
+    assert [p.tvl for p in store.get("8453", "0xA")] == [1.0, 3.0]
+    assert store.get("8453", "0xb") == []
+    assert store.get("10", "0xa") == []
+
+
+def test_zero_depth_records_nothing():
+    store = HistoryStore(depth=0)
+    store.record("8453", 1.0, 10, {"0xa": metrics(1.0)})
+
+    assert store.get("8453", "0xa") == []
+    assert store.size_bytes("8453") == 0
+
+
+def test_size_grows_with_pools_not_with_refreshes():
+    store = HistoryStore(depth=8)
+    pool_metrics = {f"0x{i}": metrics(float(i)) for i in range(10)}
+    store.record("8453", 1.0, 1, pool_metrics)
+    size = store.size_bytes("8453")
+    for t in range(2, 20):
+        store.record("8453", float(t), t, pool_metrics)
+
+    assert store.size_bytes("8453") == size > 0
+    store.clear("8453")
+    assert store.size_bytes("8453") == 0
@@ -0,0 +1,69 @@
+"""Tests for the merged multi-chain pool list."""
+
+import asyncio
+
+import pytest
+
+from netmind_web3_mcp.tools.sugar import pools
+from netmind_web3_mcp.tools.sugar.models import LiquidityPoolInfo
+from test_sugar_cache import make_pool
+
+# TVLs interleave across chains so the merged order differs from any one chain's order
+CHAIN_TVLS = {"8453": [900.0, 500.0, 100.0], "10": [800.0, 300.0], "130": [700.0, 600.0, 200.0]}
+
+
+@pytest.fixture
+def chain_pools(monkeypatch):
+    by_chain = {
+        chain_id: [make_pool(int(chain_id) * 10 + i, tvl=tvl) for i, tvl in enumerate(tvls)]
+        for chain_id, tvls in CHAIN_TVLS.items()
+    }
+
+    def cached_pools(chain_id):
+        if chain_id == "1135":
+            raise ConnectionError("rpc down")
+        return by_chain[chain_id]
+
+    monkeypatch.setattr(pools, "_get_cached_pools", cached_pools)
+    monkeypatch.setattr(pools, "_get_cached_snapshot", lambda chain_id: None)
+    monkeypatch.setattr(LiquidityPoolInfo, "from_pool", staticmethod(lambda p: LiquidityPoolInfo.model_construct(lp=p.lp, tvl=p.tvl)))
+    return by_chain
+
+
+def merged_tvls(**kwargs):
+    output = asyncio.run(pools.query_sugar_get_multichain_pool_list(chainIds=list(CHAIN_TVLS), **kwargs))
+    return output, [p.tvl for p in output.result] if isinstance(output.result, list) else output.result
+
+
+def test_pools_are_merged_in_descending_order_across_chains(chain_pools):
+    output, tvls = merged_tvls(limit=5)
+
+    assert tvls == [900.0, 800.0, 700.0, 600.0, 500.0]
+    assert [(s.chain_id, s.matched) for s in output.chains] == [("8453", 3), ("10", 2), ("130", 3)]
+
+
+def test_offset_slices_the_merged_order(chain_pools):
+    _, first = merged_tvls(limit=3, offset=0)
+    _, second = merged_tvls(limit=3, offset=3)
+    _, last = merged_tvls(limit=3, offset=6)
+
+    assert first + second + last == sorted((tvl for tvls in CHAIN_TVLS.values() for tvl in tvls), reverse=True)
+
+
+def test_offset_past_the_end_reports_the_total(chain_pools):
+    _, result = merged_tvls(limit=3, offset=8)
+
+    assert result == "NOT FIND: offset 8 exceeds available pools (total 8)"
+
+
+def test_filters_apply_before_the_merge(chain_pools):
+    _, tvls = merged_tvls(limit=10, min_tvl=250.0, max_tvl=750.0)
+
+    assert tvls == [700.0, 600.0, 500.0, 300.0]
+
+
+def test_failing_chain_is_reported_without_failing_the_query(chain_pools):
+    output = asyncio.run(pools.query_sugar_get_multichain_pool_list(chainIds=["1135", "10"], limit=10))
+
+    assert [p.tvl for p in output.result] == [800.0, 300.0]
+    assert output.chains[0].error == "ConnectionError: rpc down"
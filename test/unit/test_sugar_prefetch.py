@@ -0,0 +1,102 @@
+"""Tests for the read-ahead buffer of paginated Sugar tools."""
+
+import threading
+import time
+from concurrent.futures import wait
+
+from netmind_web3_mcp.tools.sugar.prefetch import ReadAheadBuffer
+
+
+class Fetcher:
+    """Records (limit, offset) calls and returns the offsets of the page."""
+
+    def __init__(self, total=100, fail_offsets=(), block_offsets=()):
+        self.total = total
+        self.fail_offsets = set(fail_offsets)
+        self.block_offsets = set(block_offsets)
+        self.release = threading.Event()
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, limit, offset):
+        with self.lock:
+            self.calls.append(offset)
+        if offset in self.block_offsets:
+            self.release.wait(5)
+        if offset in self.fail_offsets:
+            self.fail_offsets.discard(offset)
+            raise RuntimeError("read-ahead failed")
+        return list(range(offset, min(offset + limit, self.total)))
+
+
+def wait_for_read_ahead(buffer):
+    wait([future for chain_pages in buffer.pages.values() for _, future in chain_pages.values()], timeout=5)
+
+
+def test_next_page_is_served_from_the_buffer():
+    buffer, fetch = ReadAheadBuffer(), Fetcher()
+
+    assert buffer.get_page("tool", "8453", 10, 0, fetch) == list(range(10))
+    wait_for_read_ahead(buffer)
+    assert buffer.get_page("tool", "8453", 10, 10, fetch) == list(range(10, 20))
+    wait_for_read_ahead(buffer)
+
+    assert fetch.calls == [0, 10, 20]
+
+
+def test_last_page_reads_nothing_ahead():
+    buffer, fetch = ReadAheadBuffer(), Fetcher(total=15)
+
+    buffer.get_page("tool", "8453", 10, 10, fetch)
+    buffer.get_page("tool", "8453", 10, 20, fetch, has_more=lambda page: len(page) == 10)
+
+    # The short page at offset 10 still reads ahead with the default non-empty check
+    wait_for_read_ahead(buffer)
+    assert fetch.calls == [10, 20]
+    assert not buffer.pages["8453"]
+
+
+def test_expired_pages_are_fetched_again():
+    buffer, fetch = ReadAheadBuffer(ttl_seconds=0.05), Fetcher()
+
+    buffer.get_page("tool", "8453", 10, 0, fetch)
+    wait_for_read_ahead(buffer)
+    time.sleep(0.1)
+    buffer.get_page("tool", "8453", 10, 10, fetch)
+    wait_for_read_ahead(buffer)
+
+    assert fetch.calls == [0, 10, 10, 20]
+
+
+def test_failed_read_ahead_falls_back_to_a_direct_fetch():
+    buffer, fetch = ReadAheadBuffer(), Fetcher(fail_offsets=[10])
+
+    buffer.get_page("tool", "8453", 10, 0, fetch)
+    wait_for_read_ahead(buffer)
+
+    assert buffer.get_page("tool", "8453", 10, 10, fetch) == list(range(10, 20))
+    assert fetch.calls[:3] == [0, 10, 10]
+
+
+def test_pages_per_chain_are_capped_oldest_first():
+    offsets = range(0, 1000, 100)
+    fetch = Fetcher(total=2000, block_offsets={offset + 10 for offset in offsets})
+    buffer = ReadAheadBuffer(max_pages_per_chain=8)
+
+    for offset in offsets:
+        buffer.get_page("tool", "8453", 10, offset, fetch)
+    buffer.get_page("tool", "10", 10, 0, fetch)
+
+    assert [key[3] for key in buffer.pages["8453"]] == [offset + 10 for offset in offsets[2:]]
+    assert len(buffer.pages["10"]) == 1
+    fetch.release.set()
+    buffer.clear()
+
+
+def test_disabled_buffer_only_fetches_directly():
+    buffer, fetch = ReadAheadBuffer(enabled=False), Fetcher()
+
+    buffer.get_page("tool", "8453", 10, 0, fetch)
+    buffer.get_page("tool", "8453", 10, 10, fetch)
+
+    assert fetch.calls == [0, 10] and not buffer.pages
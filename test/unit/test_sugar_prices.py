@@ -0,0 +1,127 @@
+"""Tests for chunked token price pages."""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from netmind_sugar.chains import Price
+
+from netmind_web3_mcp.tools.sugar import tokens
+from netmind_web3_mcp.tools.sugar.config import get_config
+from netmind_web3_mcp.tools.sugar.prefetch import ReadAheadBuffer
+
+STABLE = "0x" + "5" * 40
+
+
+class StubChain:
+    """Sync chain stub whose get_prices fails if two threads use the same chain at once."""
+
+    instances = []
+
+    def __init__(self):
+        self.chain_id = "8453"
+        self.name = "Base"
+        self.settings = SimpleNamespace(
+            stable_token_addr=STABLE,
+            native_token_symbol="ETH",
+            wrapped_native_token_addr="0x" + "e" * 40,
+            native_token_decimals=18,
+        )
+        self.busy = False
+        self.threads = set()
+        StubChain.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+    def get_tokens_page(self, limit, offset):
+        return [("0x" + f"{i:040x}", f"T{i}", 18, None, True) for i in range(offset, offset + limit)]
+
+    def get_token(self, address):
+        return tokens.Token(chain_id=self.chain_id, chain_name=self.name, token_address=address, symbol="USDC", decimals=6, listed=True)
+
+    def get_prices(self, token_list):
+        assert not self.busy, "chain used by two threads at once"
+        self.busy = True
+        self.threads.add(threading.get_ident())
+        time.sleep(0.02)
+        self.busy = False
+        return [Price(token=t, price=1.0) for t in token_list]
+
+
+def test_chunks_use_one_chain_per_worker(monkeypatch):
+    StubChain.instances = []
+    monkeypatch.setattr(tokens, "get_chain", lambda chain_id: StubChain())
+    config = get_config()
+    monkeypatch.setattr(config, "price_chunk_size", 10)
+    monkeypatch.setattr(config, "price_max_workers", 4)
+
+    output = tokens._fetch_prices_page("8453", 50, 0)
+
+    assert output.failed_chunks == []
+    assert [p.token.symbol for p in output.result] == [f"T{i}" for i in range(50)]
+    assert len(StubChain.instances) == 5
+    assert all(len(chain.threads) == 1 for chain in StubChain.instances)
+
+
+def test_failed_chunk_is_reported(monkeypatch):
+    class FailingChain(StubChain):
+        def get_tokens_page(self, limit, offset):
+            if offset == 10:
+                raise ConnectionError("rpc down")
+            return super().get_tokens_page(limit, offset)
+
+    monkeypatch.setattr(tokens, "get_chain", lambda chain_id: FailingChain())
+    config = get_config()
+    monkeypatch.setattr(config, "price_chunk_size", 10)
+    monkeypatch.setattr(config, "price_max_workers", 4)
+
+    output = tokens._fetch_prices_page("8453", 30, 0)
+
+    assert [(c.offset, c.limit) for c in output.failed_chunks] == [(10, 10)]
+    assert len(output.result) == 20
+
+
+def use_chain(monkeypatch, chain_cls):
+    monkeypatch.setattr(tokens, "get_chain", lambda chain_id: chain_cls())
+    monkeypatch.setattr(tokens, "get_read_ahead_buffer", lambda: ReadAheadBuffer(enabled=False))
+    config = get_config()
+    monkeypatch.setattr(config, "price_chunk_size", 10)
+    monkeypatch.setattr(config, "price_max_workers", 4)
+
+
+class FailingChunkChain(StubChain):
+    def get_tokens_page(self, limit, offset):
+        if offset == 10:
+            raise ConnectionError("rpc down")
+        return super().get_tokens_page(limit, offset)
+
+
+def test_tool_returns_a_list_of_prices_by_default(monkeypatch):
+    use_chain(monkeypatch, StubChain)
+
+    prices = asyncio.run(tokens.query_sugar_get_prices(limit=30, offset=0))
+
+    assert isinstance(prices, list)
+    assert [p.token.symbol for p in prices] == [f"T{i}" for i in range(30)]
+
+
+def test_tool_raises_on_failed_chunk_by_default(monkeypatch):
+    use_chain(monkeypatch, FailingChunkChain)
+
+    with pytest.raises(RuntimeError, match="tokens 10-20"):
+        asyncio.run(tokens.query_sugar_get_prices(limit=30, offset=0))
+
+
+def test_tool_reports_failed_chunks_with_errors(monkeypatch):
+    use_chain(monkeypatch, FailingChunkChain)
+
+    output = asyncio.run(tokens.query_sugar_get_prices(limit=30, offset=0, with_errors=True))
+
+    assert [(c.offset, c.limit) for c in output.failed_chunks] == [(10, 10)]
+    assert len(output.result) == 20
@@ -0,0 +1,189 @@
+"""Tests for the asyncio background cache refresher."""
+
+import asyncio
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from netmind_web3_mcp.tools.sugar.refresher import CacheRefresher
+from netmind_web3_mcp.tools.sugar.rpc import BatchingHTTPProvider, RequestCancelled
+
+
+class StubCache:
+    """PoolsCache stand-in whose refreshes sleep for refresh_seconds, or until cancelled."""
+
+    def __init__(self, chain_ids=("8453",), refresh_seconds=0.0, poll_interval=60.0):
+        self.snapshots = {chain_id: object() for chain_id in chain_ids}
+        self.refresh_seconds = refresh_seconds
+        self.poll_interval = poll_interval
+        self.refreshed = []
+        self.cancel_events = []
+        self.threads = []
+
+    def get_poll_interval(self):
+        return self.poll_interval
+
+    def get_refresh_candidates(self):
+        return list(self.snapshots.items())
+
+    def needs_refresh(self, chain_id, snapshot):
+        return True
+
+    def refresh_chain(self, chain_id, expected=None, cancel=None):
+        self.threads.append(threading.current_thread())
+        self.cancel_events.append(cancel)
+        if cancel is not None and cancel.wait(self.refresh_seconds):
+            return False
+        self.refreshed.append(chain_id)
+        return True
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_refresh_due_refreshes_every_due_chain_on_daemon_threads():
+    cache = StubCache(chain_ids=("8453", "10"))
+
+    async def scenario():
+        return await CacheRefresher(cache).refresh_due()
+
+    assert run(scenario()) == 2
+    assert sorted(cache.refreshed) == ["10", "8453"]
+    assert all(thread.daemon for thread in cache.threads)
+
+
+def test_concurrent_refreshes_of_a_chain_share_one_run():
+    cache = StubCache(refresh_seconds=0.05)
+
+    async def scenario():
+        refresher = CacheRefresher(cache)
+        return await asyncio.gather(refresher.refresh_now("8453"), refresher.refresh_now("8453"))
+
+    assert run(scenario()) == [True, True]
+    assert cache.refreshed == ["8453"]
+
+
+def test_workers_bound_concurrent_refreshes():
+    cache = StubCache(chain_ids=("a", "b", "c", "d"), refresh_seconds=0.05)
+
+    async def scenario():
+        refresher = CacheRefresher(cache, max_workers=2)
+        start = time.monotonic()
+        await asyncio.gather(*(refresher.refresh_now(chain_id) for chain_id in "abcd"))
+        return time.monotonic() - start
+
+    assert run(scenario()) >= 0.1
+
+
+def test_start_runs_periodic_refreshes_until_stopped():
+    cache = StubCache(poll_interval=0.02)
+
+    async def scenario():
+        refresher = CacheRefresher(cache)
+        await refresher.start()
+        assert refresher.running
+        await asyncio.sleep(0.1)
+        await refresher.stop()
+        return refresher.running
+
+    assert run(scenario()) is False
+    assert len(cache.refreshed) >= 2
+
+
+def test_stop_lets_refreshes_finish_within_grace():
+    cache = StubCache(refresh_seconds=0.05)
+
+    async def scenario():
+        refresher = CacheRefresher(cache, shutdown_grace_seconds=1.0)
+        refresh = asyncio.ensure_future(refresher.refresh_now("8453"))
+        await asyncio.sleep(0.01)
+        await refresher.stop()
+        return await refresh
+
+    assert run(scenario()) is True
+    assert cache.refreshed == ["8453"] and not cache.cancel_events[0].is_set()
+
+
+def test_stop_cancels_refreshes_past_grace():
+    cache = StubCache(refresh_seconds=5.0)
+
+    async def scenario():
+        refresher = CacheRefresher(cache, shutdown_grace_seconds=0.05)
+        refresh = asyncio.ensure_future(refresher.refresh_now("8453"))
+        await asyncio.sleep(0.01)
+        start = time.monotonic()
+        await refresher.stop()
+        return time.monotonic() - start, await refresh
+
+    elapsed, result = run(scenario())
+    assert elapsed < 1.0 and result is False
+    assert cache.cancel_events[0].is_set() and cache.refreshed == []
+
+
+def test_start_and_stop_in_thread():
+    cache = StubCache(poll_interval=0.02)
+    refresher = CacheRefresher(cache)
+    refresher.start_in_thread()
+    time.sleep(0.1)
+    refresher.stop_in_thread()
+    assert refresher.thread is None and cache.refreshed
+
+
+def test_abandoned_refresh_does_not_block_interpreter_exit():
+    src = Path(__file__).parent.parent.parent / "src"
+    script = textwrap.dedent("""
+        import asyncio, time
+        from netmind_web3_mcp.tools.sugar.refresher import CacheRefresher
+
+        class Cache:
+            def refresh_chain(self, chain_id, expected=None, cancel=None):
+                # A sweep that ignores cancellation
+                time.sleep(5)
+                return True
+
+        async def main():
+            refresher = CacheRefresher(Cache(), shutdown_grace_seconds=0.1)
+            asyncio.ensure_future(refresher.refresh_now("8453"))
+            await asyncio.sleep(0.05)
+            await refresher.stop()
+
+        asyncio.run(main())
+    """)
+    env = dict(os.environ, PYTHONPATH=str(src))
+    start = time.monotonic()
+    subprocess.run([sys.executable, "-c", script], env=env, check=True, capture_output=True, timeout=10)
+    assert time.monotonic() - start < 4.0
+
+
+class RecordingTransport:
+    endpoint_uri = "http://stub"
+
+    def __init__(self):
+        self.payloads = []
+
+    def post(self, payload):
+        self.payloads.append(payload)
+        if isinstance(payload, list):
+            return [{"jsonrpc": "2.0", "id": request["id"], "result": "0x1"} for request in payload]
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": "0x1"}
+
+
+def test_cancelled_provider_sends_no_further_requests():
+    transport = RecordingTransport()
+    cancel = threading.Event()
+    provider = BatchingHTTPProvider(transport, cancel=cancel)
+
+    provider.make_request("eth_blockNumber", [])
+    cancel.set()
+    with pytest.raises(RequestCancelled):
+        provider.make_request("eth_blockNumber", [])
+    with pytest.raises(RequestCancelled):
+        provider.make_batch_request([("eth_call", [{}, "latest"])])
+    assert len(transport.payloads) == 1
@@ -0,0 +1,91 @@
+"""Tests for eth_call coalescing into JSON-RPC batches."""
+
+import threading
+
+import pytest
+from web3.providers.rpc.utils import ExceptionRetryConfiguration
+
+from netmind_web3_mcp.tools.sugar.rpc import BatchingHTTPProvider, RpcBatcher, RpcTransport
+from rpc_stub import StubRpcServer
+
+
+@pytest.fixture
+def stub():
+    server = StubRpcServer()
+    yield server
+    server.close()
+
+
+def call_concurrently(batcher, data_list):
+    results = {}
+
+    def run(data):
+        try:
+            results[data] = batcher.call("eth_call", [{"to": "0x" + "1" * 40, "data": data}, "latest"])
+        except Exception as e:
+            results[data] = e
+
+    threads = [threading.Thread(target=run, args=(data,)) for data in data_list]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_share_one_batch(stub):
+    transport = RpcTransport(stub.uri)
+    batcher = RpcBatcher(transport, window_seconds=0.2, max_batch_size=50)
+    data_list = [f"0x{i:04x}" for i in range(20)]
+    stub.error_data.add("0x0007")
+
+    results = call_concurrently(batcher, data_list)
+
+    assert len(stub.payloads) == 1
+    assert isinstance(stub.payloads[0], list) and len(stub.payloads[0]) == 20
+    for data in data_list:
+        if data == "0x0007":
+            assert "error" in results[data] and "0x0007" in results[data]["error"]["message"]
+        else:
+            assert results[data]["result"] == data
+    transport.close()
+
+
+def test_full_batches_are_split(stub):
+    transport = RpcTransport(stub.uri)
+    batcher = RpcBatcher(transport, window_seconds=0.2, max_batch_size=8)
+    data_list = [f"0x{i:04x}" for i in range(20)]
+
+    results = call_concurrently(batcher, data_list)
+
+    assert all(results[data]["result"] == data for data in data_list)
+    assert sum(len(p) if isinstance(p, list) else 1 for p in stub.payloads) == 20
+    assert all(len(p) <= 8 for p in stub.payloads if isinstance(p, list))
+    transport.close()
+
+
+def test_transport_error_reaches_every_caller(stub):
+    transport = RpcTransport(stub.uri)
+    batcher = RpcBatcher(transport, window_seconds=0.1)
+    stub.fail_always = True
+
+    results = call_concurrently(batcher, ["0x01", "0x02", "0x03"])
+
+    assert len(stub.payloads) == 1
+    assert all(isinstance(result, Exception) for result in results.values())
+    transport.close()
+
+
+def test_provider_retries_allowlisted_methods(stub):
+    transport = RpcTransport(stub.uri)
+    provider = BatchingHTTPProvider(transport, RpcBatcher(transport))
+    provider.exception_retry_configuration = ExceptionRetryConfiguration(
+        errors=provider.exception_retry_configuration.errors, retries=3, backoff_factor=0.01
+    )
+    stub.fail_requests = 2
+
+    response = provider.make_request("eth_call", [{"to": "0x" + "1" * 40, "data": "0xab"}, "latest"])
+
+    assert response["result"] == "0xab"
+    assert len(stub.payloads) == 3
+    transport.close()
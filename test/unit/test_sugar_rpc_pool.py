@@ -0,0 +1,152 @@
+"""Tests for RPC endpoint selection, failover, cooldown and hedged reads."""
+
+import time
+
+import pytest
+
+from netmind_web3_mcp.tools.sugar.rpc import RpcEndpointPool
+from rpc_stub import StubRpcServer
+
+
+def eth_call(data="0x01"):
+    return {"jsonrpc": "2.0", "method": "eth_call", "params": [{"to": "0x" + "1" * 40, "data": data}, "latest"], "id": 1}
+
+
+@pytest.fixture
+def stubs():
+    servers = [StubRpcServer(), StubRpcServer()]
+    yield servers
+    for server in servers:
+        server.close()
+
+
+def test_ranks_endpoints_by_latency(stubs):
+    slow, fast = stubs
+    slow.latency = 0.05
+    pool = RpcEndpointPool([slow.uri, fast.uri])
+
+    # Untried endpoints are tried first, then the lower EWMA latency wins
+    pool.post(eth_call())
+    pool.post(eth_call())
+    for _ in range(5):
+        pool.post(eth_call())
+
+    assert len(slow.payloads) == 1
+    assert len(fast.payloads) == 6
+    pool.close()
+
+
+def test_fails_over_and_cools_down_failing_endpoint(stubs):
+    failing, healthy = stubs
+    failing.fail_always = True
+    pool = RpcEndpointPool([failing.uri, healthy.uri], cooldown_seconds=0.3)
+
+    assert pool.post(eth_call("0xaa"))["result"] == "0xaa"
+    for _ in range(3):
+        pool.post(eth_call())
+
+    # The failing endpoint is skipped while it cools down
+    assert len(failing.payloads) == 1
+    assert len(healthy.payloads) == 4
+    pool.close()
+
+
+def test_endpoint_recovers_after_cooldown(stubs):
+    flaky, other = stubs
+    flaky.fail_requests = 1
+    pool = RpcEndpointPool([flaky.uri, other.uri], cooldown_seconds=0.2)
+    pool.post(eth_call())
+    flaky_state = pool.endpoints[0]
+    assert flaky_state.failures == 1 and flaky_state.cooldown_until > time.monotonic()
+
+    time.sleep(0.25)
+    # Out of cooldown and never measured, so it is tried first again
+    pool.endpoints[1].latency_ewma = 1.0
+    pool.post(eth_call())
+
+    assert len(flaky.payloads) == 2
+    assert flaky_state.failures == 0 and flaky_state.cooldown_until == 0.0
+    pool.close()
+
+
+def test_cooldown_grows_exponentially_up_to_the_cap(stubs):
+    failing, _ = stubs
+    failing.fail_always = True
+    pool = RpcEndpointPool([failing.uri], cooldown_seconds=1.0, max_cooldown_seconds=3.0)
+    state = pool.endpoints[0]
+    cooldowns = []
+    for _ in range(4):
+        with pytest.raises(Exception):
+            pool.post(eth_call())
+        cooldowns.append(round(state.cooldown_until - time.monotonic()))
+
+    assert cooldowns == [1, 2, 3, 3]
+    pool.close()
+
+
+def test_hedge_fires_only_after_delay(stubs):
+    primary, secondary = stubs
+    primary.latency = 0.5
+    pool = RpcEndpointPool([primary.uri, secondary.uri], hedge_enabled=True, hedge_min_delay_seconds=0.1)
+
+    start = time.monotonic()
+    assert pool.post(eth_call("0xbb"))["result"] == "0xbb"
+    elapsed = time.monotonic() - start
+
+    assert len(primary.payloads) == 1 and len(secondary.payloads) == 1
+    assert 0.1 <= elapsed < 0.4
+    pool.close()
+
+
+def test_no_hedge_when_primary_answers_in_time(stubs):
+    primary, secondary = stubs
+    primary.latency = 0.02
+    pool = RpcEndpointPool([primary.uri, secondary.uri], hedge_enabled=True, hedge_min_delay_seconds=0.3)
+
+    pool.post(eth_call())
+
+    assert len(primary.payloads) == 1
+    assert secondary.payloads == []
+    pool.close()
+
+
+def test_writes_are_not_hedged(stubs):
+    primary, secondary = stubs
+    primary.latency = 0.3
+    pool = RpcEndpointPool([primary.uri, secondary.uri], hedge_enabled=True, hedge_min_delay_seconds=0.05)
+
+    pool.post({"jsonrpc": "2.0", "method": "eth_sendRawTransaction", "params": ["0x00"], "id": 1})
+
+    assert len(primary.payloads) == 1
+    assert secondary.payloads == []
+    pool.close()
+
+
+def test_writes_are_not_failed_over(stubs):
+    failing, healthy = stubs
+    failing.fail_always = True
+    pool = RpcEndpointPool([failing.uri, healthy.uri])
+
+    with pytest.raises(Exception):
+        pool.post({"jsonrpc": "2.0", "method": "eth_sendRawTransaction", "params": ["0x00"], "id": 1})
+
+    assert len(failing.payloads) == 1
+    assert healthy.payloads == []
+    pool.close()
+
+
+def test_saturated_hedge_workers_do_not_queue_requests(stubs):
+    primary, secondary = stubs
+    primary.latency = 0.5
+    pool = RpcEndpointPool([primary.uri, secondary.uri], hedge_enabled=True, hedge_min_delay_seconds=0.05, hedge_max_workers=1)
+
+    # The only worker stays busy with the losing primary request; the hedge runs on this thread
+    assert pool.post(eth_call("0xaa"))["result"] == "0xaa"
+    assert len(secondary.payloads) == 1
+
+    # With no worker free the next read is sent straight away rather than waiting for one
+    primary.latency = 0.0
+    start = time.monotonic()
+    assert pool.post(eth_call("0xbb"))["result"] == "0xbb"
+    assert time.monotonic() - start < 0.3
+    pool.close()
@@ -0,0 +1,78 @@
+"""Tests for sharing in-flight direct fetches."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from netmind_web3_mcp.tools.sugar.cache import SingleFlight
+
+
+def slow_counter(calls, result="pools", delay=0.1):
+    def fn():
+        calls.append(threading.get_ident())
+        time.sleep(delay)
+        return result
+    return fn
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: flight.do("8453", slow_counter(calls)), range(8)))
+
+    assert results == ["pools"] * 8
+    assert len(calls) == 1
+
+
+def test_different_keys_do_not_share():
+    flight = SingleFlight()
+    calls = []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda key: flight.do(key, slow_counter(calls)), ["10", "8453"]))
+
+    assert len(calls) == 2
+
+
+def test_completed_call_is_not_reused_without_fresh_window():
+    flight = SingleFlight()
+    calls = []
+    flight.do("8453", slow_counter(calls, delay=0))
+    flight.do("8453", slow_counter(calls, delay=0))
+
+    assert len(calls) == 2
+    assert flight.calls == {}
+
+
+def test_fresh_window_reuses_result_until_it_expires():
+    flight = SingleFlight(fresh_seconds=0.1)
+    calls = []
+    flight.do("8453", slow_counter(calls, delay=0))
+    flight.do("8453", slow_counter(calls, delay=0))
+    assert len(calls) == 1
+
+    time.sleep(0.15)
+    flight.do("8453", slow_counter(calls, delay=0))
+    assert len(calls) == 2
+
+
+def test_error_is_shared_but_not_reused():
+    flight = SingleFlight(fresh_seconds=10)
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        time.sleep(0.1)
+        raise ConnectionError("rpc down")
+
+    def call(_):
+        with pytest.raises(ConnectionError):
+            flight.do("8453", failing)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(call, range(4)))
+    assert len(attempts) == 1
+
+    assert flight.do("8453", lambda: "pools") == "pools"
@@ -0,0 +1,53 @@
+"""Tests for per-token aggregate statistics."""
+
+import asyncio
+import threading
+
+from netmind_web3_mcp.tools.sugar import tokens
+from netmind_web3_mcp.tools.sugar.metrics import get_pool_metrics
+from netmind_web3_mcp.tools.sugar.stats import compute_token_stats
+from test_sugar_cache import make_pool, token
+
+
+def stats_for(pools, name):
+    return compute_token_stats(pools, get_pool_metrics(pools)).get(token(name).token_address.lower())
+
+
+def test_price_comes_from_the_deepest_pool_and_tvl_is_summed():
+    pools = [
+        make_pool(1, tvl=100.0, token0="a", token1="b", price0=1.0),
+        make_pool(2, tvl=500.0, token0="c", token1="a", price1=3.0),
+        make_pool(3, tvl=50.0, token0="a", token1="d", price0=7.0),
+    ]
+
+    stats = stats_for(pools, "a")
+
+    assert stats.pool_count == 3
+    assert stats.total_tvl == 650.0
+    assert stats.token_liquidity == 325.0
+    assert stats.price.price == 3.0 and stats.price_pool == pools[1].lp
+    assert stats.top_pool == pools[1].lp and stats.top_pool_tvl == 500.0
+
+
+def test_pools_without_a_usable_price_do_not_set_it():
+    pools = [make_pool(1, tvl=500.0, price0=0.0), make_pool(2, tvl=100.0, price0=2.0)]
+
+    stats = stats_for(pools, "a")
+
+    assert stats.price.price == 2.0 and stats.price_pool == pools[1].lp
+
+
+def test_token_stats_tool_reports_not_find_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def cached_pools(chain_id):
+        threads.append(threading.current_thread())
+        return [make_pool(1, token0="a", token1="b")]
+
+    monkeypatch.setattr(tokens, "_get_cached_pools", cached_pools)
+    monkeypatch.setattr(tokens, "_get_cached_snapshot", lambda chain_id: None)
+
+    output = asyncio.run(tokens.query_sugar_get_token_stats(token("c").token_address, chainId="8453"))
+
+    assert output.result.startswith("NOT FIND: no pools contain token")
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,36 @@
+"""Tests that the stdio-mode cache keeps stdout, the JSON-RPC channel, free of log output."""
+
+from netmind_web3_mcp.tools.sugar import cache
+from netmind_web3_mcp.tools.sugar.cache import CacheConfig, PoolsCache
+
+
+def test_lazy_cache_startup_writes_nothing_to_stdout(monkeypatch, capsys):
+    monkeypatch.setattr(cache, "_cache", PoolsCache())
+    monkeypatch.setattr(cache, "_cache_initialized", False)
+
+    cache.start_lazy_cache_system(CacheConfig(refresh_mode="block", memory_budget_mb=64))
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Lazy in-process cache configured" in captured.err
+
+
+def test_pool_filtering_writes_nothing_to_stdout(capsys):
+    assert PoolsCache()._filter_invalid_pools([None, None]) == []
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Filtered out 2 invalid pools" in captured.err
+
+
+def test_slow_cache_request_writes_nothing_to_stdout(monkeypatch, capsys):
+    monkeypatch.setattr(cache, "_cache_initialized", True)
+    ticks = iter([0.0, 2.0])
+    monkeypatch.setattr("time.time", lambda: next(ticks))
+    monkeypatch.setattr(cache._cache, "get_pools", lambda chain_id: [])
+
+    assert cache._get_cached_pools("8453") == []
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert "Slow cache request" in captured.err